@@ -0,0 +1,13 @@
+'''
+Benchmarks of the QAOA module.
+
+The suite generates seeded MaxCut, weighted MaxCut and random QUBO instances, times ``QAOA.run``,
+``QAOA.run_qaoa_circuit`` and ``problem_to_z_operator`` separately and stores the results as JSON.
+A stored result file can be compared against a baseline to flag regressions.
+
+Run the suite and compare with a baseline from the repository root::
+
+    python -m benchmarks.qaoa.run --n 8 10 12 --layers 1 2 --output current.json
+    python -m benchmarks.qaoa.compare baseline.json current.json
+
+'''
@@ -0,0 +1,85 @@
+"""
+Compare QAOA benchmark results against a stored baseline and flag regressions.
+
+A case regresses if one of its timings, its peak RSS or its evaluation count grows by more than the
+relative tolerance, or if its approximation ratio drops by more than the absolute tolerance. The exit
+status is 1 if any case regresses or fails, so the script can gate a library upgrade.
+
+Example::
+
+    python -m benchmarks.qaoa.compare baseline.json current.json --time-tol 0.2
+
+"""
+import argparse
+import json
+import sys
+
+TIME_METRICS = ('time_energy_table', 'time_qaoa_state', 'time_solve')
+CASE_KEYS = ('kind', 'n', 'layer', 'seed', 'optimizer', 'shots')
+
+
+def _load(path):
+    with open(path) as f:
+        results = json.load(f)['results']
+    return {tuple(record.get(key) for key in CASE_KEYS): record for record in results}
+
+
+def compare(baseline, current, time_tol=0.25, memory_tol=0.25, evaluation_tol=0.25, ratio_tol=0.02):
+    """
+    Compare two result sets.
+
+    Parameters
+        baseline, current : ``dict``\n
+            Records keyed by case, as loaded from result files.
+        time_tol, memory_tol, evaluation_tol : ``float``\n
+            Allowed relative growth of the timings, of the peak RSS and of the evaluation count.
+        ratio_tol : ``float``\n
+            Allowed absolute drop of the approximation ratio.
+
+    Return
+        regressions : ``list[tuple]``\n
+            ``(case, metric, baseline value, current value)`` of every regression. Failed or missing
+            cases are reported with metric ``error`` or ``missing``.
+
+    """
+    relative = dict.fromkeys(TIME_METRICS, time_tol)
+    relative.update(peak_rss_mb=memory_tol, evaluations=evaluation_tol)
+    regressions = []
+    for case, old in baseline.items():
+        new = current.get(case)
+        if new is None:
+            regressions.append((case, 'missing', None, None))
+            continue
+        if 'error' in new:
+            regressions.append((case, 'error', old.get('error'), new['error']))
+            continue
+        for metric, tol in relative.items():
+            if old.get(metric) is not None and new.get(metric) is not None and new[metric] > old[metric] * (1 + tol):
+                regressions.append((case, metric, old[metric], new[metric]))
+        if old.get('approximation_ratio') is not None and new.get('approximation_ratio') is not None \
+                and new['approximation_ratio'] < old['approximation_ratio'] - ratio_tol:
+            regressions.append((case, 'approximation_ratio', old['approximation_ratio'], new['approximation_ratio']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--time-tol', type=float, default=0.25)
+    parser.add_argument('--memory-tol', type=float, default=0.25)
+    parser.add_argument('--evaluation-tol', type=float, default=0.25)
+    parser.add_argument('--ratio-tol', type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    regressions = compare(_load(args.baseline), _load(args.current), args.time_tol, args.memory_tol,
+                          args.evaluation_tol, args.ratio_tol)
+    for case, metric, old, new in regressions:
+        print('REGRESSION {:<40} {:<28} baseline={} current={}'.format(
+            '/'.join(map(str, case)), metric, old, new))
+    print('{} regression(s)'.format(len(regressions)))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Seeded problem instances for the QAOA benchmarks.
+
+Every instance is described by a quadratic form :math:`f(x) = x^T Q x + b^T x + c` over binary variables,
+which is turned into a sympy expression for ``QAOA`` and evaluated with NumPy for the exact optimum.
+
+"""
+import numpy as np
+import sympy as sp
+
+KINDS = ('maxcut', 'weighted_maxcut', 'qubo')
+
+
+def _random_edges(n, rng, edge_prob):
+    rows, cols = np.triu_indices(n, k=1)
+    keep = rng.random(len(rows)) < edge_prob
+    # keep the graph connected enough to be meaningful: always include a ring
+    ring = np.zeros(len(rows), dtype=bool)
+    ring[np.flatnonzero(cols - rows == 1)] = True
+    ring[np.flatnonzero((rows == 0) & (cols == n - 1))] = True
+    keep |= ring
+    return rows[keep], cols[keep]
+
+
+def maxcut_quadratic(n, rows, cols, weights):
+    """Quadratic form of the MaxCut minimization :math:`-\\sum_{(i,j)} w_{ij}(x_i + x_j - 2x_ix_j)`."""
+    quadratic = np.zeros((n, n))
+    linear = np.zeros(n)
+    np.add.at(quadratic, (rows, cols), 2 * weights)
+    np.add.at(linear, rows, -weights)
+    np.add.at(linear, cols, -weights)
+    return quadratic, linear, 0.0
+
+
+def generate(kind, n, seed, edge_prob=0.5):
+    """
+    Generate one seeded instance.
+
+    Parameters
+        kind : ``str``\n
+            One of ``maxcut``, ``weighted_maxcut`` and ``qubo``.
+        n : ``int``\n
+            Number of binary variables.
+        seed : ``int``\n
+            Seed of the random generator.
+        edge_prob : ``float``, ``optional``\n
+            Edge probability of the random graphs on top of a ring. Default is 0.5.
+
+    Return
+        instance : ``dict``\n
+            Keys ``kind``, ``n``, ``seed``, ``quadratic`` (upper triangular :math:`Q`), ``linear``, ``constant``.
+
+    """
+    rng = np.random.default_rng([seed, n, KINDS.index(kind)])
+    if kind == 'qubo':
+        quadratic = np.triu(rng.normal(size=(n, n)), k=1)
+        linear = rng.normal(size=n)
+        constant = 0.0
+    else:
+        rows, cols = _random_edges(n, rng, edge_prob)
+        if kind == 'maxcut':
+            weights = np.ones(len(rows))
+        else:
+            weights = rng.uniform(0.1, 1.0, size=len(rows))
+        quadratic, linear, constant = maxcut_quadratic(n, rows, cols, weights)
+    return {'kind': kind, 'n': n, 'seed': seed,
+            'quadratic': quadratic, 'linear': linear, 'constant': constant}
+
+
+def to_sympy(instance):
+    """Sympy expression of an instance, with variables ``x0 ... x{n-1}``."""
+    n = instance['n']
+    variables = sp.symbols('x0:{}'.format(n))
+    rows, cols = np.nonzero(instance['quadratic'])
+    expression = sum(float(instance['quadratic'][i, j]) * variables[i] * variables[j] for i, j in zip(rows, cols))
+    expression += sum(float(w) * v for w, v in zip(instance['linear'], variables) if w != 0)
+    return expression + instance['constant']
+
+
+def energies(instance, index):
+    """
+    Function values of basis states given by integer index, where bit :math:`i` of the index is :math:`x_i`.
+    """
+    n = instance['n']
+    bits = ((np.asarray(index)[:, None] >> np.arange(n)) & 1).astype(float)
+    return (np.einsum('si,ij,sj->s', bits, instance['quadratic'], bits)
+            + bits @ instance['linear'] + instance['constant'])
+
+
+def energy_range(instance, chunk_size=2 ** 18):
+    """Exact minimum and maximum function value, by chunked enumeration of all :math:`2^n` states."""
+    size = 2 ** instance['n']
+    e_min, e_max = np.inf, -np.inf
+    for start in range(0, size, chunk_size):
+        chunk = energies(instance, np.arange(start, min(start + chunk_size, size)))
+        e_min = min(e_min, chunk.min())
+        e_max = max(e_max, chunk.max())
+    return float(e_min), float(e_max)
+
+
+def expectation(instance, index, probs, chunk_size=2 ** 18):
+    """Expected function value of the states ``index`` with probabilities ``probs``, in chunks."""
+    total = 0.0
+    for start in range(0, len(index), chunk_size):
+        stop = start + chunk_size
+        total += probs[start:stop] @ energies(instance, index[start:stop])
+    return float(total / probs.sum())
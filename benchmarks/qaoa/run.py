@@ -0,0 +1,151 @@
+"""
+Run the QAOA benchmarks and write machine-readable results.
+
+Each (kind, n, layer, seed) case runs in a fresh process, so that the recorded peak RSS belongs to the
+case alone. The cases time the NumPy state-vector path of ``qaoa.solve_many``, see ``statevector``. For
+every case the suite records
+
+    - ``time_energy_table``, ``time_qaoa_state``, ``time_solve`` : best wall-clock seconds over the repeats
+      of the diagonal of the cost Hamiltonian, of one QAOA state and of the optimization by ``solve_many``,
+    - ``evaluations`` : number of QAOA states computed by the optimization,
+    - ``approximation_ratio`` : :math:`(E_{max}-\\langle E\\rangle)/(E_{max}-E_{min})` of the final
+      distribution, 1 being optimal,
+    - ``peak_rss_mb`` : peak resident memory of the case process.
+
+Sampled cases (``--shots`` other than -1) are solved by ``QAOA.run`` and need the full library.
+
+Example::
+
+    python -m benchmarks.qaoa.run --kinds maxcut qubo --n 8 10 --layers 1 2 --output current.json
+
+"""
+import argparse
+import concurrent.futures
+import json
+import multiprocessing
+import platform
+import resource
+import sys
+import time
+
+import numpy as np
+
+from . import instances
+
+
+def _best_time(func, repeat):
+    best, result = np.inf, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def _case(kind, n, layer, seed, optimizer, shots):
+    """Keys identifying a case, see ``compare.CASE_KEYS``."""
+    return {'kind': kind, 'n': n, 'layer': layer, 'seed': seed, 'optimizer': optimizer, 'shots': shots}
+
+
+def run_case(kind, n, layer, seed, repeat=1, optimizer='SLSQP', shots=-1):
+    """Run one benchmark case in the current process and return its record."""
+    from pyqpanda_alg.QAOA import qaoa, statevector
+
+    instance = instances.generate(kind, n, seed)
+    problem = instances.to_sympy(instance)
+    record = _case(kind, n, layer, seed, optimizer, shots)
+
+    record['time_energy_table'], energies = _best_time(lambda: qaoa._energy_table(problem, n), repeat)
+
+    rng = np.random.default_rng(seed)
+    gammas, betas = rng.uniform(0, np.pi, size=(2, layer))
+    record['time_qaoa_state'], _ = _best_time(lambda: statevector.qaoa_state(energies, gammas, betas), repeat)
+
+    evaluations = [0]
+    qaoa_state = statevector.qaoa_state
+
+    def counted_qaoa_state(*args, **kwargs):
+        evaluations[0] += 1
+        return qaoa_state(*args, **kwargs)
+
+    initial_para = rng.uniform(0, np.pi, size=2 * layer)
+
+    def optimize():
+        evaluations[0] = 0
+        _, result = next(qaoa.solve_many([problem], layer=layer, initial_para=initial_para, shots=shots,
+                                         optimizer=optimizer))
+        return result
+
+    # the case owns its process, so the counter can replace the module function while the optimization runs
+    statevector.qaoa_state = counted_qaoa_state
+    try:
+        record['time_solve'], result = _best_time(optimize, repeat)
+    finally:
+        statevector.qaoa_state = qaoa_state
+    if result is None:
+        raise RuntimeError('shots={} needs QAOA.run of the full library'.format(shots))
+    record['evaluations'] = evaluations[0]
+
+    distribution = result[0]
+    index = np.fromiter((int(key, 2) for key in distribution), dtype=np.int64, count=len(distribution))
+    probs = np.fromiter(distribution.values(), dtype=float, count=len(distribution))
+    expectation = instances.expectation(instance, index, probs)
+    e_min, e_max = instances.energy_range(instance)
+    record['approximation_ratio'] = (e_max - expectation) / (e_max - e_min) if e_max > e_min else 1.0
+    record['peak_rss_mb'] = _peak_rss_mb()
+    return record
+
+
+def _environment():
+    import scipy
+    import sympy
+    try:
+        import pyqpanda
+        pyqpanda_version = getattr(pyqpanda, '__version__', 'unknown')
+    except ImportError:
+        pyqpanda_version = None
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'numpy': np.__version__, 'scipy': scipy.__version__, 'sympy': sympy.__version__,
+            'pyqpanda': pyqpanda_version}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--kinds', nargs='+', default=list(instances.KINDS), choices=instances.KINDS)
+    parser.add_argument('--n', nargs='+', type=int, default=list(range(8, 27, 2)))
+    parser.add_argument('--layers', nargs='+', type=int, default=list(range(1, 7)))
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--optimizer', default='SLSQP')
+    parser.add_argument('--shots', type=int, default=-1)
+    parser.add_argument('--output', default='qaoa_benchmark.json')
+    args = parser.parse_args(argv)
+
+    cases = [(kind, n, layer, seed) for kind in args.kinds for n in args.n
+             for layer in args.layers for seed in args.seeds]
+    results = []
+    context = multiprocessing.get_context('spawn')
+    for kind, n, layer, seed in cases:
+        # a fresh worker per case keeps the peak RSS of the cases apart
+        with concurrent.futures.ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            future = executor.submit(run_case, kind, n, layer, seed, args.repeat, args.optimizer, args.shots)
+            try:
+                record = future.result()
+            except Exception as error:
+                # the failed case keeps the keys of a successful one, so that compare can match it
+                record = dict(_case(kind, n, layer, seed, args.optimizer, args.shots), error=repr(error))
+        results.append(record)
+        print(json.dumps(record), flush=True)
+
+    with open(args.output, 'w') as f:
+        json.dump({'environment': _environment(), 'results': results}, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -24,7 +24,11 @@ from . import default_circuits
 from . import qaoa
 from . import dstate
 from . import spsa
+from . import graph
+from . import parallel
+from . import statevector
+from . import portfolio
 
 
-__all__ = [qaoa, dstate, spsa, default_circuits]
+__all__ = [qaoa, dstate, spsa, default_circuits, graph, parallel, statevector, portfolio]
 
@@ -1,6 +1,7 @@
 import pyqpanda as pq
 from itertools import combinations
 from . import dstate
+from . import statevector
 
 from .. config import *
 auth = Authorization()
@@ -61,7 +62,7 @@ def parity_partition_xy_mixer(qlist, beta):
         Physical Review A, 2020, 101(1): 012320. DOI:10.1103/PhysRevA.101.012320.
 
     """
-    pass
+    return _partition_circuit(qlist, statevector.parity_partitions(range(len(qlist))), beta)
 
 
 def complete_xy_mixer(qlist, angle):
@@ -110,18 +111,19 @@ def complete_xy_mixer(qlist, angle):
             H_{XY,v}=\\frac{1}{2}\sum_{c,c'\in K} (\sigma_{v,c}^x \sigma_{v',c}^x + \sigma_{v,c}^y \sigma_{v',c}^y)
 
     When the mixer-set :math:`K` includes all pairs, it is termed a complete mixer. In order to simulate a complete
-    mixer in quantum circuit, a partition of :math:`\kappa - 1, \kappa=\lceil \log_2 n \\rceil`  is applied, where
-    :math:`n` is the number of qubits. See details in [1]
+    mixer in quantum circuit, the pairs are split into the perfect matchings of a round-robin schedule, :math:`n-1`
+    of them for an even number of qubits :math:`n` and :math:`n` for an odd one, see
+    ``statevector.complete_partitions``. The local XY-Hamiltonians of a matching commute. See details in [1]
 
     Reference
         [1] WANG Z, RUBIN N C, DOMINY J M, et. XY-mixers: analytical and numerical results for QAOA[J/OL].\n
         Physical Review A, 2020, 101(1): 012320. DOI:10.1103/PhysRevA.101.012320.
 
     """
-    pass
+    return _partition_circuit(qlist, statevector.complete_partitions(range(len(qlist))), angle)
 
 
-def xy_mixer(domains, mixer_type='PXY'):
+def xy_mixer(domains, mixer_type='PXY', exact=False):
     """
     Generate XY mixer circuit.
 
@@ -140,9 +142,17 @@ def xy_mixer(domains, mixer_type='PXY'):
 
                 If not given, default by ``PXY``.
 
+        exact : ``bool``, ``optional``\n
+            If True, apply the exact :math:`e^{-i\\beta H}` of the ring (``PXY``) or complete (``CXY``) XY
+            Hamiltonian of each domain instead of its parity-partition approximation, see Note. Supported for
+            domains of at most ``statevector.EXACT_XY_MAX_QUBITS`` qubits. Default is False.
+
     Return
         mixer_circuit : ``func(pq.QCircuit)``\n
             A function which use qubit list and angles as input, output a circuit of simulation a XY mixer :math:`e^{-iHt}`.
+            The function has an attribute ``kernel(state, beta)``, which applies the same mixer in place to a NumPy
+            state vector of all qubits, see ``statevector.apply_xy_partitions``. It can be passed as the mixer of
+            ``statevector.qaoa_state``.
 
     Examples
         Generate a circuit of simulation a complete XY mixer :math:`e^{-iH\pi/2}` in qubits [0, 1] and [2, 3].
@@ -185,12 +195,52 @@ def xy_mixer(domains, mixer_type='PXY'):
         For example, in one-hot coding problem, a W state as initial state combine with the XY mixer
         can keep all solutions remain in one-hot form. See details in [1].
 
+        The ``PXY`` and ``CXY`` circuits are first-order Trotter approximations of the ring and complete XY
+        Hamiltonians. In the exact mode the Hamiltonian of a domain is diagonalized once in each Hamming-weight
+        sector and cached, and :math:`e^{-i\\beta H}` is applied by multiplying the eigenphases, so that fewer
+        layers are needed for the same mixing. The circuit of the exact mode is one ``QOracle`` gate of the
+        domain unitary per domain.
+
     Reference
         [1] WANG Z, RUBIN N C, DOMINY J M, et. XY-mixers: analytical and numerical results for QAOA[J/OL].
         Physical Review A, 2020, 101(1): 012320. DOI:10.1103/PhysRevA.101.012320.
 
     """
-    pass
+    mixers = {'PXY': (parity_partition_xy_mixer, statevector.parity_partitions),
+              'CXY': (complete_xy_mixer, statevector.complete_partitions)}
+    if mixer_type not in mixers:
+        raise ValueError('mixer_type should be one of {}, got {}'.format(list(mixers), mixer_type))
+    mixer_func, partition_func = mixers[mixer_type]
+    if exact and not isinstance(domains, int) and max(map(len, domains), default=0) > statevector.EXACT_XY_MAX_QUBITS:
+        raise ValueError('exact XY mixer supports domains of at most {} qubits'
+                         .format(statevector.EXACT_XY_MAX_QUBITS))
+
+    def mixer_circuit(qlist, beta):
+        circuit = pq.QCircuit()
+        for domain in _split_domains(domains, len(qlist)):
+            qubits = [qlist[i] for i in domain]
+            if exact:
+                unitary = statevector.xy_unitary(len(domain), mixer_type, beta)
+                circuit << pq.QOracle(qubits, unitary)
+            else:
+                circuit << mixer_func(qubits, beta)
+        return circuit
+
+    partitions = {}
+
+    def kernel(state, beta):
+        n_qubits = len(state).bit_length() - 1
+        if exact:
+            for domain in _split_domains(domains, n_qubits):
+                statevector.apply_xy_exact(state, domain, mixer_type, beta)
+            return state
+        if n_qubits not in partitions:
+            partitions[n_qubits] = [pairs for domain in _split_domains(domains, n_qubits)
+                                    for pairs in partition_func(domain)]
+        return statevector.apply_xy_partitions(state, partitions[n_qubits], beta)
+
+    mixer_circuit.kernel = kernel
+    return mixer_circuit
 
 
 def init_d_state(domains, k=1, compress=True):
@@ -199,7 +249,7 @@ def init_d_state(domains, k=1, compress=True):
     The Dicke state is defined as :math:`D_{n}^{(k)} = \sum_{hmw(i)=k} |i \\rangle`,
     which is equally superposition state of all states with the same Hamming weight.
     The method prepare an initial state, which is the product state of Dicke state in each domain,
-    with in :math:`O(k*log(n/k))` depth in all-to-all connectivity architecture.
+    by the split-and-cyclic-shift circuit of ``dstate.cached_dicke_state`` with :math:`O(nk)` gates.
 
     Parameters
         domains : ``integer`` or ``list[list]``\n
@@ -209,13 +259,15 @@ def init_d_state(domains, k=1, compress=True):
             The target Hamming weight of the Dicke state to be prepared,
             *i.e.*, the :math:`k` of :math:`D_{n}^{(k)}`.
         compress : ``bool``, ``optional``\n
-            If True, compress the basic gate implementation with simulated control
-            gates otherwise using basic gate implementation; default is True.
+            Kept for compatibility, see ``dstate.cached_dicke_state``; default is True.
 
     Return
         init_state_circuit : ``function``\n
             Return a function, which takes qubit list as input, and output a pyqpanda QCircuit which assumes
-            the input state is all 0.
+            the input state is all 0. The Dicke circuit of each domain is memoized by its qubit layout, see
+            ``dstate.cached_dicke_state``.\n
+            The function has an attribute ``statevector(n_qubits)``, which returns the prepared state as a
+            NumPy vector written directly from its amplitudes, see ``statevector.dicke_state``.
 
     Raises
         ValueError\n
@@ -251,24 +303,6 @@ def init_d_state(domains, k=1, compress=True):
     >>>         print(bin(key)[2::].zfill(n), prob)
 
 
-    The corresponding quantum circuit is:
-
-    .. parsed-literal::
-
-                  ┌─┐                   ┌────┐                ┌────┐
-        q_0:  |0>─┤X├─────────── ────── ┤CNOT├ ───────■────── ┤CNOT├
-                  ├─┤            ┌────┐ └──┬─┘ ┌──────┴─────┐ └──┬─┘
-        q_1:  |0>─┤X├─────────── ┤CNOT├ ───■── ┤RY(1.570796)├ ───■──
-                  ├─┴──────────┐ └──┬─┘        └────────────┘
-        q_2:  |0>─┤RY(1.910633)├ ───■── ────── ────────────── ──────
-                  ├─┬──────────┘        ┌────┐                ┌────┐
-        q_3:  |0>─┤X├─────────── ────── ┤CNOT├ ───────■────── ┤CNOT├
-                  ├─┤            ┌────┐ └──┬─┘ ┌──────┴─────┐ └──┬─┘
-        q_4:  |0>─┤X├─────────── ┤CNOT├ ───■── ┤RY(1.570796)├ ───■──
-                  ├─┴──────────┐ └──┬─┘        └────────────┘
-        q_5:  |0>─┤RY(1.910633)├ ───■── ────── ────────────── ──────
-                  └────────────┘
-
     And the probability of all possible state are (with possible floating errors):
 
     .. parsed-literal::
@@ -286,7 +320,17 @@ def init_d_state(domains, k=1, compress=True):
     which represents the state :math:`\ket{D_3^2}_{012}\otimes\ket{D_3^2}_{345}`.
 
     """
-    pass
+    def init_circuit(qlist):
+        circuit = pq.QCircuit()
+        for domain in _split_domains(domains, len(qlist)):
+            circuit << dstate.cached_dicke_state([qlist[i] for i in domain], k, compress)
+        return circuit
+
+    def init_statevector(n_qubits):
+        return statevector.dicke_state(n_qubits, k, _split_domains(domains, n_qubits))
+
+    init_circuit.statevector = init_statevector
+    return init_circuit
 
 
 def prepare_dicke_state(q_list, k, compress=True):
@@ -443,3 +487,21 @@ def linear_w_state(q_list, compress=True):
 
     """
     pass
+
+
+def _partition_circuit(qlist, partitions, beta):
+    # iSWAP(beta) is exp(-i beta (XX + YY) / 2) of one pair
+    circuit = pq.QCircuit()
+    for pairs in partitions:
+        for i, j in pairs:
+            circuit << pq.iSWAP(qlist[i], qlist[j], beta)
+    return circuit
+
+
+def _split_domains(domains, n_qubits):
+    if isinstance(domains, int):
+        if domains < 1 or n_qubits % domains:
+            raise ValueError('{} qubits can not be divided into {} domains'.format(n_qubits, domains))
+        size = n_qubits // domains
+        return [list(range(i * size, (i + 1) * size)) for i in range(domains)]
+    return [list(domain) for domain in domains]
@@ -2,10 +2,13 @@
 Prepare Dicke state D(n,k) in an n-qubit system with k-Hamming-weight.
 When k=1, this module is equivalent to W state generation.
 A build-in W state generation supports implementation on a linear architecture.
+Dicke states of any k can be prepared on a linear architecture by the split-and-cyclic-shift construction.
 Ref. https://doi.org/10.1109/QCE53715.2022.00027
 Ref. https://doi.org/10.1002/qute.201900015
+Ref. https://doi.org/10.1007/978-3-030-25027-0_9
 
 """
+from collections import OrderedDict
 from math import ceil, acos
 from scipy.special import comb
 import pyqpanda as pq
@@ -13,7 +16,8 @@ import pyqpanda as pq
 from .. config import *
 auth = Authorization()
 
-
+CACHE_SIZE = 128
+_circuit_cache = OrderedDict()
 
 
 def prepare_dicke_state(q_list, k, compress=True):
@@ -174,3 +178,217 @@ def linear_w_state(q_list, compress=True):
 
     """
     pass
+
+
+def linear_dicke_state(q_list, k):
+    """Prepare Dicke state on a linear nearest-neighbor device, for any Hamming weight.
+
+    The circuit follows the split-and-cyclic-shift (SCS) construction of [1],
+    :math:`D_n^{(k)}=\\prod_{l=2}^{k} SCS_{l,l-1}\\prod_{l=k+1}^{n} SCS_{l,k}\\ket{0^{n-k}1^k}`, with every gate acting on
+    neighboring qubits of ``q_list``. The qubit shared by all blocks of :math:`SCS_{m,k}` is moved along its
+    window by :math:`k` SWAP gates, so that each doubly-controlled rotation has its target between its two
+    controls, and moved back afterwards. Each :math:`SCS_{m,k}` thus uses at most :math:`6k-2` CNOT,
+    :math:`4k-2` RY and :math:`2k` SWAP gates, which bounds the total size and depth by :math:`O(nk)`.
+    See ``dicke_circuit_report`` for the exact counts.
+
+    Parameters
+        q_list: ``QVec``, ``List[Qubit]``, shape (n,)\n
+            Qubit addresses, in the order of the line. List size is supposed to be the :math:`n`
+            of :math:`D_{n}^{(k)}`.
+        k : ``int``, k>0\n
+            The target Hamming weight of the Dicke state to be prepared.
+
+    Return
+        circuit : ``pyqpanda QCircuit``\n
+            A pyqpanda QCircuit which assumes the input state is all 0.
+
+    Raises
+        ValueError\n
+            If the target Hamming weight is larger than the input qubit number (:math:`k<n`),
+            or k is invalid (:math:`k<0`), or qubit number is 0 (:math:`n=0`).
+
+    Reference
+        [1] Bärtschi A, Eidenbenz S. Deterministic preparation of Dicke states[C]
+        International Symposium on Fundamentals of Computation Theory. Springer, 2019: 126-139.
+        https://doi.org/10.1007/978-3-030-25027-0_9
+
+    Examples
+        .. code-block:: python
+
+            import pyqpanda as pq
+            from pyqpanda_alg.QAOA import dstate
+
+            n = 5
+            k = 2
+            machine = pq.CPUQVM()
+            machine.initQVM()
+            qubits = machine.qAlloc_many(n)
+            prog = pq.QProg()
+            prog << dstate.linear_dicke_state(qubits, k)
+            results = machine.prob_run_list(prog, qubits)
+            for key in range(2**n):
+                if results[key] > 1e-10:
+                    print(bin(key)[2::].zfill(n), results[key])
+
+    """
+    return _scs_circuit(q_list, k, linear=True)
+
+
+def dicke_circuit_report(n, k, linear=True):
+    """Gate counts and depth of the split-and-cyclic-shift Dicke state circuit, without building or
+    simulating it.
+
+    Parameters
+        n : ``int``\n
+            Qubit number.
+        k : ``int``\n
+            The target Hamming weight.
+        linear : ``bool``, ``optional``\n
+            If True, report the circuit of ``linear_dicke_state`` for a linear nearest-neighbor device,
+            otherwise the same construction for all-to-all connectivity, without SWAP gates. Default is True.
+
+    Return
+        report : ``dict``\n
+            ``gates``, the number of gates by name (``X``, ``RY``, ``CNOT``, ``SWAP``), ``cnot_count``, the number
+            of CNOT gates with a SWAP counted as 3 CNOT, ``depth``, the circuit depth, and ``cnot_depth``, the
+            depth counting CNOT and SWAP gates only.
+
+    Raises
+        ValueError\n
+            See ``linear_dicke_state``.
+
+    Examples
+        >>> from pyqpanda_alg.QAOA import dstate
+        >>> print(dstate.dicke_circuit_report(4, 2))
+        >>> print(dstate.dicke_circuit_report(4, 2, linear=False))
+
+    """
+    counts = dict.fromkeys(('X', 'RY', 'CNOT', 'SWAP'), 0)
+    depth, cnot_depth = [0] * n, [0] * n
+    for name, qubits, _ in _scs_gates(n, k, linear):
+        counts[name] += 1
+        layer = max(depth[q] for q in qubits) + 1
+        for q in qubits:
+            depth[q] = layer
+        if len(qubits) == 2:
+            layer = max(cnot_depth[q] for q in qubits) + 1
+            for q in qubits:
+                cnot_depth[q] = layer
+    return {'gates': counts, 'cnot_count': counts['CNOT'] + 3 * counts['SWAP'],
+            'depth': max(depth), 'cnot_depth': max(cnot_depth)}
+
+
+def _scs_circuit(q_list, k, linear):
+    gates = {'X': pq.X, 'RY': pq.RY, 'CNOT': pq.CNOT, 'SWAP': pq.SWAP}
+    circuit = pq.QCircuit()
+    for name, qubits, angle in _scs_gates(len(q_list), k, linear):
+        args = [q_list[q] for q in qubits] + ([] if angle is None else [angle])
+        circuit << gates[name](*args)
+    return circuit
+
+
+def _scs_gates(n, k, linear):
+    """Gates ``(name, qubit indexes, angle)`` of the SCS construction of the Dicke state."""
+    if n <= 0 or k < 0 or k > n:
+        raise ValueError('invalid Dicke state D(n={}, k={})'.format(n, k))
+    gates = [('X', (q,), None) for q in range(n - k, n)]
+    if k == n:
+        return gates
+    # position[q] is the line position of logical qubit q
+    position = list(range(n))
+    line = list(range(n))
+
+    def swap(a, b):
+        gates.append(('SWAP', (a, b), None))
+        line[a], line[b] = line[b], line[a]
+        position[line[a]], position[line[b]] = a, b
+
+    def move(q, target):
+        while position[q] > target:
+            swap(position[q] - 1, position[q])
+        while position[q] < target:
+            swap(position[q], position[q] + 1)
+
+    def scs(m, kk):
+        hub = m - 1
+        for l in range(1, kk + 1):
+            t = m - 1 - l
+            theta = 2 * acos(((1 if l == 1 else l) / m) ** 0.5)
+            if l == 1:
+                gates.append(('CNOT', (position[t], position[hub]), None))
+                gates.extend(_cry(position[hub], position[t], theta))
+                gates.append(('CNOT', (position[t], position[hub]), None))
+                continue
+            if linear:
+                # the hub passes the target, to sit on its left while the other control sits on its right
+                move(hub, position[t] if position[hub] > position[t] else position[t] - 1)
+            gates.append(('CNOT', (position[t], position[hub]), None))
+            gates.extend(_ccry(position[hub], position[m - l], position[t], theta))
+            gates.append(('CNOT', (position[t], position[hub]), None))
+        if linear:
+            move(hub, m - 1)
+
+    for m in range(n, k, -1):
+        scs(m, k)
+    for m in range(k, 1, -1):
+        scs(m, m - 1)
+    return gates
+
+
+def _cry(control, target, theta):
+    return [('RY', (target,), theta / 2), ('CNOT', (control, target), None),
+            ('RY', (target,), -theta / 2), ('CNOT', (control, target), None)]
+
+
+def _ccry(control_a, control_b, target, theta):
+    # the target rotates by theta/4 with alternating signs, which adds up only if both controls are 1
+    gates = []
+    for i, control in enumerate((control_a, control_b, control_a, control_b)):
+        gates.append(('RY', (target,), theta / 4 if i % 2 == 0 else -theta / 4))
+        gates.append(('CNOT', (control, target), None))
+    return gates
+
+
+def cached_dicke_state(q_list, k, compress=True):
+    """Prepare Dicke state, memoized by the qubit layout.
+
+    The circuit is the split-and-cyclic-shift construction of ``linear_dicke_state`` for all-to-all
+    connectivity, without SWAP gates, see ``dicke_circuit_report(n, k, linear=False)``. It is built once for
+    every ``k`` and sequence of qubit objects, e.g. the qubits allocated once by a machine, and returned from a
+    least-recently-used cache of ``CACHE_SIZE`` circuits afterwards. The returned circuit is shared between the
+    calls and should not be modified.
+
+    Parameters
+        q_list: ``QVec``, ``List[Qubit]``, shape (n,)\n
+            Qubit addresses.
+        k : ``int``, k>0\n
+            The target Hamming weight of the Dicke state to be prepared.
+        compress : ``bool``, ``optional``\n
+            Accepted for compatibility with ``prepare_dicke_state``. The circuit is made of basic gates
+            either way.
+
+    Return
+        circuit : ``pyqpanda QCircuit``\n
+            A pyqpanda QCircuit which assumes the input state is all 0.
+
+    Raises
+        ValueError\n
+            See ``linear_dicke_state``.
+
+    """
+    # the circuit refers to the qubit objects, so it is keyed by them rather than by their addresses, which are
+    # reused by other machines; the entry keeps the qubits alive so that their ids are not reused either
+    key = (k, tuple(id(q) for q in q_list))
+    if key in _circuit_cache:
+        _circuit_cache.move_to_end(key)
+        return _circuit_cache[key][1]
+    circuit = _scs_circuit(q_list, k, linear=False)
+    _circuit_cache[key] = (tuple(q_list), circuit)
+    if len(_circuit_cache) > CACHE_SIZE:
+        _circuit_cache.popitem(last=False)
+    return circuit
+
+
+def clear_cache():
+    """Empty the circuit cache of ``cached_dicke_state``."""
+    _circuit_cache.clear()
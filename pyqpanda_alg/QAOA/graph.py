@@ -0,0 +1,241 @@
+"""
+Graph-native problem input for MaxCut-style QAOA.
+
+A weighted graph is converted into the Ising Hamiltonian of the MaxCut minimization
+
+.. math::
+    f(\\vec{x}) = -\sum_{(i,j)\in E} w_{ij}(x_i + x_j - 2x_ix_j)
+    = \sum_{(i,j)\in E} \\frac{w_{ij}}{2}Z_iZ_j - \\frac{1}{2}\sum_{(i,j)\in E} w_{ij}
+
+directly from the edge arrays, without building a sympy polynomial first.
+
+"""
+import numpy as np
+import pyqpanda as pq
+from scipy import sparse
+
+from .. config import *
+auth = Authorization()
+
+
+class MaxCutGraph:
+    """
+    Weighted undirected graph of a MaxCut problem, stored as edge arrays.
+
+    Parameters
+        edges : ``array-like``, ``optional``\n
+            Edge list of ``(i, j)`` or ``(i, j, weight)`` rows. Unweighted edges have weight 1.
+
+        adjacency : ``ndarray`` or ``scipy.sparse`` matrix, ``optional``\n
+            Square weighted adjacency matrix. A symmetric matrix contributes its upper triangle, otherwise
+            :math:`A_{ij}+A_{ji}` is used as the weight of edge :math:`(i, j)`.
+
+        n_nodes : ``integer``, ``optional``\n
+            Number of nodes. Only needed for an edge list whose last nodes are isolated.
+
+    Exactly one of ``edges`` and ``adjacency`` should be given. Duplicate edges are summed and self-loops
+    are ignored. An empty edge list gives a graph without edges on ``n_nodes`` nodes (default 0).
+
+    Raises
+        ValueError\n
+            If the graph input is invalid.
+
+    Attributes
+        n_nodes : ``integer``\n
+            Number of nodes, and also the qubit number.
+        rows, cols : ``ndarray``\n
+            End nodes of the edges, with ``rows < cols``.
+        weights : ``ndarray``\n
+            Weights of the edges.
+
+    Examples
+        Build the Hamiltonian and the energy table of a weighted triangle.
+
+    >>> import numpy as np
+    >>> from pyqpanda_alg.QAOA import graph
+    >>> g = graph.MaxCutGraph(edges=[(0, 1, 1.0), (1, 2, 2.0), (0, 2, 0.5)])
+    >>> print(g.pauli_operator())
+        {
+        "" : -1.750000,
+        "Z0 Z1" : 0.500000,
+        "Z0 Z2" : 0.250000,
+        "Z1 Z2" : 1.000000
+        }
+    >>> print(g.energy_table())
+        [ 0.  -1.5 -3.  -2.5 -2.5 -3.  -1.5  0. ]
+
+    """
+
+    def __init__(self, edges=None, adjacency=None, n_nodes=None):
+        if (edges is None) == (adjacency is None):
+            raise ValueError('exactly one of edges and adjacency should be given')
+        if adjacency is not None:
+            if adjacency.ndim != 2 or adjacency.shape[0] != adjacency.shape[1]:
+                raise ValueError('adjacency matrix should be square, got shape {}'.format(adjacency.shape))
+            self.n_nodes = adjacency.shape[0] if n_nodes is None else int(n_nodes)
+            if self.n_nodes != adjacency.shape[0]:
+                raise ValueError('n_nodes={} does not match the adjacency matrix'.format(n_nodes))
+            self.rows, self.cols, self.weights = self._from_adjacency(adjacency)
+        else:
+            edges = np.asarray(edges, dtype=float)
+            edges = edges.reshape(0, 2) if edges.size == 0 else edges.reshape(len(edges), -1)
+            if edges.shape[1] not in (2, 3):
+                raise ValueError('edges should have rows of (i, j) or (i, j, weight), got shape {}'
+                                 .format(edges.shape))
+            max_node = int(edges[:, :2].max()) + 1 if len(edges) else 0
+            self.n_nodes = max_node if n_nodes is None else int(n_nodes)
+            if len(edges) and edges[:, :2].min() < 0 or self.n_nodes < max_node:
+                raise ValueError('node indexes should be in range [0, {})'.format(self.n_nodes))
+            self.rows, self.cols, self.weights = self._from_edges(edges, self.n_nodes)
+        self._energy_table = None
+        self._features = None
+
+    @staticmethod
+    def _from_adjacency(matrix):
+        if sparse.issparse(matrix):
+            matrix = sparse.coo_matrix(matrix)
+            if abs(matrix - matrix.T).max() > 1e-12:
+                matrix = matrix + matrix.T
+            upper = sparse.triu(matrix, k=1).tocoo()
+            upper.sum_duplicates()
+            keep = upper.data != 0
+            return upper.row[keep], upper.col[keep], upper.data[keep].astype(float)
+        matrix = np.asarray(matrix, dtype=float)
+        if not np.allclose(matrix, matrix.T, rtol=0, atol=1e-12):
+            matrix = matrix + matrix.T
+        rows, cols = np.triu_indices(len(matrix), k=1)
+        weights = matrix[rows, cols]
+        keep = weights != 0
+        return rows[keep], cols[keep], weights[keep]
+
+    @staticmethod
+    def _from_edges(edges, n_nodes):
+        rows = edges[:, 0].astype(int)
+        cols = edges[:, 1].astype(int)
+        weights = edges[:, 2] if edges.shape[1] == 3 else np.ones(len(rows))
+        keep = rows != cols
+        rows, cols, weights = rows[keep], cols[keep], weights[keep]
+        keys, inverse = np.unique(np.minimum(rows, cols) * n_nodes + np.maximum(rows, cols), return_inverse=True)
+        return keys // n_nodes, keys % n_nodes, np.bincount(inverse, weights=weights, minlength=len(keys))
+
+    def adjacency(self):
+        """
+        Return
+            adjacency : ``scipy.sparse.csr_matrix``\n
+                Symmetric weighted adjacency matrix.
+        """
+        upper = sparse.coo_matrix((self.weights, (self.rows, self.cols)), shape=(self.n_nodes, self.n_nodes))
+        return (upper + upper.T).tocsr()
+
+    def z_terms(self):
+        """
+        Ising Z-terms of the problem, in the list form of ``pq.PauliOperator.toHamiltonian``.
+
+        Return
+            hamiltonian : ``list[tuple]``\n
+                ``({}, constant)`` followed by ``({i: 'Z', j: 'Z'}, w_ij / 2)`` for every edge.
+        """
+        terms = [({}, -0.5 * float(self.weights.sum()))]
+        terms.extend(({int(i): 'Z', int(j): 'Z'}, 0.5 * float(w))
+                     for i, j, w in zip(self.rows, self.cols, self.weights))
+        return terms
+
+    def pauli_operator(self):
+        """
+        Return
+            operator : ``pq.PauliOperator``\n
+                Ising Hamiltonian of the problem, which can be used as the problem of ``QAOA``.
+        """
+        terms = {'': -0.5 * float(self.weights.sum())}
+        for i, j, w in zip(self.rows, self.cols, self.weights):
+            terms['Z{} Z{}'.format(i, j)] = 0.5 * float(w)
+        return pq.PauliOperator(terms)
+
+    def energy_table(self):
+        """
+        Function values of all :math:`2^n` computational basis states. Bit :math:`i` of the index is
+        :math:`x_i`, i.e. the first qubit sits at the right-most position of the binary key. The table is
+        built by doubling in :math:`O(2^n)` and cached.
+
+        Return
+            energies : ``ndarray``, shape (2^n,)\n
+                :math:`f(\\vec{x})`, the negative cut value of each state.
+        """
+        if self._energy_table is None:
+            adjacency = self.adjacency().toarray()
+            table = np.zeros(1)
+            for k in range(self.n_nodes):
+                # linear[x] = sum_j w_jk x_j over the lower nodes j < k
+                linear = np.zeros(1)
+                for weight in adjacency[:k, k]:
+                    linear = np.concatenate([linear, linear + weight])
+                table = np.concatenate([table - linear, table - (adjacency[:k, k].sum() - linear)])
+            self._energy_table = table
+        return self._energy_table
+
+    def cut_value(self, x):
+        """
+        Parameters
+            x : ``array-like``\n
+                One binary solution in vector form, :math:`x_i` being the side of node :math:`i`.
+
+        Return
+            ``float``\n
+                Total weight of the edges cut by the solution.
+        """
+        x = np.asarray(x)
+        return float(self.weights[x[self.rows] != x[self.cols]].sum())
+
+    def phase_circuit(self, qlist, gamma):
+        """
+        Circuit of the phase separator :math:`e^{-i\gamma H}` of the problem, one ``CNOT-RZ-CNOT`` block per edge.
+
+        Parameters
+            qlist : ``qubit list``\n
+            gamma : ``float``\n
+                Value of :math:`\gamma` in :math:`e^{-i\gamma H}`.
+
+        Return
+            circuit : ``pq.QCircuit``\n
+                Circuit of the phase separator.
+
+            constant : ``float``\n
+                Constant number in the hamiltonian.
+        """
+        circuit = pq.QCircuit()
+        for i, j, w in zip(self.rows, self.cols, self.weights):
+            circuit << pq.CNOT(qlist[i], qlist[j]) << pq.RZ(qlist[j], gamma * w) << pq.CNOT(qlist[i], qlist[j])
+        return circuit, -0.5 * float(self.weights.sum())
+
+    def features(self):
+        """
+        Graph features commonly used by QAOA parameter heuristics, computed once and cached.
+
+        Return
+            features : ``dict``\n
+                ``n_nodes``, ``n_edges``, ``density``, ``degrees``, ``weighted_degrees``, ``mean_degree``,
+                ``regular`` (the common degree, or None), ``total_weight``, ``mean_weight``, ``std_weight``,
+                ``weighted`` and ``triangles``.
+        """
+        if self._features is None:
+            n, m = self.n_nodes, len(self.weights)
+            degrees = np.bincount(np.concatenate([self.rows, self.cols]), minlength=n)
+            weighted_degrees = np.bincount(np.concatenate([self.rows, self.cols]),
+                                           weights=np.concatenate([self.weights, self.weights]), minlength=n)
+            unweighted = self.adjacency()
+            unweighted.data[:] = 1
+            self._features = {
+                'n_nodes': n,
+                'n_edges': m,
+                'density': 2 * m / (n * (n - 1)) if n > 1 else 0.,
+                'degrees': degrees,
+                'weighted_degrees': weighted_degrees,
+                'mean_degree': float(degrees.mean()) if n else 0.,
+                'regular': int(degrees[0]) if n and np.all(degrees == degrees[0]) else None,
+                'total_weight': float(self.weights.sum()),
+                'mean_weight': float(self.weights.mean()) if m else 0.,
+                'std_weight': float(self.weights.std()) if m else 0.,
+                'weighted': bool(m and not np.allclose(self.weights, self.weights[0])),
+                'triangles': int(round((unweighted @ unweighted).multiply(unweighted).sum() / 6)),
+            }
+        return self._features
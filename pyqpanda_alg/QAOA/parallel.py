@@ -0,0 +1,77 @@
+"""
+Fan out independent QAOA workloads to any ``concurrent.futures.Executor``.
+
+Work items are grouped into chunks, each chunk is one executor task, and results are streamed back in
+completion order, so that partial results are available before the whole batch is finished.
+
+"""
+from concurrent.futures import as_completed
+from itertools import islice
+
+from .. config import *
+auth = Authorization()
+
+
+def chunked(iterable, chunksize):
+    """
+    Split an iterable into lists of at most ``chunksize`` consecutive ``(index, item)`` pairs.
+    """
+    if chunksize < 1:
+        raise ValueError('chunksize should be a positive integer, got {}'.format(chunksize))
+    iterator = enumerate(iterable)
+    while True:
+        chunk = list(islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _run_chunk(func, chunk):
+    return [(index, func(item)) for index, item in chunk]
+
+
+def map_unordered(func, iterable, executor=None, chunksize=1):
+    """
+    Apply ``func`` to every item and stream the results in completion order.
+
+    Parameters
+        func : ``callable``\n
+            ``func(item) -> result``. For a process pool or a remote executor it has to be picklable,
+            e.g. a module level function or a ``functools.partial`` of one.
+        iterable : ``iterable``\n
+            Work items.
+        executor : ``concurrent.futures.Executor``, ``optional``\n
+            Executor to run the chunks, e.g. a ``ThreadPoolExecutor``, a ``ProcessPoolExecutor`` or a
+            user-provided executor dispatching to other nodes. If not given, the items are evaluated
+            serially in the calling thread.
+        chunksize : ``integer``, ``optional``\n
+            Number of items per executor task. Default is 1.
+
+    Return
+        results : ``generator``\n
+            Yields ``(index, result)`` as soon as the chunk containing the item completes, where ``index``
+            is the position of the item in ``iterable``. Closing the generator early cancels the chunks
+            which have not started yet.
+
+    Example
+        .. code-block:: python
+
+            from concurrent.futures import ThreadPoolExecutor
+            from pyqpanda_alg.QAOA import parallel
+
+            with ThreadPoolExecutor(4) as executor:
+                for index, value in parallel.map_unordered(abs, [-3, 1, -2], executor, chunksize=2):
+                    print(index, value)
+
+    """
+    if executor is None:
+        for index, item in enumerate(iterable):
+            yield index, func(item)
+        return
+    futures = [executor.submit(_run_chunk, func, chunk) for chunk in chunked(iterable, chunksize)]
+    try:
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
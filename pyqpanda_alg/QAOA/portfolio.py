@@ -0,0 +1,191 @@
+"""
+Race several optimizers on one objective function under a shared evaluation budget.
+
+Every optimizer runs in its own thread from the same starting point. The budget is released in rounds:
+once all running optimizers have used their share of a round, they are ranked by the best function value
+they have seen, the laggards are stopped and the remaining budget is split among the leaders, which then
+continue from where they paused. This is a successive halving race without restarts.
+
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from math import ceil, log2
+
+import numpy as np
+from scipy.optimize import minimize
+
+from . import spsa
+from .. config import *
+auth = Authorization()
+
+
+class _Stopped(Exception):
+    pass
+
+
+class _Racer:
+
+    def __init__(self, name, options):
+        self.name = name
+        self.options = options
+        self.used = 0
+        self.allowance = 0
+        self.best_value = np.inf
+        self.best_x = None
+        self.paused = False
+        self.done = False
+        self.killed = False
+        self.error = None
+        self.eliminated = None
+
+
+def race(func, x0, optimizers, budget, args=(), bounds=None, optimizer_option=None, rounds=None, keep=0.5):
+    """
+    Run several optimizers concurrently under a shared evaluation budget and keep the best one.
+
+    Parameters
+        func : ``callable``\n
+            The objective function to be minimized, ``fun(x, *args) -> float``. It is called from several
+            threads at once.
+
+        x0 : ``ndarray``, shape (n,)\n
+            Starting point of all optimizers.
+
+        optimizers : ``List[string]``\n
+            Names of the optimizers, ``SPSA`` or a method of ``scipy.optimize.minimize``.
+
+        budget : ``integer``\n
+            Total number of function evaluations shared by all optimizers.
+
+        args : ``tuple``, ``optional``\n
+            Extra arguments passed to the objective function.
+
+        bounds : ``List[tuple]``, ``optional``\n
+            Bounds for the variables, passed to every optimizer.
+
+        optimizer_option : ``dict``, ``optional``\n
+            Options of each optimizer, keyed by its name. The options of ``SPSA`` are passed to
+            ``spsa.spsa_minimize``, the others are the ``options`` of ``scipy.optimize.minimize``.
+
+        rounds : ``integer``, ``optional``\n
+            Number of rounds the budget is released in. Default is :math:`\\lceil\\log_2 m\\rceil+1` for
+            :math:`m` optimizers.
+
+        keep : ``float``, ``optional``\n
+            Fraction of the ranked optimizers kept after each round, at least one. Default is 0.5.
+
+    Return
+        result : ``dict``\n
+            - ``winner`` : name of the optimizer which found the best value.
+            - ``x``, ``fun`` : best point and its function value.
+            - ``nfev`` : total number of function evaluations.
+            - ``evaluations`` : number of evaluations used by each optimizer.
+            - ``eliminated`` : round after which each stopped optimizer was eliminated.
+
+    Raises
+        ValueError\n
+            If no optimizer is given, or the budget is smaller than the number of optimizers.
+        RuntimeError\n
+            If every optimizer failed. The first error is chained.
+
+    Example
+        .. code-block:: python
+
+            import numpy as np
+            from pyqpanda_alg.QAOA import portfolio
+
+            def f(x):
+                return float(np.sum((x - 1) ** 2) + np.random.normal(0, 0.01))
+
+            result = portfolio.race(f, np.zeros(4), ['SPSA', 'COBYLA', 'Nelder-Mead', 'Powell'], budget=400)
+            print(result['winner'], result['fun'], result['evaluations'])
+
+    """
+    optimizers = list(optimizers)
+    if not optimizers:
+        raise ValueError('at least one optimizer should be given')
+    if budget < len(optimizers):
+        raise ValueError('budget {} is smaller than the number of optimizers'.format(budget))
+    optimizer_option = optimizer_option or {}
+    rounds = ceil(log2(len(optimizers))) + 1 if rounds is None else max(int(rounds), 1)
+    racers = [_Racer(name, optimizer_option.get(name, {})) for name in optimizers]
+    x0 = np.array(x0, dtype=float)
+    condition = threading.Condition()
+
+    def objective(racer, x):
+        with condition:
+            while racer.used >= racer.allowance and not racer.killed:
+                racer.paused = True
+                condition.notify_all()
+                condition.wait()
+            racer.paused = False
+            if racer.killed:
+                raise _Stopped
+            racer.used += 1
+        value = spsa._check_scalar(func(x, *args))
+        with condition:
+            if value < racer.best_value:
+                racer.best_value, racer.best_x = value, np.array(x, dtype=float)
+        return value
+
+    def run(racer):
+        try:
+            _minimize(racer, lambda x: objective(racer, x), x0, bounds, budget)
+        except _Stopped:
+            pass
+        except Exception as error:
+            racer.error = error
+        with condition:
+            racer.done = True
+            condition.notify_all()
+
+    with ThreadPoolExecutor(max_workers=len(racers)) as executor:
+        with condition:
+            for racer in racers:
+                racer.allowance = max(budget // (rounds * len(racers)), 1)
+            for racer in racers:
+                executor.submit(run, racer)
+            for round_index in range(1, rounds + 1):
+                condition.wait_for(lambda: all(r.done or r.paused or r.killed for r in racers))
+                running = [r for r in racers if not (r.done or r.killed)]
+                if not running:
+                    break
+                remaining = budget - sum(r.used for r in racers)
+                if round_index < rounds:
+                    ranked = sorted((r for r in racers if not r.killed and r.error is None),
+                                    key=lambda r: r.best_value)
+                    leaders = ranked[:max(ceil(len(ranked) * keep), 1)]
+                    for r in running:
+                        if r not in leaders:
+                            r.killed, r.eliminated = True, round_index
+                    running = [r for r in running if not r.killed]
+                    share = remaining // ((rounds - round_index) * len(running)) if running else 0
+                else:
+                    share = 0
+                for r in running:
+                    r.allowance, r.paused = r.used + share, False
+                    if share == 0:
+                        r.killed = True
+                condition.notify_all()
+            condition.wait_for(lambda: all(r.done for r in racers))
+
+    candidates = [r for r in racers if r.best_x is not None]
+    if not candidates:
+        raise RuntimeError('every optimizer failed') from next((r.error for r in racers if r.error), None)
+    winner = min(candidates, key=lambda r: r.best_value)
+    return {'winner': winner.name, 'x': winner.best_x, 'fun': winner.best_value,
+            'nfev': sum(r.used for r in racers),
+            'evaluations': {r.name: r.used for r in racers},
+            'eliminated': {r.name: r.eliminated for r in racers if r.eliminated is not None}}
+
+
+def _minimize(racer, objective, x0, bounds, budget):
+    # the race decides when to stop, so the optimizers should not stop earlier by their iteration limit
+    options = dict(racer.options)
+    options.setdefault('maxiter', budget)
+    if racer.name == 'SPSA':
+        # keep the learning rate of a default SPSA run, which scales with maxiter through A
+        options.setdefault('A', 10)
+        spsa.spsa_minimize(objective, x0, bounds=bounds, **options)
+    else:
+        minimize(objective, x0, method=racer.name, bounds=bounds, options=options)
@@ -1,9 +1,18 @@
+import re
+from functools import partial
+
 import pyqpanda as pq
 import numpy as np
 from scipy.optimize import minimize
+from scipy.special import logsumexp
 from scipy.interpolate import barycentric_interpolate as b_interp
 import sympy as sp
+from scipy import sparse
 from . import spsa
+from . import parallel
+from . import portfolio
+from . import statevector
+from .graph import MaxCutGraph
 from .default_circuits import *
 
 from .. config import *
@@ -130,6 +139,75 @@ def parameter_interpolate(pm):
     pass
 
 
+def gibbs_loss(energies, probs, temperature=1, jac=False, prob_jacobian=None):
+    """
+    Calculate the Gibbs loss function :math:`f_G=-\ln \langle e^{-E/T}\\rangle` in one vectorized pass.
+
+    The loss is evaluated as a weighted log-sum-exp, so that it stays finite for low temperatures and
+    large energy spreads, where :math:`e^{-E/T}` itself would underflow or overflow.
+
+    Parameters
+        energies : ``array-like``\n
+            Function values :math:`E_i` of the states.
+
+        probs : ``array-like``\n
+            Probabilities (or frequencies) :math:`p_i` of the states, with the same shape as ``energies``.
+
+        temperature : ``float``, ``optional``\n
+            Temperature :math:`T>0`. Default is 1.
+
+        jac : ``bool``, ``optional``\n
+            If True, also return the analytic gradient. Default is False.
+
+        prob_jacobian : ``array-like``, ``optional``\n
+            Jacobian :math:`\partial p_i/\partial \\theta_j` of the probabilities with respect to the circuit
+            parameters, with shape ``(len(probs), n_params)``. If given and ``jac`` is True, the gradient is
+            returned with respect to the circuit parameters instead of the probabilities.
+
+    Return
+        loss : ``float``\n
+            Gibbs loss :math:`G=-\log (\sum_i p_i \exp(-E_i/T))`.
+
+        grad : ``ndarray``\n
+            Only returned if ``jac`` is True. Gradient :math:`\partial G/\partial p_i=-e^{-E_i/T+G}`, or
+            :math:`\sum_i \partial G/\partial p_i \cdot \partial p_i/\partial \\theta_j` if ``prob_jacobian``
+            is given.
+
+    Raises
+        ValueError\n
+            If ``temperature`` is not positive or ``energies`` and ``probs`` have different shapes.
+
+    Example
+        Gibbs loss of a distribution whose energies are far too large for a direct exponential.
+
+    >>> import numpy as np
+    >>> from pyqpanda_alg.QAOA import qaoa
+    >>> energies = np.array([-1000., 0., 1000.])
+    >>> probs = np.array([0.2, 0.3, 0.5])
+    >>> loss, grad = qaoa.gibbs_loss(energies, probs, temperature=0.5, jac=True)
+    >>> print(loss)
+        -1998.390562087566
+    >>> print(grad)
+        [-5. -0. -0.]
+
+    """
+    if temperature <= 0:
+        raise ValueError('temperature should be positive, got {}'.format(temperature))
+    energies = np.asarray(energies, dtype=float)
+    probs = np.asarray(probs, dtype=float)
+    if energies.shape != probs.shape:
+        raise ValueError('energies and probs should have the same shape, got {} and {}'
+                         .format(energies.shape, probs.shape))
+    exponent = -energies / temperature
+    loss = -logsumexp(exponent, b=probs)
+    if not jac:
+        return loss
+    grad = -np.exp(exponent + loss)
+    if prob_jacobian is not None:
+        grad = grad @ np.asarray(prob_jacobian, dtype=float)
+    return loss, grad
+
+
 def pauli_z_operator_to_circuit(operator, qlist, gamma=np.pi):
     """
     Circuit of simulation diagonal Hamiltonian :math:`e^{-iH\theta}`.
@@ -215,14 +293,26 @@ class QAOA:
             The problem dimension, and also the qubit number.
         circuit iter : ``integer``\n
             The number of times the quantum circuit being called during optimization.
+        graph : ``graph.MaxCutGraph``\n
+            The graph of the problem, only for objects constructed by ``from_graph``.
 
     Methods
+        from_graph : Construct a MaxCut QAOA directly from a weighted graph.
+
         calculate_energy : Calculate the function value for one solution.
 
         run_qaoa_circuit : Given parameters, run the qaoa circuit and get the theoretical probability distribution.
 
         run : run the optimization process
 
+        evaluate_batch : Run the qaoa circuit for a batch of parameters, in parallel by an executor.
+
+        run_multistart : Optimize from several initial parameters, in parallel by an executor.
+
+        layer_sweep : Optimize with several layer numbers, in parallel by an executor.
+
+        run_portfolio : Race several optimizers under a shared evaluation budget.
+
 
 
     Reference
@@ -238,6 +328,62 @@ class QAOA:
                  mixer_circuit=None, norm=False):
         pass
 
+    @classmethod
+    def from_graph(cls, graph, init_circuit=None, mixer_circuit=None, norm=False, adjacency=None):
+        """
+        Construct a MaxCut QAOA directly from a weighted graph, without building a sympy polynomial.
+
+        Parameters
+            graph : ``graph.MaxCutGraph``, ``array-like`` or ``scipy.sparse`` matrix\n
+                The graph to be cut. A ``scipy.sparse`` matrix is taken as the weighted adjacency matrix, and
+                a NumPy array as an adjacency matrix if it is square and has neither 2 nor 3 columns. Other
+                inputs are taken as an edge list of ``(i, j)`` or ``(i, j, weight)`` rows.
+
+            init_circuit, mixer_circuit, norm :\n
+                See ``QAOA``.
+
+            adjacency : ``bool``, ``optional``\n
+                If True, ``graph`` is an adjacency matrix, if False an edge list. Required for a 2x2 or 3x3
+                NumPy array, which could be either. Default is to infer it as above.
+
+        Raises
+            ValueError\n
+                If ``graph`` is a 2x2 or 3x3 NumPy array and ``adjacency`` is not given.
+
+        Return
+            qaoa : ``QAOA``\n
+                The QAOA object of the Ising Hamiltonian of the graph. The graph is kept in its ``graph``
+                attribute, which provides the energy table, the phase-separator circuit and the graph features.
+
+        Example
+            Maximize the cut of a weighted square.
+
+        .. code-block:: python
+
+            import numpy as np
+            from pyqpanda_alg.QAOA.qaoa import QAOA
+
+            edges = [(0, 1, 1.0), (1, 2, 0.5), (2, 3, 1.0), (3, 0, 0.5)]
+            qaoa_f = QAOA.from_graph(edges)
+            print(qaoa_f.graph.features()['regular'])
+            qaoa_result = qaoa_f.run(layer=2)
+
+        """
+        if not isinstance(graph, MaxCutGraph):
+            if adjacency is None:
+                square = isinstance(graph, np.ndarray) and graph.ndim == 2 and graph.shape[0] == graph.shape[1]
+                if square and graph.shape[1] in (2, 3):
+                    raise ValueError('a {0}x{0} array may be an adjacency matrix or an edge list, '
+                                     'set adjacency to True or False'.format(graph.shape[0]))
+                adjacency = sparse.issparse(graph) or square
+            if adjacency:
+                graph = MaxCutGraph(adjacency=graph)
+            else:
+                graph = MaxCutGraph(edges=graph)
+        qaoa_f = cls(graph.pauli_operator(), init_circuit, mixer_circuit, norm)
+        qaoa_f.graph = graph
+        return qaoa_f
+
     def calculate_energy(self, x):
         """
         Calculate the function value for one solution.
@@ -470,6 +616,9 @@ class QAOA:
 
                     :math:`G=-\log (\sum_{i=0}^{2^n-1} p_i \exp(-E_i/T))`.
 
+                ``gibbs_loss`` evaluates this form as a log-sum-exp over the energy and probability arrays,
+                which stays finite for low temperatures and provides the analytic gradient.
+
 
             - CVaR loss function:\n
                 Inspired by Ref[3].Instead of the traditional energy expectation value, using the Conditional Value at
@@ -508,3 +657,420 @@ class QAOA:
         """
         pass
 
+    def evaluate_batch(self, parameters, shots=-1, executor=None, chunksize=1):
+        """
+        Run the qaoa circuit for a batch of parameters and stream the probability distributions.
+
+        Parameters
+            parameters : ``iterable``\n
+                Pairs ``(gammas, betas)`` of QAOA parameters. See ``run_qaoa_circuit``.
+
+            shots : ``integer``, ``optional``\n
+                See ``run_qaoa_circuit``. Default is -1.
+
+            executor : ``concurrent.futures.Executor``, ``optional``\n
+                Executor to evaluate the batch, e.g. a thread pool, a process pool or a user-provided executor
+                dispatching to other nodes. For a process pool or a remote executor the QAOA object has to be
+                picklable. If not given, the batch is evaluated serially.
+
+            chunksize : ``integer``, ``optional``\n
+                Number of parameter pairs per executor task. Default is 1.
+
+        Return
+            results : ``generator``\n
+                Yields ``(index, prob_result)`` in completion order, where ``index`` is the position of the
+                parameters in the batch and ``prob_result`` is the result of ``run_qaoa_circuit``.
+
+        Example
+            .. code-block:: python
+
+                from concurrent.futures import ThreadPoolExecutor
+                import numpy as np
+                import sympy as sp
+                from pyqpanda_alg.QAOA.qaoa import *
+
+                vars = sp.symbols('x0:3')
+                qaoa_f = QAOA(2*vars[0]*vars[1] + 3*vars[2] - 1)
+                batch = [(np.random.uniform(0, np.pi, 2), np.random.uniform(0, np.pi, 2)) for _ in range(16)]
+                with ThreadPoolExecutor(4) as executor:
+                    for index, prob_result in qaoa_f.evaluate_batch(batch, executor=executor, chunksize=4):
+                        print(index, max(prob_result, key=prob_result.get))
+
+        """
+        return parallel.map_unordered(partial(_evaluate_item, self, shots), parameters, executor, chunksize)
+
+    def run_multistart(self, n_starts=None, initial_paras=None, layer=1, executor=None, chunksize=1,
+                       seed=None, **run_option):
+        """
+        Optimize the function from several initial parameters and stream the results.
+
+        Parameters
+            n_starts : ``integer``, ``optional``\n
+                Number of random initial parameters drawn from :math:`U(0, \pi)`. Ignored if ``initial_paras``
+                is given.
+
+            initial_paras : ``iterable``, ``optional``\n
+                Initial parameters of every start, each with length :math:`2\\times p`.
+
+            layer : ``integer``, ``optional``\n
+                Layers number of QAOA circuit. Default is 1.
+
+            executor : ``concurrent.futures.Executor``, ``optional``\n
+                Executor to run the starts. See ``evaluate_batch``.
+
+            chunksize : ``integer``, ``optional``\n
+                Number of starts per executor task. Default is 1.
+
+            seed : ``integer``, ``optional``\n
+                Seed of the random initial parameters.
+
+            run_option :\n
+                Other arguments of ``run``, e.g. ``shots``, ``loss_type`` or ``optimizer``, but not
+                ``initial_para``, which is set by every start.
+
+        Return
+            results : ``generator``\n
+                Yields ``(index, run_result)`` in completion order, where ``run_result`` is the result of ``run``.
+
+        Raises
+            ValueError\n
+                If neither ``n_starts`` nor ``initial_paras`` is given, or ``initial_para`` is in ``run_option``.
+
+        """
+        if 'initial_para' in run_option:
+            raise ValueError('initial_para is set by every start, use initial_paras instead')
+        if initial_paras is None:
+            if n_starts is None:
+                raise ValueError('either n_starts or initial_paras should be given')
+            initial_paras = np.random.default_rng(seed).uniform(0, np.pi, size=(n_starts, 2 * layer))
+        run_option['layer'] = layer
+        return parallel.map_unordered(partial(_run_item, self, 'initial_para', run_option),
+                                      initial_paras, executor, chunksize)
+
+    def layer_sweep(self, layers, executor=None, chunksize=1, **run_option):
+        """
+        Optimize the function with QAOA circuits of several layer numbers and stream the results.
+
+        Parameters
+            layers : ``iterable``\n
+                Layers numbers of the QAOA circuits.
+
+            executor : ``concurrent.futures.Executor``, ``optional``\n
+                Executor to run the layers. See ``evaluate_batch``.
+
+            chunksize : ``integer``, ``optional``\n
+                Number of layers per executor task. Default is 1.
+
+            run_option :\n
+                Other arguments of ``run``, e.g. ``shots``, ``loss_type`` or ``optimizer``, but neither
+                ``layer``, which is set by the sweep, nor ``initial_para``, whose length depends on the layer.
+
+        Return
+            results : ``generator``\n
+                Yields ``(layer, run_result)`` in completion order, where ``run_result`` is the result of ``run``.
+
+        Raises
+            ValueError\n
+                If ``layer`` or ``initial_para`` is in ``run_option``.
+
+        """
+        for name in ('layer', 'initial_para'):
+            if name in run_option:
+                raise ValueError('{} depends on the layer and cannot be shared by the sweep'.format(name))
+        layers = list(layers)
+        for index, result in parallel.map_unordered(partial(_run_item, self, 'layer', run_option),
+                                                    layers, executor, chunksize):
+            yield layers[index], result
+
+    def run_portfolio(self, optimizers=('SPSA', 'COBYLA', 'SLSQP'), budget=300, layer=1, initial_para=None,
+                      shots=-1, optimizer_option=None, rounds=None, keep=0.5, temperature=None):
+        """
+        Optimize the QAOA circuit by racing several optimizers concurrently under a shared evaluation budget.
+        Laggards are stopped after each round and their budget is reassigned to the leaders, see
+        ``portfolio.race``.
+
+        Parameters
+            optimizers : ``List[string]``, ``optional``\n
+                Optimizers to race, ``SPSA`` or methods of ``scipy.optimize.minimize`` as in ``run``.
+                Default is ``SPSA``, ``COBYLA`` and ``SLSQP``.
+
+            budget : ``integer``, ``optional``\n
+                Total number of QAOA circuit evaluations shared by all optimizers. Default is 300.
+
+            layer : ``integer``, ``optional``\n
+                Layers number of QAOA circuit. Default is 1.
+
+            initial_para : ``array-like``, ``optional``\n
+                Common initial parameters of all optimizers, with length :math:`2\\times p`. If not given, a
+                random distribution from :math:`U(0, \pi)` of size :math:`2p` is generated.
+
+            shots : ``integer``, ``optional``\n
+                See ``run_qaoa_circuit``. Default is -1.
+
+            optimizer_option : ``dict``, ``optional``\n
+                Options of each optimizer, keyed by its name.
+
+            rounds, keep : ``optional``\n
+                Number of rounds and fraction of optimizers kept after each round. See ``portfolio.race``.
+
+            temperature : ``float``, ``optional``\n
+                If given, the Gibbs loss of this temperature is minimized instead of the energy expectation.
+                See ``gibbs_loss``.
+
+        Return
+            qaoa_result : ``dict``\n
+                dict of all possible solutions with corresponding probabilities for the best parameters,
+                in descending order of probability.
+
+            para_result : ``array-like``\n
+                Array of the best QAOA parameters found.
+
+            loss_result : ``float``\n
+                Loss function value of the best QAOA parameters.
+
+            report : ``dict``\n
+                ``winner``, ``nfev``, ``evaluations`` and ``eliminated`` of the race, see ``portfolio.race``.
+
+        Example
+            .. code-block:: python
+
+                import sympy as sp
+                from pyqpanda_alg.QAOA import qaoa
+
+                vars = sp.symbols('x0:3')
+                qaoa_f = qaoa.QAOA(2*vars[0]*vars[1] + 3*vars[2] - 1)
+                qaoa_result, para, loss, report = qaoa_f.run_portfolio(['SPSA', 'COBYLA', 'Powell', 'SLSQP'],
+                                                                       budget=400, layer=2)
+                print(report['winner'], report['evaluations'], loss)
+
+        """
+        if initial_para is None:
+            initial_para = np.random.uniform(0, np.pi, size=2 * layer)
+        loss = partial(_portfolio_loss, self, layer, shots, temperature, {})
+        result = portfolio.race(loss, initial_para, optimizers, budget, optimizer_option=optimizer_option,
+                                rounds=rounds, keep=keep)
+        para_result = result.pop('x')
+        prob_result = self.run_qaoa_circuit(para_result[:layer], para_result[layer:], shots)
+        qaoa_result = dict(sorted(prob_result.items(), key=lambda item: item[1], reverse=True))
+        return qaoa_result, para_result, result.pop('fun'), result
+
+
+def solve_many(problems, executor=None, chunksize=8, init_circuit=None, mixer_circuit=None, norm=False,
+               warm_start=False, **run_option):
+    """
+    Optimize many small problems by QAOA in one call and stream the results.
+
+    The problems are grouped by their number of qubits and every executor task solves a chunk of
+    problems of the same size, so that the per-task setup is paid once per chunk instead of once per
+    problem. Every chunk builds one template of the QAOA circuit on a NumPy state vector, see
+    ``statevector.qaoa_state``: the initial state and the mixer kernel are built once, and only the diagonal
+    of the cost Hamiltonian is computed for each problem. With ``warm_start`` the optimized parameters of a
+    problem are the initial parameters of the next one of the chunk.
+
+    The template is used for the default and Gibbs losses of the state vector (``shots=-1``) with the
+    default optimize type, if ``init_circuit`` is ``None`` or has a ``statevector`` attribute as
+    ``default_circuits.init_d_state``, ``mixer_circuit`` is ``None`` or has a ``kernel`` attribute as
+    ``default_circuits.xy_mixer``, ``norm`` is False and the problem is diagonal. Other problems are solved
+    by ``QAOA.run`` with the circuit factories shared by the chunk.
+
+    Parameters
+        problems : ``iterable``\n
+            Problems of ``QAOA``, i.e. sympy expressions or ``pq.PauliOperator``, or ``graph.MaxCutGraph``
+            objects which are solved as by ``QAOA.from_graph``. The variable of a sympy expression whose name
+            ends with :math:`i`, e.g. :math:`x_i`, is qubit :math:`i`, as in ``problem_to_z_operator``, so
+            that a problem of ``x0`` and ``x10`` has 11 qubits.
+
+        executor : ``concurrent.futures.Executor``, ``optional``\n
+            Executor to run the chunks, see ``QAOA.evaluate_batch``. For a process pool the problems and
+            the circuit factories have to be picklable. If not given, the chunks are solved serially.
+
+        chunksize : ``integer``, ``optional``\n
+            Maximal number of problems of the same size per executor task. Default is 8.
+
+        init_circuit, mixer_circuit, norm : ``optional``\n
+            Arguments of ``QAOA``, shared by all problems.
+
+        warm_start : ``bool``, ``optional``\n
+            If True, start every problem of a chunk from the optimized parameters of the previous one. Only
+            valid if all runs have the same number of parameters. Default is False.
+
+        run_option :\n
+            Other arguments of ``run``, e.g. ``layer``, ``shots``, ``loss_type`` or ``optimizer``. The template
+            reads them as documented in ``run``: the ``temperature`` of the Gibbs loss is a keyword argument
+            with default 1, and ``optimizer_option`` holds the ``bounds`` and, in ``options``, the maximum
+            number of iterations, i.e. ``maxfun`` for ``TNC``. A dict of ``options`` is passed to the solver
+            as is.
+
+    Return
+        results : ``generator``\n
+            Yields ``(index, run_result)`` in completion order, where ``index`` is the position of the problem
+            in ``problems`` and ``run_result`` is the result of ``run``, *i.e.* the distribution, the optimized
+            parameters and the loss.
+
+    Raises
+        ValueError\n
+            If a variable of a sympy problem does not end with its index, or two variables share one.
+
+    Example
+        .. code-block:: python
+
+            from concurrent.futures import ProcessPoolExecutor
+            import numpy as np
+            import sympy as sp
+            from pyqpanda_alg.QAOA import qaoa
+
+            rng = np.random.default_rng(1)
+            problems = []
+            for n in rng.integers(8, 15, size=100):
+                x = sp.symbols('x0:{}'.format(n))
+                problems.append(sum(rng.normal() * x[i] * x[(i + 1) % n] for i in range(n)))
+            with ProcessPoolExecutor() as executor:
+                for index, (qaoa_result, para, loss) in qaoa.solve_many(problems, executor, layer=2):
+                    print(index, loss)
+
+    """
+    groups = {}
+    for index, problem in enumerate(problems):
+        groups.setdefault(_problem_size(problem), []).append((index, problem))
+    chunks = [group[start:start + chunksize] for _, group in sorted(groups.items())
+              for start in range(0, len(group), chunksize)]
+    solve_chunk = partial(_solve_chunk, init_circuit, mixer_circuit, norm, warm_start, run_option)
+    for _, results in parallel.map_unordered(solve_chunk, chunks, executor):
+        yield from results
+
+
+def _problem_size(problem):
+    if isinstance(problem, MaxCutGraph):
+        return problem.n_nodes
+    if isinstance(problem, pq.PauliOperator):
+        return problem.getMaxIndex() + 1
+    return max(_variable_indexes(problem).values(), default=-1) + 1
+
+
+def _variable_indexes(problem):
+    """Qubit of every variable of a sympy problem, given by the number ending its name as x_i is Z_i."""
+    indexes = {}
+    for symbol in problem.free_symbols:
+        match = re.search(r'\d+$', symbol.name)
+        if match is None:
+            raise ValueError('variable {} should end with its index, e.g. x0'.format(symbol.name))
+        indexes[symbol] = int(match.group())
+    if len(set(indexes.values())) < len(indexes):
+        raise ValueError('variables {} share an index'.format(sorted(symbol.name for symbol in indexes)))
+    return indexes
+
+
+def _solve_chunk(init_circuit, mixer_circuit, norm, warm_start, run_option, chunk):
+    n_qubits = _problem_size(chunk[0][1])
+    template = None if norm else _chunk_template(init_circuit, mixer_circuit, n_qubits, run_option)
+    results = []
+    initial_para = run_option.get('initial_para')
+    for index, problem in chunk:
+        energies = None if template is None else _energy_table(problem, n_qubits)
+        if energies is not None:
+            result = _run_template(template, energies, dict(run_option, initial_para=initial_para))
+        elif isinstance(problem, MaxCutGraph):
+            result = QAOA.from_graph(problem, init_circuit, mixer_circuit, norm).run(
+                **dict(run_option, initial_para=initial_para))
+        else:
+            result = QAOA(problem, init_circuit, mixer_circuit, norm).run(**dict(run_option, initial_para=initial_para))
+        if warm_start:
+            initial_para = result[1]
+        results.append((index, result))
+    return results
+
+
+def _chunk_template(init_circuit, mixer_circuit, n_qubits, run_option):
+    """Initial state vector and mixer kernel shared by a chunk, or None if the run needs the circuits."""
+    if run_option.get('shots', -1) != -1 or run_option.get('loss_type') not in (None, 'default', 'Gibbs') \
+            or run_option.get('optimize_type') not in (None, 'default'):
+        return None
+    if init_circuit is None:
+        initial_state = None
+    elif hasattr(init_circuit, 'statevector'):
+        initial_state = init_circuit.statevector(n_qubits)
+    else:
+        return None
+    if mixer_circuit is None:
+        mixer = None
+    elif hasattr(mixer_circuit, 'kernel'):
+        mixer = mixer_circuit.kernel
+    else:
+        return None
+    return initial_state, mixer
+
+
+def _energy_table(problem, n_qubits):
+    """Function values of all basis states, bit i of the index being x_i, or None if not diagonal."""
+    if isinstance(problem, MaxCutGraph):
+        return problem.energy_table()
+    bits = (np.arange(2 ** n_qubits)[:, None] >> np.arange(n_qubits)) & 1
+    if isinstance(problem, pq.PauliOperator):
+        energies = np.zeros(2 ** n_qubits)
+        for (paulis, _), coefficient in problem.data():
+            if set(paulis.values()) - {'Z'} or coefficient.imag:
+                return None
+            energies += coefficient.real * np.prod(1 - 2 * bits[:, sorted(paulis)], axis=1)
+        return energies
+    indexes = _variable_indexes(problem)
+    variables = list(indexes)
+    energies = sp.lambdify(variables, problem, 'numpy')(*(bits[:, indexes[symbol]] for symbol in variables))
+    return np.broadcast_to(np.asarray(energies, dtype=float), 2 ** n_qubits)
+
+
+def _run_template(template, energies, run_option):
+    initial_state, mixer = template
+    layer = run_option.get('layer', 1)
+    initial_para = run_option.get('initial_para')
+    if initial_para is None:
+        initial_para = np.random.uniform(0, np.pi, size=2 * layer)
+    temperature = run_option.get('temperature', 1) if run_option.get('loss_type') == 'Gibbs' else None
+
+    def loss(para):
+        probs = np.abs(statevector.qaoa_state(energies, para[:layer], para[layer:], mixer, initial_state)) ** 2
+        return float(energies @ probs) if temperature is None else gibbs_loss(energies, probs, temperature)
+
+    optimizer = run_option.get('optimizer') or 'SLSQP'
+    optimizer_option = run_option.get('optimizer_option') or {}
+    options = _solver_options(optimizer, optimizer_option.get('options'))
+    if optimizer == 'SPSA':
+        para_result = spsa.spsa_minimize(loss, initial_para, bounds=optimizer_option.get('bounds'), **options)
+    else:
+        para_result = minimize(loss, initial_para, method=optimizer, bounds=optimizer_option.get('bounds'),
+                               options=options).x
+    state = statevector.qaoa_state(energies, para_result[:layer], para_result[layer:], mixer, initial_state)
+    probs = np.abs(state) ** 2
+    qaoa_result = {'{:0{}b}'.format(i, len(energies).bit_length() - 1): float(probs[i])
+                   for i in np.argsort(-probs, kind='stable')}
+    return qaoa_result, para_result, loss(para_result)
+
+
+def _solver_options(optimizer, options):
+    """Solver options of the ``options`` of ``run``, the maximum number of iterations or a dict."""
+    if options is None:
+        return {}
+    if isinstance(options, dict):
+        return dict(options)
+    return {'maxfun' if optimizer == 'TNC' else 'maxiter': int(options)}
+
+
+def _evaluate_item(qaoa_f, shots, parameters):
+    gammas, betas = parameters
+    return qaoa_f.run_qaoa_circuit(gammas, betas, shots)
+
+
+def _run_item(qaoa_f, name, run_option, value):
+    return qaoa_f.run(**{name: value}, **run_option)
+
+
+def _portfolio_loss(qaoa_f, layer, shots, temperature, energies, para):
+    prob_result = qaoa_f.run_qaoa_circuit(para[:layer], para[layer:], shots)
+    for key in prob_result:
+        if key not in energies:
+            energies[key] = qaoa_f.calculate_energy([int(bit) for bit in reversed(key)])
+    energy = np.array([energies[key] for key in prob_result], dtype=float)
+    probs = np.array(list(prob_result.values()), dtype=float)
+    probs /= probs.sum()
+    if temperature is None:
+        return float(energy @ probs)
+    return gibbs_loss(energy, probs, temperature)
@@ -2,10 +2,17 @@
 Simultaneous Perturbation Stochastic Approximation
 
 """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+import logging
+
 import numpy as np
 from .. config import *
 auth = Authorization()
 
+logger = logging.getLogger(__name__)
+
 
 def spsa_minimize(func, x0, args=(), tol=None, bounds=None, callback=None, **options):
     """
@@ -67,7 +74,8 @@ def spsa_minimize(func, x0, args=(), tol=None, bounds=None, callback=None, **opt
              :math:`maxiter` : ``int``\n
                 Maximum iteration after which the algorithm stops.\n
              :math:`a` : ``float``, a > 0\n
-                Learning rate amplitude. A value between 0 and 1 is recommended.\n
+                Learning rate amplitude. A value between 0 and 1 is recommended. Default is 0.2, or 1 in the
+                second-order mode.\n
              :math:`c` : ``float``, c > 0\n
                 Perturbation strength. A value between 0 and 1 is recommended.\n
              :math:`alpha` : ``float``, alpha > 0\n
@@ -76,6 +84,56 @@ def spsa_minimize(func, x0, args=(), tol=None, bounds=None, callback=None, **opt
                 Scaling of perturbation strength on the round of iteration.\n
              :math:`A` : ``int``, ``float``, A > 0\n
                 Modification of learning rate scaling. It is recommended to be about maxiter / 10.\n
+             :math:`resamplings` : ``int``, resamplings > 0\n
+                Number of independent perturbations per iteration. The gradient estimates of all
+                perturbations are averaged, which reduces the variance for noisy objective functions.
+                Default is 1.\n
+             :math:`workers` : ``int``\n
+                Number of workers evaluating the :math:`2\times resamplings` perturbed points of an
+                iteration concurrently. Default is 1, i.e. serial evaluation.\n
+             :math:`executor` : ``str`` or ``concurrent.futures.Executor``\n
+                ``thread`` (default) or ``process`` to create a pool of ``workers`` workers for the
+                optimization, or an executor to be used as it is. A process pool requires a picklable ``func``.\n
+             :math:`seed` : ``int``\n
+                Seed of the random perturbations.\n
+             :math:`second_order` : ``bool``\n
+                If True, run the second-order SPSA (2-SPSA) [3]. Default is False.\n
+             :math:`hessian_delay` : ``int``\n
+                Number of first-order iterations before the Hessian estimate is used. Default is 0.\n
+             :math:`regularization` : ``float``\n
+                Regularization :math:`\\delta` added to the eigenvalues of the Hessian. Default is 0.01.\n
+             :math:`blocking` : ``bool``\n
+                If True, reject updates whose function value exceeds the current one by more than
+                ``allowed_increase``. Costs one extra evaluation per iteration. Default is True in the
+                second-order mode, where a poorly conditioned early Hessian estimate can produce overly large
+                steps, and False otherwise.\n
+             :math:`allowed_increase` : ``float``\n
+                Tolerance of the blocking rule. If not given, twice the standard deviation of 5 evaluations at
+                ``x0`` is used.\n
+             :math:`calibrate` : ``bool``\n
+                If True, calibrate the gains ``a`` and ``c`` at ``x0`` before the optimization, see below.
+                Default is False.\n
+             :math:`calibration_samples` : ``int``\n
+                Number of evaluations at ``x0`` and of perturbations used by the calibration. Default is 5.\n
+             :math:`target_step` : ``float``\n
+                Target magnitude of the first update of each variable in the calibration. Default is 0.1.\n
+
+        In the second-order mode every perturbation :math:`\\vec b` is paired with a second perturbation
+        :math:`\\vec b'`, and two more evaluations give a rank-two Hessian sample\n
+             :math:`\\hat H_k=\\frac{\\delta f}{4c_k^2}(\\vec b\\vec b'^T+\\vec b'\\vec b^T)`,
+             :math:`\\delta f=f(\\vec x_k+c_k\\vec b+c_k\\vec b')-f(\\vec x_k+c_k\\vec b)
+             -f(\\vec x_k-c_k\\vec b+c_k\\vec b')+f(\\vec x_k-c_k\\vec b)`\n
+        The samples are averaged over the iterations, starting from the identity, into :math:`\\bar H_k`, and the update is preconditioned
+        by :math:`(|\\bar H_k|+\\delta I)^{-1}`, where :math:`|\\cdot|` takes the absolute eigenvalues.
+        The preconditioned step has the scale of a Newton step, so the learning rate amplitude ``a`` defaults
+        to 1 in this mode.
+
+        The calibration evaluates the objective function ``calibration_samples`` times at ``x0`` to estimate the
+        noise level :math:`\\sigma`, and raises ``c`` to :math:`\\sigma` if it is smaller, as recommended in [2].
+        Another ``calibration_samples`` perturbations estimate the gradient magnitude
+        :math:`\\bar g=\\langle|f(\\vec x_0+c\\vec b)-f(\\vec x_0-c\\vec b)|\\rangle/2c`, and ``a`` is set so that
+        the first update :math:`a_0\\bar g` equals ``target_step``. In the second-order mode only ``c`` is
+        calibrated. The chosen values are logged at ``INFO`` level by the logger ``pyqpanda_alg.QAOA.spsa``.
 
     Reference
         [1] Spall J C.\n
@@ -86,6 +144,10 @@ def spsa_minimize(func, x0, args=(), tol=None, bounds=None, callback=None, **opt
             Implementation of the simultaneous perturbation algorithm for stochastic optimization[J].
             IEEE Transactions on aerospace and electronic systems, 1998, 34(3): 817-823.
             https://doi.org/10.1109/7.705889\n
+        [3] Spall J C.\n
+            Adaptive stochastic approximation by the simultaneous perturbation method[J].
+            IEEE transactions on automatic control, 2000, 45(10): 1839-1853.
+            https://doi.org/10.1109/TAC.2000.880982\n
 
     Example
         Suppose we are going to minimize a function:\n
@@ -157,5 +219,292 @@ def spsa_minimize(func, x0, args=(), tol=None, bounds=None, callback=None, **opt
     SPSA could provide reliable performance and less query
     call to the objective function.
 
+    For noisy objective functions, several perturbations can be averaged per iteration and
+    evaluated concurrently, e.g. ``spsa_minimize(noise_f.eval_f, x0, resamplings=4, workers=8)``.
+    Objective functions evaluated asynchronously can be optimized with :class:`SPSA` or
+    :func:`spsa_minimize_async`.
+
+    """
+    workers = int(options.get('workers', 1))
+    if workers < 1:
+        raise ValueError('resamplings and workers should be positive integers')
+    optimizer = SPSA(x0, bounds=bounds, tol=tol, **options)
+    objective = partial(_call_objective, func, args)
+    executor = options.get('executor', 'thread')
+    own_executor = isinstance(executor, str) and workers > 1
+    if own_executor:
+        pool = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}[executor]
+        executor = pool(max_workers=workers)
+    elif isinstance(executor, str):
+        executor = None
+
+    try:
+        while not optimizer.done:
+            nit = optimizer.nit
+            optimizer.tell(_evaluate(objective, optimizer.ask(), executor))
+            if callback is not None and optimizer.nit > nit:
+                callback(optimizer.x)
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return optimizer.x
+
+
+async def spsa_minimize_async(func, x0, args=(), tol=None, bounds=None, callback=None, **options):
+    """
+    Asynchronous version of :func:`spsa_minimize` for an objective coroutine function.
+
+    The points of each :meth:`SPSA.ask` are awaited concurrently with ``asyncio.gather``, so that several
+    optimizations sharing one event loop keep a queued execution service busy without blocking threads.
+
+    Parameters
+        func : ``coroutine function``\n
+            The objective function to be optimized, ``async fun(x, *args) -> float``.
+        x0, args, tol, bounds, callback, options :\n
+            Same as in :func:`spsa_minimize`. ``workers`` and ``executor`` are not used.
+
+    Return
+        x : ``ndarray``, shape (n,)\n
+            Optimized variables.
+
+    Example
+        .. code-block:: python
+
+            import asyncio
+            import numpy as np
+            from pyqpanda_alg.QAOA.spsa import spsa_minimize_async
+
+            async def f(x, center):
+                await asyncio.sleep(0.01)   # e.g. waiting for a remote job
+                return float(np.sum((x - center) ** 2) + np.random.normal(0, 0.01))
+
+            async def main():
+                return await asyncio.gather(*(spsa_minimize_async(f, np.zeros(4), args=(center,))
+                                              for center in range(3)))
+
+            print(asyncio.run(main()))
+
+    """
+    optimizer = SPSA(x0, bounds=bounds, tol=tol, **options)
+    while not optimizer.done:
+        nit = optimizer.nit
+        values = await asyncio.gather(*(func(point, *args) for point in optimizer.ask()))
+        optimizer.tell([_check_scalar(value) for value in values])
+        if callback is not None and optimizer.nit > nit:
+            callback(optimizer.x)
+    return optimizer.x
+
+
+class SPSA:
+    """
+    Ask/tell form of the SPSA algorithm, for objective functions evaluated outside of the optimizer,
+    e.g. by an asynchronous execution service. :func:`spsa_minimize` is a synchronous driver of this class.
+
+    Parameters
+        x0 : ``ndarray``, shape (n,)\n
+            Initial guess.
+        bounds : ``List[tuple]``, ``optional``\n
+            Bounds for the variables, as in :func:`spsa_minimize`.
+        tol : ``float``, ``optional``\n
+            Tolerance for termination, as in :func:`spsa_minimize`.
+        options : ``dict``, ``optional``\n
+            The options of :func:`spsa_minimize`, except ``workers`` and ``executor``.
+
+    Raises
+        ValueError\n
+            If any parameter ``a, c, alpha, gamma, A`` is too small :math:`(< 1e-8)`, or if ``tell`` receives
+            a wrong number of values.
+        RuntimeError\n
+            If ``ask`` is called after the optimization is done, or ``tell`` before ``ask``.
+
+    Attributes
+        x : ``ndarray``, shape (n,)\n
+            Current parameter vector.
+        nit : ``int``\n
+            Number of completed iterations.
+        nfev : ``int``\n
+            Number of objective function values told so far.
+        done : ``bool``\n
+            Whether the optimization has stopped.
+
+    Example
+        .. code-block:: python
+
+            import numpy as np
+            from pyqpanda_alg.QAOA.spsa import SPSA
+
+            optimizer = SPSA(np.array([1., 2., 3., 4.]), maxiter=200, seed=1)
+            while not optimizer.done:
+                points = optimizer.ask()
+                optimizer.tell([np.sum(x ** 2) + np.random.normal(0, 0.1) for x in points])
+            print(optimizer.x, optimizer.nfev)
+
     """
-    pass
+
+    def __init__(self, x0, bounds=None, tol=None, **options):
+        self.maxiter = int(options.get('maxiter', 100))
+        self.second_order = bool(options.get('second_order', False))
+        self.gains = {name: options.get(name, default) for name, default in
+                      (('a', 1. if self.second_order else 0.2), ('c', 0.1), ('alpha', 0.602), ('gamma', 0.101), ('A', self.maxiter / 10))}
+        for name, value in self.gains.items():
+            if value < 1e-8:
+                raise ValueError('SPSA parameter {} should be positive, got {}'.format(name, value))
+        self.resamplings = int(options.get('resamplings', 1))
+        if self.resamplings < 1:
+            raise ValueError('resamplings and workers should be positive integers')
+        self.tol = tol
+        self.hessian_delay = int(options.get('hessian_delay', 0))
+        self.regularization = options.get('regularization', 0.01)
+        self.blocking = bool(options.get('blocking', self.second_order))
+        self.allowed_increase = options.get('allowed_increase')
+        self.calibration_samples = int(options.get('calibration_samples', 5))
+        self.target_step = options.get('target_step', 0.1)
+        self.rng = np.random.default_rng(options.get('seed'))
+
+        self.x = np.array(x0, dtype=float)
+        self.lower, self.upper = _bounds_to_arrays(bounds, len(self.x))
+        self.fx = None
+        self.nit = 0
+        self.nfev = 0
+        self.done = self.maxiter <= 0
+        # the identity acts as a prior sample, so that the first estimates are not rank deficient
+        self.hessian = np.identity(len(self.x))
+        if options.get('calibrate', False):
+            self._stage = 'noise'
+        elif self.blocking:
+            self._stage = 'initial'
+        else:
+            self._stage = 'gradient'
+        self._points = None
+        self._samples = None
+
+    def ask(self):
+        """
+        Return
+            points : ``ndarray``, shape (m, n)\n
+                Points whose objective function values should be passed to :meth:`tell`. Asking again before
+                telling returns the same points.
+        """
+        if self.done:
+            raise RuntimeError('the optimization is done')
+        if self._points is not None:
+            return self._points
+        x, n = self.x, len(self.x)
+        if self._stage == 'noise':
+            points = np.repeat(x[None], self.calibration_samples, axis=0)
+        elif self._stage == 'calibration':
+            self._deltas = self.rng.choice([-1., 1.], size=(self.calibration_samples, n))
+            points = np.concatenate([x + self.gains['c'] * self._deltas, x - self.gains['c'] * self._deltas])
+        elif self._stage == 'initial':
+            # the noise level at x0 decides how much increase is tolerated
+            points = np.repeat(x[None], 1 if self.allowed_increase is not None else 5, axis=0)
+        elif self._stage == 'gradient':
+            c_k = self.gains['c'] / (self.nit + 1) ** self.gains['gamma']
+            self._deltas = self.rng.choice([-1., 1.], size=(self.resamplings, n))
+            points = [x + c_k * self._deltas, x - c_k * self._deltas]
+            if self.second_order:
+                self._deltas_2 = self.rng.choice([-1., 1.], size=(self.resamplings, n))
+                points += [x + c_k * (self._deltas + self._deltas_2), x + c_k * (self._deltas_2 - self._deltas)]
+            points = np.concatenate(points)
+        else:
+            points = self._x_next[None]
+        self._points = points
+        return points
+
+    def tell(self, values):
+        """
+        Parameters
+            values : ``array-like``, shape (m,)\n
+                Objective function values of the points returned by the last :meth:`ask`.
+        """
+        if self._points is None:
+            raise RuntimeError('tell should follow ask')
+        values = np.asarray(values, dtype=float).reshape(-1)
+        if len(values) != len(self._points):
+            raise ValueError('{} values expected, got {}'.format(len(self._points), len(values)))
+        self._points = None
+        self.nfev += len(values)
+        getattr(self, '_tell_' + self._stage)(values)
+
+    def _tell_noise(self, values):
+        self._samples = values
+        self.gains['c'] = max(self.gains['c'], float(np.std(values)))
+        self._stage = 'calibration'
+
+    def _tell_calibration(self, values):
+        n_samples, gains = self.calibration_samples, self.gains
+        magnitude = float(np.mean(np.abs(values[:n_samples] - values[n_samples:]))) / (2 * gains['c'])
+        if not self.second_order and magnitude > 0:
+            gains['a'] = self.target_step * (gains['A'] + 1) ** gains['alpha'] / magnitude
+        logger.info('SPSA calibration: gradient magnitude %.6g, noise std %.6g, a = %.6g, c = %.6g',
+                    magnitude, float(np.std(self._samples)), gains['a'], gains['c'])
+        if self.blocking:
+            # the samples at x0 are reused by the blocking rule
+            self._tell_initial(self._samples)
+        else:
+            self._stage = 'gradient'
+
+    def _tell_initial(self, values):
+        self.fx = float(np.mean(values))
+        if self.allowed_increase is None:
+            self.allowed_increase = 2 * float(np.std(values))
+        self._stage = 'gradient'
+
+    def _tell_gradient(self, values):
+        k = self.nit
+        a_k = self.gains['a'] / (self.gains['A'] + k + 1) ** self.gains['alpha']
+        c_k = self.gains['c'] / (k + 1) ** self.gains['gamma']
+        values = values.reshape(-1, self.resamplings)
+        self._gradient = np.mean((values[0] - values[1])[:, None] / (2 * c_k * self._deltas), axis=0)
+        step = self._gradient
+        if self.second_order:
+            diff = (values[2] - values[0]) - (values[3] - values[1])
+            rank_one = np.einsum('ri,rj->rij', self._deltas, self._deltas_2)
+            sample = np.mean(diff[:, None, None] * (rank_one + rank_one.transpose(0, 2, 1)), axis=0) / (4 * c_k ** 2)
+            self.hessian = ((k + 1) * self.hessian + sample) / (k + 2)
+            if k >= self.hessian_delay:
+                eigval, eigvec = np.linalg.eigh(self.hessian)
+                step = eigvec @ ((eigvec.T @ self._gradient) / (np.abs(eigval) + self.regularization))
+        x_next = np.clip(self.x - a_k * step, self.lower, self.upper)
+        if self.blocking:
+            self._x_next = x_next
+            self._stage = 'blocking'
+        else:
+            self.x = x_next
+            self._next_iteration()
+
+    def _tell_blocking(self, values):
+        if values[0] <= self.fx + self.allowed_increase:
+            self.x, self.fx = self._x_next, float(values[0])
+        self._stage = 'gradient'
+        self._next_iteration()
+
+    def _next_iteration(self):
+        self.nit += 1
+        if self.nit >= self.maxiter or self.tol is not None and np.max(np.abs(self._gradient)) < self.tol:
+            self.done = True
+
+
+def _call_objective(func, args, x):
+    return _check_scalar(func(x, *args))
+
+
+def _check_scalar(value):
+    if np.ndim(value) != 0:
+        raise TypeError('the objective function should return a scalar, got shape {}'.format(np.shape(value)))
+    return float(value)
+
+
+def _evaluate(objective, points, executor):
+    if executor is None:
+        return np.array([objective(point) for point in points])
+    return np.array(list(executor.map(objective, points)))
+
+
+def _bounds_to_arrays(bounds, n):
+    lower, upper = np.full(n, -np.inf), np.full(n, np.inf)
+    if bounds is not None:
+        for i, (low, high) in enumerate(bounds):
+            lower[i] = -np.inf if low is None else low
+            upper[i] = np.inf if high is None else high
+    return lower, upper
@@ -0,0 +1,461 @@
+"""
+NumPy helpers working directly on QAOA state vectors.
+
+The index of an amplitude is the integer of the computational basis state, bit :math:`i` of the index
+being qubit :math:`i`, i.e. the first qubit sits at the right-most position of the binary key, as in the
+results of ``QAOA.run_qaoa_circuit``.
+
+"""
+import heapq
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import comb
+
+from .. config import *
+auth = Authorization()
+
+EXACT_XY_MAX_QUBITS = 12
+
+
+def top_k_states(state, k, key='probability', energies=None, chunk_size=2 ** 16, min_prob=0.):
+    """
+    Extract the best states of a state vector by streaming over it in fixed-size chunks.
+
+    Only a bounded heap of :math:`k` states and one chunk are held at a time, so that the extra memory is
+    :math:`O(k + \\text{chunk\_size})` instead of one Python object per basis state.
+
+    Parameters
+        state : ``array-like``\n
+            State vector of :math:`2^n` amplitudes, e.g. ``machine.get_qstate()`` after running the final
+            QAOA circuit. Any sequence supporting slicing is accepted.
+
+        k : ``integer``, k>0\n
+            Number of states to keep.
+
+        key : ``string``, ``optional``\n
+            How the states are ranked. Should be one of
+
+                - ``probability`` : Largest probability first. (Default)
+                - ``energy`` : Lowest energy first, ties broken by the larger probability.
+
+        energies : ``callable`` or ``array-like``, ``optional``\n
+            Energies of the states, either a function ``f(index_array) -> energy_array`` of the integer
+            indexes of a chunk, or a precomputed table such as ``graph.MaxCutGraph.energy_table()``.
+            Required if ``key`` is ``energy``.
+
+        chunk_size : ``integer``, ``optional``\n
+            Number of amplitudes processed at once. Default is :math:`2^{16}`.
+
+        min_prob : ``float``, ``optional``\n
+            States with a probability not larger than ``min_prob`` are skipped. Default is 0.
+
+    Return
+        states : ``generator``\n
+            Yields ``(key, probability, energy)`` from the best state on, where ``key`` is the binary form of
+            the state and ``energy`` is None if no energies are given. The state vector is walked when the
+            first item is requested.
+
+    Raises
+        ValueError\n
+            If ``k`` is not positive, ``key`` is unknown, or ``key`` is ``energy`` without ``energies``.
+
+    Example
+        .. code-block:: python
+
+            import numpy as np
+            from pyqpanda_alg.QAOA import graph, statevector
+
+            g = graph.MaxCutGraph(edges=[(0, 1), (1, 2), (2, 3), (3, 0)])
+            state = np.random.normal(size=16) + 1j * np.random.normal(size=16)
+            state /= np.linalg.norm(state)
+            for bits, prob, energy in statevector.top_k_states(state, 3, 'energy', g.energy_table()):
+                print(bits, prob, energy)
+
+    """
+    if k < 1:
+        raise ValueError('k should be a positive integer, got {}'.format(k))
+    if key not in ('probability', 'energy'):
+        raise ValueError("key should be 'probability' or 'energy', got {}".format(key))
+    if key == 'energy' and energies is None:
+        raise ValueError("energies should be given when key is 'energy'")
+    energy_of = energies if energies is None or callable(energies) else np.asarray(energies).__getitem__
+    return _top_k_states(state, k, key, energy_of, chunk_size, min_prob)
+
+
+def _top_k_states(state, k, key, energy_of, chunk_size, min_prob):
+    size = len(state)
+    n = max(size - 1, 0).bit_length()
+    heap = []
+    for start in range(0, size, chunk_size):
+        probs = np.abs(np.asarray(state[start:start + chunk_size])) ** 2
+        index = np.arange(start, start + len(probs))
+        keep = probs > min_prob
+        index, probs = index[keep], probs[keep]
+        chunk_energies = None if energy_of is None else np.asarray(energy_of(index), dtype=float)
+        scores = probs if key == 'probability' else -chunk_energies
+        if len(heap) == k:
+            better = scores >= heap[0][0]
+            index, probs, scores = index[better], probs[better], scores[better]
+            if chunk_energies is not None:
+                chunk_energies = chunk_energies[better]
+        if len(scores) > k:
+            # all states tied with the k-th score are candidates, ties are broken by the larger probability
+            candidates = np.flatnonzero(scores >= np.partition(scores, len(scores) - k)[len(scores) - k])
+            best = candidates[np.lexsort((-probs[candidates], -scores[candidates]))[:k]]
+            index, probs, scores = index[best], probs[best], scores[best]
+            if chunk_energies is not None:
+                chunk_energies = chunk_energies[best]
+        for i in range(len(scores)):
+            energy = None if chunk_energies is None else float(chunk_energies[i])
+            item = (float(scores[i]), float(probs[i]), int(index[i]), energy)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+
+    for _, prob, index, energy in sorted(heap, reverse=True):
+        yield format(index, '0{}b'.format(n)), prob, energy
+
+
+def dicke_state(n_qubits, k, domains=None):
+    """
+    State vector of a product of Dicke states, written directly from its amplitudes.
+
+    Instead of simulating the :math:`O(kn)` controlled rotations of ``dstate.cached_dicke_state``, the
+    amplitude :math:`\\prod_d \\binom{n_d}{k}^{-1/2}` is set on every basis state with Hamming weight
+    :math:`k` in each domain :math:`d`. The vectors are cached, so repeated QAOA evaluations only pay for the
+    copy into the simulator.
+
+    Parameters
+        n_qubits : ``integer``\n
+            Total number of qubits. Qubits outside the domains are in :math:`\\ket{0}`.
+
+        k : ``integer``\n
+            The target Hamming weight of each domain.
+
+        domains : ``list[list]``, ``optional``\n
+            Qubit indexes of each domain. Default is a single domain of all qubits.
+
+    Return
+        state : ``ndarray``, shape (2^n,)\n
+            Normalized real state vector. The array is read-only, copy it before modifying it in place, e.g.
+            ``machine.init_state(list(state), qubits)`` for a pyqpanda simulator.
+
+    Raises
+        ValueError\n
+            If :math:`k` is larger than the size of a domain, or :math:`k<0`, or a domain is empty.
+
+    Example
+        .. code-block:: python
+
+            from pyqpanda_alg.QAOA import statevector
+
+            state = statevector.dicke_state(6, 2, [[0, 1, 2], [3, 4, 5]])
+            print(state.nonzero()[0], state[state != 0])
+
+    """
+    domains = (tuple(range(n_qubits)),) if domains is None else tuple(tuple(int(q) for q in d) for d in domains)
+    for domain in domains:
+        if not domain or not 0 <= k <= len(domain):
+            raise ValueError('k={} is invalid for a domain of {} qubits'.format(k, len(domain)))
+    return _dicke_state(n_qubits, k, domains)
+
+
+@lru_cache(maxsize=32)
+def _dicke_state(n_qubits, k, domains):
+    index = np.arange(2 ** n_qubits)
+    feasible = np.ones(len(index), dtype=bool)
+    for domain in domains:
+        weight = np.zeros(len(index), dtype=np.int8)
+        for q in domain:
+            weight += (index >> q) & 1
+        feasible &= weight == k
+    state = np.zeros(len(index))
+    state[feasible] = 1 / np.sqrt(np.prod([comb(len(domain), k) for domain in domains]))
+    state.flags.writeable = False
+    return state
+
+
+def parity_partitions(qubits):
+    """
+    Disjoint pairs of the parity-partition (ring) XY mixer of one domain, in the order of
+    ``default_circuits.parity_partition_xy_mixer``: the even pairs :math:`(q_0, q_1), (q_2, q_3), \\dots`, the
+    odd pairs :math:`(q_1, q_2), \\dots`, and for an odd domain the closing pair :math:`(q_{n-1}, q_0)` alone.
+
+    Parameters
+        qubits : ``list``\n
+            Qubit indexes of the domain.
+
+    Return
+        partitions : ``list[list[tuple]]``\n
+            Pairs of each partition.
+    """
+    qubits, n = list(qubits), len(qubits)
+    if n < 2:
+        return []
+    if n == 2:
+        return [[(qubits[0], qubits[1])]]
+    ring = [(qubits[c], qubits[(c + 1) % n]) for c in range(n)]
+    partitions = [ring[0:n - n % 2:2], ring[1::2]]
+    if n % 2:
+        partitions[1] = ring[1:n - 1:2]
+        partitions.append([ring[-1]])
+    return partitions
+
+
+def complete_partitions(qubits):
+    """
+    Disjoint pairs of the complete XY mixer of one domain, in the order of
+    ``default_circuits.complete_xy_mixer``. The :math:`n(n-1)/2` pairs are split into perfect matchings by the
+    round-robin method, :math:`n-1` of them for an even :math:`n` and :math:`n` for an odd one.
+
+    Parameters
+        qubits : ``list``\n
+            Qubit indexes of the domain.
+
+    Return
+        partitions : ``list[list[tuple]]``\n
+            Pairs of each partition.
+    """
+    qubits = list(qubits)
+    # an odd domain gets a dummy player, whose pairs are dropped
+    players = qubits + [None] * (len(qubits) % 2)
+    m = len(players)
+    partitions = []
+    for r in range(m - 2, -1, -1):
+        pairs = [(players[r], players[m - 1])]
+        pairs += [(players[(r - c) % (m - 1)], players[(r + c) % (m - 1)]) for c in range(1, m // 2)]
+        pairs = [tuple(sorted(pair)) for pair in pairs if None not in pair]
+        partitions.append(sorted(pairs))
+    return partitions
+
+
+def apply_xy_partitions(state, partitions, beta):
+    """
+    Apply :math:`e^{-i\\beta H_{XY}}` of every partition to a state vector in place, where
+    :math:`H_{XY}=\\frac{1}{2}\\sum_{(c,c')}(\\sigma_c^x\\sigma_{c'}^x+\\sigma_c^y\\sigma_{c'}^y)` sums over the disjoint
+    pairs of the partition.
+
+    Every pair rotates the amplitudes of :math:`\\ket{01}` and :math:`\\ket{10}` by
+    :math:`\\cos\\beta I - i\\sin\\beta\\sigma^x`. As in ``apply_x_mixer``, the state is reshaped so that the two
+    qubits of a pair are single axes, and the rotation is applied in place to the two strided views, without building
+    a matrix or copying the vector. The view shapes of a partition are computed once and cached.
+
+    Parameters
+        state : ``ndarray``, shape (2^n,)\n
+            Complex state vector, modified in place.
+
+        partitions : ``list[list[tuple]]``\n
+            Pairs of each partition, e.g. from ``parity_partitions`` or ``complete_partitions``.
+
+        beta : ``float``\n
+            Angle :math:`\\beta` of :math:`e^{-i\\beta H}`.
+
+    Return
+        state : ``ndarray``\n
+            The same state vector.
+    """
+    _check_in_place(state)
+    cos, sin = np.cos(beta), -1j * np.sin(beta)
+    for pairs in partitions:
+        for shape in _pair_shapes(tuple(pairs)):
+            view = state.reshape(shape)
+            a, b = view[:, 0, :, 1], view[:, 1, :, 0]
+            a_old = a.copy()
+            a *= cos
+            a += sin * b
+            b *= cos
+            b += sin * a_old
+    return state
+
+
+@lru_cache(maxsize=None)
+def _pair_shapes(pairs):
+    # axes 1 and 3 of the shape are the high and the low qubit of the pair, the rotation is symmetric in them
+    shapes = []
+    for i, j in pairs:
+        low, high = sorted((int(i), int(j)))
+        shapes.append((-1, 2, 2 ** (high - low - 1), 2, 2 ** low))
+    return shapes
+
+
+def apply_x_mixer(state, beta):
+    """
+    Apply the default mixer :math:`e^{-i\\beta\\sum_i X_i}=RX(2\\beta)^{\\otimes n}` to a state vector in place.
+
+    Parameters
+        state : ``ndarray``, shape (2^n,)\n
+            Complex state vector, modified in place.
+
+        beta : ``float``\n
+            Angle :math:`\\beta`.
+
+    Return
+        state : ``ndarray``\n
+            The same state vector.
+    """
+    _check_in_place(state)
+    n = len(state).bit_length() - 1
+    cos, sin = np.cos(beta), -1j * np.sin(beta)
+    for q in range(n):
+        view = state.reshape(-1, 2, 2 ** q)
+        a, b = view[:, 0], view[:, 1]
+        a_old = a.copy()
+        a *= cos
+        a += sin * b
+        b *= cos
+        b += sin * a_old
+    return state
+
+
+def qaoa_state(energies, gammas, betas, mixer=None, initial_state=None):
+    """
+    Simulate a QAOA circuit on a NumPy state vector.
+
+    The phase separator is the elementwise phase :math:`e^{-i\\gamma E}` of the energy table, and the mixer
+    is a kernel acting on the vector in place.
+
+    Parameters
+        energies : ``ndarray``, shape (2^n,)\n
+            Energies of all basis states, e.g. ``graph.MaxCutGraph.energy_table()``.
+
+        gammas, betas : ``array-like``\n
+            QAOA parameters of every layer.
+
+        mixer : ``callable``, ``optional``\n
+            ``mixer(state, beta)`` applying the mixer in place, e.g. the ``kernel`` attribute of
+            ``default_circuits.xy_mixer``. Default is ``apply_x_mixer``.
+
+        initial_state : ``array-like``, ``optional``\n
+            Initial state vector, e.g. from ``default_circuits.init_d_state(...).statevector(n)``. Default is
+            the equal superposition state.
+
+    Return
+        state : ``ndarray``, shape (2^n,)\n
+            Final complex state vector.
+
+    Example
+        .. code-block:: python
+
+            import numpy as np
+            from pyqpanda_alg.QAOA import default_circuits, statevector
+
+            # choose one of 4 assets in each of 2 groups, with a diagonal cost
+            energies = np.random.uniform(size=2 ** 8)
+            init = default_circuits.init_d_state(2, 1)
+            mixer = default_circuits.xy_mixer(2, 'PXY')
+            state = statevector.qaoa_state(energies, [0.3, 0.5], [0.7, 0.4], mixer.kernel, init.statevector(8))
+            print(np.abs(state) ** 2 @ energies)
+
+    """
+    energies = np.asarray(energies, dtype=float)
+    if initial_state is None:
+        state = np.full(len(energies), 1 / np.sqrt(len(energies)), dtype=complex)
+    else:
+        state = np.array(initial_state, dtype=complex)
+    mixer = apply_x_mixer if mixer is None else mixer
+    for gamma, beta in zip(gammas, betas):
+        state *= np.exp(-1j * gamma * energies)
+        mixer(state, beta)
+    return state
+
+
+def apply_xy_exact(state, domain, mixer_type, beta):
+    """
+    Apply the exact :math:`e^{-i\\beta H_{XY}}` of the ring (``PXY``) or complete (``CXY``) XY Hamiltonian of one
+    domain to a state vector in place, without Trotter error.
+
+    :math:`H_{XY}` conserves the Hamming weight of the domain, so it is diagonalized once per Hamming-weight
+    sector and the eigenbasis is cached for every domain size and mixer type. Each call only multiplies the
+    eigenphases :math:`e^{-i\\beta\\lambda}` in the eigenbasis of every sector.
+
+    Parameters
+        state : ``ndarray``, shape (2^n,)\n
+            Complex state vector, modified in place.
+
+        domain : ``list``\n
+            Qubit indexes of the domain, at most ``EXACT_XY_MAX_QUBITS`` of them.
+
+        mixer_type : ``string``\n
+            ``PXY`` for the ring Hamiltonian, or ``CXY`` for the complete Hamiltonian.
+
+        beta : ``float``\n
+            Angle :math:`\\beta` of :math:`e^{-i\\beta H}`.
+
+    Return
+        state : ``ndarray``\n
+            The same state vector.
+
+    Raises
+        ValueError\n
+            If the domain is larger than ``EXACT_XY_MAX_QUBITS``, or the mixer type is unknown.
+    """
+    _check_in_place(state)
+    n, domain = len(state).bit_length() - 1, list(domain)
+    sectors = _xy_eigensystem(len(domain), mixer_type)
+    # rows of the matrix are the local indexes of the domain, bit k being qubit domain[k]
+    domain_axes = [n - 1 - q for q in reversed(domain)]
+    axes = domain_axes + [axis for axis in range(n) if axis not in domain_axes]
+    view = state.reshape((2,) * n).transpose(axes)
+    matrix = view.reshape(2 ** len(domain), -1)
+    for rows, eigval, eigvec in sectors:
+        matrix[rows] = eigvec @ (np.exp(-1j * beta * eigval)[:, None] * (eigvec.T @ matrix[rows]))
+    view[...] = matrix.reshape(view.shape)
+    return state
+
+
+def xy_unitary(size, mixer_type, beta):
+    """
+    Matrix of the exact :math:`e^{-i\\beta H_{XY}}` of one domain, see ``apply_xy_exact``.
+
+    Parameters
+        size : ``integer``\n
+            Number of qubits of the domain, at most ``EXACT_XY_MAX_QUBITS``.
+
+        mixer_type : ``string``\n
+            ``PXY`` or ``CXY``.
+
+        beta : ``float``\n
+            Angle :math:`\\beta` of :math:`e^{-i\\beta H}`.
+
+    Return
+        unitary : ``ndarray``, shape (2^size, 2^size)\n
+            Unitary in the basis of local indexes, bit :math:`k` being the :math:`k`-th qubit of the domain.
+    """
+    unitary = np.zeros((2 ** size, 2 ** size), dtype=complex)
+    for rows, eigval, eigvec in _xy_eigensystem(size, mixer_type):
+        unitary[np.ix_(rows, rows)] = (eigvec * np.exp(-1j * beta * eigval)) @ eigvec.T
+    return unitary
+
+
+@lru_cache(maxsize=None)
+def _xy_eigensystem(size, mixer_type):
+    if size > EXACT_XY_MAX_QUBITS:
+        raise ValueError('exact XY mixer supports domains of at most {} qubits, got {}'
+                         .format(EXACT_XY_MAX_QUBITS, size))
+    partitions = {'PXY': parity_partitions, 'CXY': complete_partitions}
+    if mixer_type not in partitions:
+        raise ValueError('mixer_type should be one of {}, got {}'.format(list(partitions), mixer_type))
+    pairs = [pair for pairs in partitions[mixer_type](range(size)) for pair in pairs]
+    index = np.arange(2 ** size)
+    weights = np.array([bin(i).count('1') for i in index])
+    sectors = []
+    for weight in range(size + 1):
+        rows = index[weights == weight]
+        position = {int(row): p for p, row in enumerate(rows)}
+        hamiltonian = np.zeros((len(rows), len(rows)))
+        # (XX + YY) / 2 of a pair swaps |01> and |10>
+        for i, j in pairs:
+            flip = (1 << i) | (1 << j)
+            for p, row in enumerate(rows):
+                if (row >> i & 1) != (row >> j & 1):
+                    hamiltonian[position[int(row ^ flip)], p] += 1
+        eigval, eigvec = np.linalg.eigh(hamiltonian)
+        sectors.append((rows, eigval, eigvec))
+    return sectors
+
+
+def _check_in_place(state):
+    if not isinstance(state, np.ndarray) or state.dtype.kind != 'c' or not state.flags.c_contiguous:
+        raise ValueError('state should be a C-contiguous complex ndarray to be modified in place')
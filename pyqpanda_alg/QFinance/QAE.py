@@ -3,12 +3,23 @@
 import pyqpanda.pyQPanda as pq
 import numpy as np
 from numpy import pi
+import threading
+from collections import OrderedDict
+from functools import partial
+from scipy.optimize import minimize_scalar
+from scipy.stats import beta, norm
 from . import grover
+from . import simulation
+from pyqpanda_alg.QAOA import parallel
 from typing import Union, List
 
 from .. config import *
 auth = Authorization()
 
+POWERS_CACHE_SIZE = 4
+# machines and power states of the estimated operators, one cache per thread, see _grover_powers
+_powers = threading.local()
+
 class QAE:
     """
     This class provides a framework for original Quantum Amplitude Estimation(QAE) algorithm [1].
@@ -88,6 +99,10 @@ class IQAE:
             The index of the estimated qubit.\n
         epsilon : ``float``\n
             Estimated precision, i.e. the minimum error.\n
+        alpha : ``float``\n
+            Confidence level of the final interval is :math:`1-\\alpha`. Default 0.05.\n
+        shots : ``int``\n
+            The number of shots of each round. Default 100.\n
 
 
     References
@@ -98,9 +113,19 @@ class IQAE:
     def __init__(self, operator_in=None,
                  qnumber: int = 0,
                  res_index: int = -1,
-                 epsilon: float = 1e-3
+                 epsilon: float = 1e-3,
+                 alpha: float = 0.05,
+                 shots: int = 100
                  ):
-        pass
+        self.operator_in = operator_in
+        self.qnumber = qnumber
+        self.res_index = [res_index % qnumber]
+        self.epsilon = epsilon
+        self.alpha = alpha
+        self.shots = shots
+        self.confidence_interval = None
+        self.oracle_calls = None
+        self.rounds = None
 
     def __del__(self):
         pass
@@ -109,6 +134,17 @@ class IQAE:
         """
         Run the iterative quantum amplitude estimation algorithm.
 
+        The Grover power :math:`k` of each round depends on the confidence interval of the previous one, so
+        that the rounds run in order, and the shots of a round are drawn at once from the probability of the
+        state :math:`A Q^k|0\\rangle`. The states are extended from the largest cached power by
+        ``simulation.GroverPowers``, whose cache is kept by every thread between rounds and between runs with
+        the same operator_in, so that a round repeating a power, or a later estimate of the same operator,
+        applies no :math:`Q` at all. Many estimates run concurrently with ``run_many``.
+
+        After the run, ``confidence_interval`` holds the final :math:`1-\\alpha` confidence interval,
+        ``oracle_calls`` the number of applications of :math:`Q` over all shots, and ``rounds`` the power,
+        shots and good outcomes of each round.
+
         Returns
             prob : ``float``\n
                 A probability value as the iterative amplitude estimation result.
@@ -135,4 +171,299 @@ class IQAE:
         0.2447260561465428
 
         """
-        pass
+        # the angle is normalized as in [2], a = sin^2(2 pi theta) with theta in [0, 1/4]
+        max_rounds = max(int(np.ceil(np.log2(pi / (8 * self.epsilon)))), 1)
+        theta_l, theta_u = 0., 0.25
+        k, upper = 0, True
+        good = shots = 0
+        self.rounds, self.oracle_calls = [], 0
+        while theta_u - theta_l > self.epsilon / pi:
+            next_k, upper = _find_next_k(k, upper, theta_l, theta_u)
+            if next_k != k:
+                good = shots = 0
+            k = next_k
+            prob = _good_probability(self.operator_in, self.qnumber, self.res_index, '1', k)
+            round_good = int(np.random.binomial(self.shots, prob))
+            self.rounds.append((k, self.shots, round_good))
+            self.oracle_calls += self.shots * k
+            # the rounds of the same power are pooled
+            good, shots = good + round_good, shots + self.shots
+            a_min, a_max = _clopper_pearson(good, shots, self.alpha / max_rounds)
+            if upper:
+                theta_min, theta_max = np.arccos(1 - 2 * a_min) / (2 * pi), np.arccos(1 - 2 * a_max) / (2 * pi)
+            else:
+                theta_min, theta_max = 1 - np.arccos(1 - 2 * a_max) / (2 * pi), 1 - np.arccos(1 - 2 * a_min) / (2 * pi)
+            scaling = 4 * k + 2
+            theta_l = (int(scaling * theta_l) + theta_min) / scaling
+            theta_u = (int(scaling * theta_u) + theta_max) / scaling
+        a_l, a_u = np.sin(2 * pi * theta_l) ** 2, np.sin(2 * pi * theta_u) ** 2
+        self.confidence_interval = [float(a_l), float(a_u)]
+        return float((a_l + a_u) / 2)
+
+
+def run_many(estimators, executor=None, chunksize=1):
+    """
+    Run many amplitude estimations, e.g. the payoffs of a pricing job, and stream the results.
+
+    Parameters
+        estimators : ``iterable``\n
+            ``IQAE`` or ``MLAE`` instances. For a process pool, their operator_in has to be picklable and the
+            own executor of an ``MLAE`` should be None.
+        executor : ``concurrent.futures.Executor``, optional\n
+            Executor to run the estimations, see ``pyqpanda_alg.QAOA.parallel.map_unordered``. Every worker
+            thread keeps its cache of Grover power states, so that estimators sharing an operator_in reuse
+            the states. If not given, the estimations run serially.
+        chunksize : ``int``, optional\n
+            Number of estimations per executor task. Default 1.
+
+    Returns
+        results : ``generator``\n
+            Yields ``(index, (prob, confidence_interval, oracle_calls))`` in completion order, where index is
+            the position of the estimator in estimators.
+
+    Examples
+        >>> import pyqpanda as pq
+        >>> import numpy as np
+        >>> from concurrent.futures import ProcessPoolExecutor
+        >>> from pyqpanda_alg.QFinance import QAE
+        >>> def create_cir(qlist):
+        >>>     cir = pq.QCircuit()
+        >>>     cir << pq.RY(qlist[0], np.pi / 3) << pq.X(qlist[1]).control(qlist[0])
+        >>>     return cir
+        >>> estimators = [QAE.IQAE(operator_in=create_cir, qnumber=2, epsilon=0.01) for _ in range(8)]
+        >>> with ProcessPoolExecutor(4) as executor:
+        >>>     for index, (prob, interval, calls) in QAE.run_many(estimators, executor, chunksize=2):
+        >>>         print(index, prob, interval, calls)
+
+    """
+    # every estimation gets its own seed, so that worker processes forked with the same random state differ
+    items = ((estimator, np.random.randint(2 ** 32)) for estimator in estimators)
+    return parallel.map_unordered(_run_estimator, items, executor, chunksize)
+
+
+def _run_estimator(item):
+    estimator, seed = item
+    np.random.seed(seed)
+    prob = estimator.run()
+    return prob, estimator.confidence_interval, estimator.oracle_calls
+
+
+def _find_next_k(k, upper, theta_l, theta_u, min_ratio=2.0):
+    # the largest power whose scaled interval lies in one half circle, at least min_ratio times the last one
+    old_scaling = 4 * k + 2
+    max_scaling = int(1 / (2 * (theta_u - theta_l)))
+    scaling = max_scaling - (max_scaling - 2) % 4
+    while scaling >= min_ratio * old_scaling:
+        theta_min = scaling * theta_l - int(scaling * theta_l)
+        theta_max = scaling * theta_u - int(scaling * theta_u)
+        if theta_min <= theta_max <= 0.5:
+            return (scaling - 2) // 4, True
+        if 0.5 <= theta_min <= theta_max:
+            return (scaling - 2) // 4, False
+        scaling -= 4
+    return k, upper
+
+
+def _clopper_pearson(good, shots, alpha):
+    a_min = beta.ppf(alpha / 2, good, shots - good + 1) if good > 0 else 0.
+    a_max = beta.ppf(1 - alpha / 2, good + 1, shots - good) if good < shots else 1.
+    return a_min, a_max
+
+
+class MLAE:
+    """
+    This class provides a framework for Maximum Likelihood Amplitude Estimation(MLAE) algorithm [3].
+
+    Instead of the phase estimation of ``QAE``, the circuits :math:`A Q^{m_k}` are measured for a schedule of
+    Grover powers :math:`m_k`, each without any evaluation qubit, and the shot counts are combined by
+    maximizing the likelihood of :math:`a = \\sin^2\\theta`,
+
+    .. math::
+        L(\\theta) = \\prod_k \\sin^2((2m_k+1)\\theta)^{h_k} \\cos^2((2m_k+1)\\theta)^{N-h_k},
+
+    where :math:`h_k` is the number of good outcomes among :math:`N` shots of the k-th circuit.
+
+    Parameters
+        operator_in : callable ``f(qubits)``\n
+            Operator/Circuit of the estimated qubits state.
+        qnumber : ``int``\n
+            The number of all qubits used in circuit.
+        res_index : ``int``, ``list``\n
+            The index of the estimated qubit(s).
+        epsilon : ``float``\n
+            Estimated precision. Without an evaluation_schedule, the schedule is the shortest one whose
+            Cramer-Rao bound of the standard deviation is at most epsilon.
+        target_state : ``str``\n
+            Estimated target state, the first estimated qubit being right-most.
+        schedule : ``str{'exponential', 'linear'}``, optional\n
+            The Grover powers :math:`m_k`:\n
+            - ``exponential`` : :math:`0, 1, 2, 4, \\dots, 2^{M-2}`. (Default)
+            - ``linear`` : :math:`0, 1, 2, \\dots, M-1`.
+        evaluation_schedule : ``list[int]``, optional\n
+            The Grover powers given explicitly, instead of schedule and epsilon.
+        shots : ``int``\n
+            The number of shots of each circuit. Default 100.
+        executor : ``concurrent.futures.Executor``, optional\n
+            Executor to run the circuits of the schedule concurrently, e.g. a ``ProcessPoolExecutor``, in which
+            case operator_in has to be picklable. In every thread the state :math:`A Q^{m_k}|0\\rangle` is
+            extended from the largest cached power by ``simulation.GroverPowers``. If not given, the schedule
+            runs serially.
+
+    Attributes
+        confidence_interval : ``list[float]``\n
+            The 95% confidence interval of the estimate from the Fisher information, set by ``run``.
+        oracle_calls : ``int``\n
+            The number of applications of :math:`Q` over all shots, set by ``run``.
+
+    References
+        [3] Suzuki Y, Uno S, Raymond R, et al. Amplitude estimation without phase estimation[J].
+        Quantum Information Processing, 2020, 19(2): 75. https://doi.org/10.1007/s11128-019-2565-2
+
+    """
+    def __init__(self, operator_in=None,
+                 qnumber: int = 0,
+                 res_index: Union[int, List[int]] = -1,
+                 epsilon: float = 1e-3,
+                 target_state: str = '1',
+                 schedule: str = 'exponential',
+                 evaluation_schedule: List[int] = None,
+                 shots: int = 100,
+                 executor=None
+                 ):
+        self.operator_in = operator_in
+        self.qnumber = qnumber
+        res_index = [res_index] if isinstance(res_index, int) else list(res_index)
+        self.res_index = [index % qnumber for index in res_index]
+        if len(target_state) != len(self.res_index):
+            raise ValueError('target state {} does not match {} estimated qubits'.format(
+                target_state, len(self.res_index)))
+        self.epsilon = epsilon
+        self.target_state = target_state
+        self.shots = shots
+        self.executor = executor
+        if evaluation_schedule is None:
+            evaluation_schedule = _mlae_schedule(schedule, epsilon, shots)
+        self.evaluation_schedule = list(evaluation_schedule)
+        self.confidence_interval = None
+        self.oracle_calls = None
+
+    def run(self):
+        """
+        Run the maximum likelihood amplitude estimation algorithm.
+
+        Returns
+            prob : ``float``\n
+                A probability value as the amplitude estimation result.
+
+        Examples
+            An example for implementing a maximum likelihood amplitude estimation for target state '11' of
+            the circuit in ``QAE.run``.
+
+        >>> import pyqpanda as pq
+        >>> from pyqpanda_alg.QFinance import QAE
+        >>> import numpy as np
+        >>> def create_cir(qlist):
+        >>>     cir = pq.QCircuit()
+        >>>     cir << pq.RY(qlist[0], np.pi / 3) << pq.X(qlist[1]).control(qlist[0])
+        >>>     return cir
+        >>> np.random.seed(7)
+        >>> mlae = QAE.MLAE(operator_in=create_cir, qnumber=2, epsilon=0.01, res_index=[0, 1], target_state='11')
+        >>> print(mlae.run(), mlae.evaluation_schedule, mlae.oracle_calls)
+        0.2496673604759892 [0, 1, 2] 300
+
+        """
+        probs = self._good_probabilities()
+        good = np.random.binomial(self.shots, probs)
+        powers = np.array(self.evaluation_schedule)
+        theta = _max_likelihood_angle(powers, good, self.shots)
+        # Fisher information of theta, 4 N (2m + 1)^2 for each circuit, mapped to a = sin^2(theta)
+        sigma = np.sin(2 * theta) / np.sqrt(4 * self.shots * np.sum((2 * powers + 1) ** 2))
+        estimate = np.sin(theta) ** 2
+        half_width = norm.ppf(0.975) * sigma
+        self.confidence_interval = [float(max(estimate - half_width, 0.)), float(min(estimate + half_width, 1.))]
+        self.oracle_calls = int(self.shots * powers.sum())
+        return float(estimate)
+
+    def _good_probabilities(self):
+        function = partial(_good_probability, self.operator_in, self.qnumber, self.res_index, self.target_state)
+        probs = np.empty(len(self.evaluation_schedule))
+        for index, prob in parallel.map_unordered(function, self.evaluation_schedule, self.executor):
+            probs[index] = prob
+        return probs
+
+
+def _mlae_schedule(schedule, epsilon, shots, max_length=32):
+    if schedule not in ('exponential', 'linear'):
+        raise ValueError('unknown schedule {}'.format(schedule))
+    powers = []
+    for k in range(max_length):
+        powers.append(0 if k == 0 else (2 ** (k - 1) if schedule == 'exponential' else k))
+        if 1 / np.sqrt(4 * shots * np.sum((2 * np.array(powers) + 1) ** 2)) <= epsilon:
+            break
+    return powers
+
+
+def _max_likelihood_angle(powers, good, shots):
+    def negative_log_likelihood(theta):
+        angle = (2 * powers + 1) * theta
+        return -np.sum(good * np.log(np.sin(angle) ** 2 + 1e-300)
+                       + (shots - good) * np.log(np.cos(angle) ** 2 + 1e-300))
+
+    # the likelihood is multimodal, with peaks of width about pi / (2 (2 max(m) + 1)), so that a grid
+    # finer than the peaks locates the global maximum, which is then refined
+    grid = np.linspace(0, np.pi / 2, 50 * (2 * int(powers.max()) + 1) + 1)
+    values = [negative_log_likelihood(theta) for theta in grid]
+    best = int(np.argmin(values))
+    step = grid[1] - grid[0]
+    result = minimize_scalar(negative_log_likelihood, method='bounded',
+                             bounds=(max(grid[best] - step, 0), min(grid[best] + step, np.pi / 2)))
+    return result.x if result.fun <= values[best] else grid[best]
+
+
+def _grover_operator(operator_in, qubits, res_index, target_state):
+    def flip_operator(flip_qubits):
+        return grover.mark_data_reflection(qubits=[flip_qubits[i] for i in res_index], mark_data=target_state)
+
+    return grover.amp_operator(q_input=qubits, q_flip=qubits, q_zero=qubits,
+                               in_operator=operator_in, flip_operator=flip_operator)
+
+
+def _good_mask(qnumber, res_index, target_state):
+    index = np.arange(2 ** qnumber)
+    good = np.ones(2 ** qnumber, dtype=bool)
+    for i, qubit in enumerate(res_index):
+        good &= (index >> qubit & 1) == int(target_state[-1 - i])
+    return good
+
+
+def _grover_powers(operator_in, qnumber, res_index, target_state):
+    # one machine and power cache per estimated operator and thread, kept between rounds and runs; the
+    # machine holds the state being extended, so that it is not shared between threads
+    powers_cache = _powers_cache()
+    key = (operator_in, qnumber, tuple(res_index), target_state)
+    if key in powers_cache:
+        powers_cache.move_to_end(key)
+        return powers_cache[key]
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    qubits = machine.qAlloc_many(qnumber)
+    prog = pq.QProg()
+    prog << operator_in(qubits)
+    machine.directly_run(prog)
+    grover_operator = _grover_operator(operator_in, qubits, res_index, target_state)
+    powers = simulation.GroverPowers(np.array(machine.get_qstate()),
+                                     simulation.circuit_operator(machine, qubits, grover_operator))
+    powers.machine, powers.good = machine, _good_mask(qnumber, res_index, target_state)
+    powers_cache[key] = powers
+    if len(powers_cache) > POWERS_CACHE_SIZE:
+        powers_cache.popitem(last=False)[1].machine.finalize()
+    return powers
+
+
+def _powers_cache():
+    return _powers.__dict__.setdefault('cache', OrderedDict())
+
+
+def _good_probability(operator_in, qnumber, res_index, target_state, power):
+    powers = _grover_powers(operator_in, qnumber, res_index, target_state)
+    return float(min(powers.probabilities(power)[powers.good].sum(), 1.))
@@ -1,3 +1,4 @@
+import re
 from typing import Union, Optional, List
 
 import numpy as np
@@ -36,7 +37,8 @@ class QuadraticBinary:
     """
 
     def __init__(self, problem):
-        pass
+        self.problem = problem
+        self.quadratic, self.linear, self.constant = _quadratic_coefficients(problem)
 
     def query_qnumber(self) -> List[int]:
         """
@@ -140,7 +142,42 @@ class QuadraticBinary:
         -1.0
 
         """
-        pass
+        return float(self.function_values([var_array])[0])
+
+    def function_values(self, var_arrays):
+        """
+        Vectorized ``function_value`` over many variables arrays.
+
+        Parameters
+            var_arrays : ``array_like``, shape (m, n)\n
+                Arrays of binary values, one per row.
+
+        Returns
+            res : ``ndarray``, shape (m,)\n
+                The function value of each row.
+
+        """
+        var_arrays = np.atleast_2d(np.asarray(var_arrays, dtype=float))
+        return (np.einsum('ij,jk,ik->i', var_arrays, self.quadratic, var_arrays)
+                + var_arrays @ self.linear + self.constant)
+
+    def key_values(self, keys):
+        """
+        Function values of candidates given as qpanda state keys, the first variable being right-most.
+        Can be used as the batch_value_function of ``grover.GroverAdaptiveSearch.run``.
+
+        Parameters
+            keys : ``list[str]``\n
+                Binary keys of the variable register.
+
+        Returns
+            res : ``ndarray``\n
+                The function value of each key.
+
+        """
+        bits = np.frombuffer(''.join(keys).encode(), dtype=np.uint8).reshape(len(keys), len(self.linear))[:, ::-1]
+        bits = bits - ord('0')
+        return self.function_values(bits)
 
     def qubobytraversal(self):
         """
@@ -166,7 +203,43 @@ class QuadraticBinary:
         result of traversal:  ([[0, 1, 0]], -1.0)
 
         """
-        pass
+        n = len(self.linear)
+        var_arrays = (np.arange(2 ** n)[:, None] >> np.arange(n)) & 1
+        values = self.function_values(var_arrays)
+        min_value = values.min()
+        return var_arrays[np.isclose(values, min_value)].tolist(), float(min_value)
+
+
+def _quadratic_coefficients(problem):
+    """Quadratic matrix, linear array and constant of a problem, the variables in natural order of names."""
+    if isinstance(problem, dict):
+        linear = np.asarray(problem.get('linear', []), dtype=float)
+        n = len(linear) if len(linear) else len(problem.get('quadratic', []))
+        quadratic = np.asarray(problem.get('quadratic', np.zeros((n, n))), dtype=float).reshape(n, n)
+        linear = linear if len(linear) else np.zeros(n)
+        return quadratic, linear, float(problem.get('constant', 0))
+    variables = sorted(problem.free_symbols,
+                       key=lambda symbol: [int(part) if part.isdigit() else part
+                                           for part in re.split(r'(\d+)', symbol.name)])
+    n = len(variables)
+    quadratic, linear, constant = np.zeros((n, n)), np.zeros(n), 0.
+    if not n:
+        # sp.Poly needs at least one generator
+        return quadratic, linear, float(problem)
+    for powers, coefficient in sp.Poly(sp.expand(problem), *variables).terms():
+        # x ** 2 = x for binary variables
+        index = [i for i, power in enumerate(powers) if power]
+        if len(index) > 2:
+            raise ValueError('the problem should be quadratic, got the term {}'.format(
+                sp.Mul(*[variables[i] ** powers[i] for i in index])))
+        if len(index) == 2:
+            quadratic[index[0], index[1]] += float(coefficient)
+        elif len(index) == 1:
+            linear[index[0]] += float(coefficient)
+        else:
+            constant += float(coefficient)
+    return quadratic, linear, constant
+
 
 class QUBO_GAS_origin(QuadraticBinary):
 
@@ -7,5 +7,6 @@ from . import comparator
 from . import grover
 from . import QAE
 from . import QUBO
+from . import simulation
 
-__all__ = [comparator, grover, QAE, QUBO]
\ No newline at end of file
+__all__ = [comparator, grover, QAE, QUBO, simulation]
\ No newline at end of file
@@ -1,14 +1,20 @@
+from collections import OrderedDict
+from math import ceil, floor, pi
+
 import pyqpanda as pq
 import numpy as np
 
 from .. config import *
 auth = Authorization()
 
+CACHE_SIZE = 32
+
 
 def int_comparator(value, q_state, q_anc_cmp, function='geq', reuse=False):
     """
     This function provides comparators to compare basis states(can be superposition states)
     against a given classical integer.
+    To compare the same qubits against several values, see ``ComparatorCache``.
 
     Parameters
         value : ``int``\n
@@ -54,7 +60,7 @@ def int_comparator(value, q_state, q_anc_cmp, function='geq', reuse=False):
         {'0': 0.7500000000000003, '1': 0.2500000000000001}
 
     """
-    pass
+    return ComparatorCache(q_state, q_anc_cmp, function=function, method='int', reuse=reuse)(value)
 
 
 def interpolation_comparator(value, q_state, q_anc_cmp, function='g', reuse=False):
@@ -167,6 +173,7 @@ def qft_comparator(value, q_state, q_cmp, function='geq'):
     """
     This function provides qft_based comparators to compare basis states(can be superposition states)
     against a given classical integer.
+    To compare the same qubits against several values, see ``ComparatorCache``.
 
     Parameters
         value : ``int``\n
@@ -208,7 +215,7 @@ def qft_comparator(value, q_state, q_cmp, function='geq'):
         {'0': 0.7500000000000003, '1': 0.2500000000000001}
 
     """
-    pass
+    return ComparatorCache(q_state, q_cmp, function=function, method='qft')(value)
 
 
 def qft_qubit_comparator(q_state_1, q_state_2, q_cmp, function='geq'):
@@ -257,3 +264,173 @@ def qft_qubit_comparator(q_state_1, q_state_2, q_cmp, function='geq'):
 
     """
     pass
+
+
+class ComparatorCache:
+    """
+    Comparators of basis states against classical thresholds on fixed qubits, cached by threshold.
+
+    Grover Adaptive Search compares against a new threshold whenever the current best value changes, while
+    the structure of the comparator does not depend on it. The threshold-independent skeleton is built once,
+    when first needed: the gate variants of each bit of the carry chain of ``int_comparator``, or the QFT
+    circuits of ``qft_comparator``. A threshold only selects the variants, or patches the single-qubit phase
+    rotations which add it in the Fourier basis. The circuits of recently used thresholds are kept in an LRU
+    cache.
+
+    Parameters
+        q_state : ``Qubit``, ``QVec``\n
+            State qubits.
+        q_anc_cmp : ``Qubit``, ``QVec``\n
+            For ``int``, ancilla and comparison result qubits, the result qubit being the last element, as
+            many as q_state. For ``qft``, the comparison result qubit.
+        function : ``str{'geq', 'g', 'seq', 's'}``, optional\n
+            Evaluate conditions, see ``int_comparator``. Default ``geq``.
+        method : ``str{'int', 'qft'}``, optional\n
+            The comparator construction:\n
+            - ``int`` : carry chain of Toffoli gates, see ``int_comparator``. (Default)
+            - ``qft`` : subtraction in the Fourier basis without ancilla, see ``qft_comparator``.
+        reuse : ``bool``, optional\n
+            For ``int``, set to True to add a reverse circuit part to reuse ancilla qubits.
+        cache_size : ``int``, optional\n
+            Number of cached thresholds. Default ``CACHE_SIZE``.
+
+    Raises
+        ValueError\n
+            If the function or the method is unknown, or the number of ancilla qubits is wrong.
+
+    Examples
+        Compare a uniform superposition of three qubits with a decreasing threshold, as in the oracle of a
+        Grover Adaptive Search.
+
+        >>> from pyqpanda_alg.QFinance import comparator
+        >>> import pyqpanda as pq
+        >>> m = pq.CPUQVM()
+        >>> m.initQVM()
+        >>> q_state = m.qAlloc_many(3)
+        >>> q_cmp = m.qAlloc()
+        >>> cmp_cache = comparator.ComparatorCache(q_state, q_cmp, function='s', method='qft')
+        >>> for value in [6, 3, 6]:
+        >>>     prog = pq.QProg()
+        >>>     prog << pq.H(q_state) << cmp_cache(value)
+        >>>     print(value, m.prob_run_dict(prog, [q_cmp])['1'])
+        6 0.7500000000000017
+        3 0.37500000000000083
+        6 0.7500000000000017
+
+    """
+    def __init__(self, q_state, q_anc_cmp, function='geq', method='int', reuse=False, cache_size=CACHE_SIZE):
+        if function not in ('geq', 'g', 'seq', 's'):
+            raise ValueError('unknown comparison function {}'.format(function))
+        self.q_state = _qubit_list(q_state)
+        self.q_anc_cmp = _qubit_list(q_anc_cmp)
+        self.function = function
+        self.method = method
+        self.reuse = reuse
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        n = len(self.q_state)
+        if method == 'int':
+            if len(self.q_anc_cmp) != n:
+                raise ValueError('{} ancilla and result qubits given for {} state qubits'.format(
+                    len(self.q_anc_cmp), n))
+        elif method == 'qft':
+            if len(self.q_anc_cmp) != 1:
+                raise ValueError('qft comparator takes one result qubit, {} given'.format(len(self.q_anc_cmp)))
+        else:
+            raise ValueError('unknown comparator method {}'.format(method))
+        self._carry = {}
+        self._qft = None
+
+    def __call__(self, value):
+        """
+        Comparator circuit against the given value.
+
+        Parameters
+            value : ``float``\n
+                The given classical number. Basis states are integers, so that only the integer threshold
+                it implies matters, e.g. ``x >= 2.5`` is ``x >= 3``.
+
+        Returns
+            circuit : ``QCircuit``\n
+                The cached comparator circuit, which should not be modified.
+
+        """
+        # x > v and x <= v are compared as x >= floor(v) + 1 and x < floor(v) + 1
+        threshold = floor(value) + 1 if self.function in ('g', 'seq') else ceil(value)
+        if threshold in self._cache:
+            self._cache.move_to_end(threshold)
+            return self._cache[threshold]
+        circuit = self._int_circuit(threshold) if self.method == 'int' else self._qft_circuit(threshold)
+        self._cache[threshold] = circuit
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return circuit
+
+    def clear(self):
+        """
+        Drop all cached comparator circuits.
+        """
+        self._cache.clear()
+
+    def _carry_variant(self, i, bit):
+        # carry of x + (2^n - t) at bit i for the complement bit, (compute, uncompute)
+        if (i, bit) not in self._carry:
+            n, q, anc = len(self.q_state), self.q_state, self.q_anc_cmp
+            target = anc[i] if i < n - 1 else anc[-1]
+            carry = pq.QCircuit()
+            if i == 0:
+                if bit:
+                    carry << pq.CNOT(q[0], target)
+            elif bit:
+                carry << pq.X(q[i]) << pq.X(anc[i - 1]) << pq.Toffoli(q[i], anc[i - 1], target)
+                carry << pq.X(q[i]) << pq.X(anc[i - 1]) << pq.X(target)
+            else:
+                carry << pq.Toffoli(q[i], anc[i - 1], target)
+            self._carry[i, bit] = carry, carry.dagger()
+        return self._carry[i, bit]
+
+    def _int_circuit(self, threshold):
+        # the carry out of x + 2^n - t is 1 exactly when x >= t
+        n = len(self.q_state)
+        result = self.q_anc_cmp[-1]
+        circuit = pq.QCircuit()
+        if threshold <= 0:
+            circuit << pq.X(result)
+        elif threshold < 2 ** n:
+            complement = 2 ** n - threshold
+            for i in range(n):
+                circuit << self._carry_variant(i, complement >> i & 1)[0]
+            if self.reuse:
+                for i in range(n - 2, -1, -1):
+                    circuit << self._carry_variant(i, complement >> i & 1)[1]
+        if self.function in ('s', 'seq'):
+            circuit << pq.X(result)
+        return circuit
+
+    def _qft_circuit(self, threshold):
+        # the result qubit is the borrow of x - t on n + 1 qubits, then t is added back to the n state qubits
+        n = len(self.q_state)
+        result = self.q_anc_cmp[0]
+        circuit = pq.QCircuit()
+        if threshold > 2 ** n:
+            circuit << pq.X(result)
+        elif threshold > 0:
+            if self._qft is None:
+                register = self.q_state + self.q_anc_cmp
+                self._qft = (pq.QFT(register), pq.QFT(register).dagger(),
+                             pq.QFT(self.q_state), pq.QFT(self.q_state).dagger())
+            qft_register, iqft_register, qft_state, iqft_state = self._qft
+            circuit << qft_register
+            for j, qubit in enumerate(self.q_state + self.q_anc_cmp):
+                circuit << pq.U1(qubit, -2 * pi * threshold * 2 ** j / 2 ** (n + 1))
+            circuit << iqft_register << qft_state
+            for j, qubit in enumerate(self.q_state):
+                circuit << pq.U1(qubit, 2 * pi * threshold * 2 ** j / 2 ** n)
+            circuit << iqft_state
+        if self.function in ('geq', 'g'):
+            circuit << pq.X(result)
+        return circuit
+
+
+def _qubit_list(qubits):
+    return [qubits] if isinstance(qubits, pq.Qubit) else list(qubits)
@@ -1,9 +1,21 @@
+import threading
+from collections import OrderedDict
+from functools import partial
+
 import pyqpanda as pq
 import numpy as np
 
+from pyqpanda_alg.QAOA import parallel
+from . import simulation
 from .. config import *
 auth = Authorization()
 
+MEMO_SIZE = 2 ** 16
+ORACLE_CACHE_SIZE = 4
+
+# machines and registers of the searches, see GroverAdaptiveSearch._measure
+_searches = threading.local()
+
 class Grover:
     """ This class provides a framework for Grover Search algorithm [1].
 
@@ -12,7 +24,8 @@ class Grover:
             Operator/Circuit of the initial search state for the algorithm, default Hadamards.
         flip_operator : callable ``f(qubits)``\n
             Operator/Circuit of marking the good states by phase-flip. Default doing a pauli-Z
-            gate at the last qubit.
+            gate at the last qubit. A ``simulation.PhaseOracle`` built from a predicate or a mask
+            over the basis states is also accepted, which simulation backends apply as a sign flip.
         zero_flip : callable ``f(qubits)``\n
             Operator/Circuit of reflects 0s by phase-flip. Default doing a zero-controled pauli-Z
             gate on qubits.
@@ -35,7 +48,13 @@ class Grover:
                  zero_flip=None,
                  mark_data=None,
                  amplify_operator=None):
-        pass
+        self.in_operator = in_operator or _hadamard
+        if flip_operator is None and mark_data is not None:
+            flip_operator = lambda qubits: mark_data_reflection(qubits=qubits, mark_data=mark_data)
+        self.flip_operator = flip_operator or _last_z
+        self.zero_flip = zero_flip or _zero_z
+        self.mark_data = mark_data
+        self.amplify_operator = amplify_operator
 
     def cir(self, q_input=None, q_flip=None, q_zero=None, iternum: int = 1):
         """
@@ -92,21 +111,34 @@ class Grover:
                           └─┘ └─┘ └─┘
 
         """
-        pass
+        q_flip = q_input if q_flip is None else q_flip
+        q_zero = q_input if q_zero is None else q_zero
+        circuit = pq.QCircuit()
+        circuit << self.in_operator(q_input)
+        for _ in range(iternum):
+            if self.amplify_operator is not None:
+                circuit << self.amplify_operator(q_input)
+            else:
+                circuit << amp_operator(q_input, q_flip, q_zero, self.in_operator, self.flip_operator, self.zero_flip)
+        return circuit
 
 
 def iter_num(q_num, sol_num):
     """
     Calculate the optimal number of iterations in Grover search.
 
+    The arguments are broadcast against each other, so that a grid of problem sizes is evaluated in one call,
+    e.g. ``iter_num(np.arange(2, 30)[:, None], [1, 2, 4])`` returns a (28, 3) array.
+
     Parameters
-        q_num : ``int``\n
+        q_num : ``int``, ``array_like``\n
             The number of qubits in the search space. Search space size:  :math:`N = 2 ^ {\\text {q_num}}`.
-        sol_num : ``int``\n
+        sol_num : ``int``, ``array_like``\n
             Number of target solution states.
 
     Returns
-        num : The optimal number of iterations in Grover search.
+        num : The optimal number of iterations in Grover search, 0 if there is no solution. An ``ndarray``
+            of ``int`` for array arguments.
 
     Examples
         An example for the case we show in the Grover search circuit. And we know there
@@ -129,25 +161,29 @@ def iter_num(q_num, sol_num):
     best iter num:  1
 
     """
-    pass
+    theta = _rotation_angle(q_num, sol_num)
+    with np.errstate(divide='ignore'):
+        num = np.where(theta > 0, np.floor(np.pi / (2 * theta)), 0).astype(int)
+    return int(num) if num.ndim == 0 else num
 
 
 def iter_analysis(q_num, sol_num, iternum=1):
     """
     Calculate the amplification probability and rotation angle for given amplitude
-    amplification iteration number.
+    amplification iteration number. The arguments are broadcast against each other as in ``iter_num``.
 
     Parameters
-        q_num : ``int``\n
+        q_num : ``int``, ``array_like``\n
             The number of qubits in the search space. Search space size:  :math:`N = 2 ^ {\\text {q_num}}`.
-        sol_num : ``int``\n
+        sol_num : ``int``, ``array_like``\n
             Number of target solution states.
-        iternum : ``int``\n
+        iternum : ``int``, ``array_like``\n
             Given number of iteration.
 
     Returns
         prob, theta : (``float``, ``float``)\n
-            The amplification probability and rotation angle for given iteration.
+            The amplification probability and rotation angle for given iteration, both ``ndarray`` of the
+            broadcast shape for array arguments.
 
     Examples
         An example for the case we show in the Grover search circuit. And we know there
@@ -173,7 +209,75 @@ def iter_analysis(q_num, sol_num, iternum=1):
     prob for getting one of the solution with given iter num 2: 0.24999999999999956
 
     """
-    pass
+    theta = _rotation_angle(q_num, sol_num)
+    prob = np.sin((2 * np.asarray(iternum) + 1) / 2 * theta) ** 2
+    if prob.ndim == 0:
+        return float(prob), float(theta)
+    return prob, np.broadcast_to(theta, prob.shape)
+
+
+def min_iter_num(q_num, sol_num, target_prob, max_iternum=None):
+    """
+    Calculate the minimal number of iterations reaching a target success probability in Grover search.
+
+    The success probability :math:`\\sin^2((2k+1)\\theta/2)` reaches :math:`p` when the angle
+    :math:`(2k+1)\\theta/2` falls into one of the windows :math:`[a + j\\pi, \\pi - a + j\\pi]` with
+    :math:`a = \\arcsin\\sqrt{p}`, so that only the first iteration count of each window is checked.
+
+    Parameters
+        q_num : ``int``, ``array_like``\n
+            The number of qubits in the search space. Search space size:  :math:`N = 2 ^ {\\text {q_num}}`.
+        sol_num : ``int``, ``array_like``\n
+            Number of target solution states.
+        target_prob : ``float``, ``array_like``\n
+            The target success probability.
+        max_iternum : ``int``, ``array_like``, optional\n
+            The largest number of iterations allowed. Default twice the optimal number given by ``iter_num``
+            plus one, which covers a full period of the success probability.
+
+    Returns
+        num : ``int``, ``ndarray``\n
+            The minimal number of iterations, or -1 if the target is not reached within max_iternum or
+            sol_num exceeds the search space. All arguments are broadcast against each other.
+
+    Examples
+        Plan the iterations needed for a success probability of 0.9, for 10 to 30 qubits and 1 to 4 solutions.
+
+    >>> import numpy as np
+    >>> from pyqpanda_alg.QFinance import grover
+    >>> num = grover.min_iter_num(np.arange(10, 31, 10)[:, None], np.arange(1, 5), 0.9)
+    >>> print(num)
+    [[   20    14    12    10]
+     [  640   452   369   320]
+     [20464 14470 11815 10232]]
+
+    """
+    theta = _rotation_angle(q_num, sol_num)
+    target_prob = np.asarray(target_prob, dtype=float)
+    if max_iternum is None:
+        max_iternum = 2 * iter_num(q_num, sol_num) + 1
+    theta, target_prob, max_iternum = np.broadcast_arrays(theta, target_prob, max_iternum)
+    lower = np.arcsin(np.sqrt(np.clip(target_prob, 0, 1)))
+    num = np.full(theta.shape, -1)
+    num[target_prob <= 0] = 0
+    # the angle is NaN where there are more solutions than states
+    windows = int(np.ceil(np.max(np.nan_to_num((2 * max_iternum + 1) * theta / 2), initial=0) / np.pi)) + 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for j in range(windows):
+            first = np.ceil((lower + j * np.pi) / theta - 0.5)
+            first = np.where(np.isfinite(first), np.maximum(first, 0), -1)
+            # the previous count is checked as well, against the rounding of the window bound
+            for k in (first - 1, first):
+                prob = np.sin((2 * k + 1) / 2 * theta) ** 2
+                reached = (num < 0) & (k >= 0) & (k <= max_iternum) & (prob >= target_prob - 1e-12)
+                num[reached] = k[reached]
+    return int(num) if num.ndim == 0 else num
+
+
+def _rotation_angle(q_num, sol_num):
+    # NaN if there are more solutions than states
+    with np.errstate(invalid='ignore'):
+        return 2 * np.arcsin(np.sqrt(np.asarray(sol_num, dtype=float) / 2.0 ** np.asarray(q_num)))
 
 # def iter_analysis(q_num, sol_num, iternum=1, prob_input=None):
 #     # 因为反三角函数的性质，输入概率看角度时iternum应为1
@@ -208,7 +312,8 @@ def amp_operator(q_input=None, q_flip=None, q_zero=None, in_operator=None, flip_
             Operator/Circuit of the initial search state for the algorithm, default Hadamards.
         flip_operator : callable ``f(qubits)``\n
             Operator/Circuit of marking the good states by phase-flip. Default doing a pauli-Z
-            gate at the last qubit.
+            gate at the last qubit. A ``simulation.PhaseOracle`` built from a predicate or a mask
+            over the basis states is also accepted, which simulation backends apply as a sign flip.
         zero_flip : callable ``f(qubits)``\n
             Operator/Circuit of reflects 0s by phase-flip. Default doing a zero-controled pauli-Z
             gate on qubits.
@@ -244,18 +349,34 @@ def amp_operator(q_input=None, q_flip=None, q_zero=None, in_operator=None, flip_
                   └─┘ └─┘ └─┘
 
     """
-    pass
+    in_operator = in_operator or _hadamard
+    flip_operator = flip_operator or _last_z
+    zero_flip = zero_flip or _zero_z
+    circuit = pq.QCircuit()
+    circuit << flip_operator(q_flip) << in_operator(q_input).dagger() << zero_flip(q_zero) << in_operator(q_input)
+    return circuit
 
 
-def mark_data_reflection(qubits: list = None, mark_data=None):
+def mark_data_reflection(qubits: list = None, mark_data=None, ancillas: list = None):
     """
     Can be used to construct a phase flip operator for given target states.
 
+    The marked states are first merged into disjoint cubes, i.e. pairs of states differing in one qubit are
+    merged repeatedly and the qubit becomes free. The cubes are then arranged in a prefix tree over their
+    fixed qubits, the most often fixed qubits first, so that the condition of a common prefix is computed only
+    once. With ancillas, the condition of each prefix is kept on an ancilla by a Toffoli gate on the ancilla of
+    its parent and uncomputed after its subtree, and every cube ends with a controlled-Z gate, so that the
+    multi-controlled gates are decomposed into Toffoli gates only. Ancillas are reused between the subtrees and
+    at most :math:`n-2` of them are used. Without enough ancillas the remaining subtrees fall back to
+    multi-controlled Z gates. See ``mark_data_report`` for the gate counts.
+
     Parameters
         qubits : ``QVec``\n
             Target qubit(s) for flip_operator.
         mark_data : ``str``, ``list[str]``\n
             Marked target state(s).
+        ancillas : ``QVec``, optional\n
+            Auxiliary qubits in state 0, returned to 0. Default None.
 
     Returns
         flip_operator : ``QCircuit``\n
@@ -279,7 +400,238 @@ def mark_data_reflection(qubits: list = None, mark_data=None):
     {'000': 0.0, '001': 0.5000000000000002, '010': 0.0, '011': 0.0, '100': 0.0, '101': 0.5000000000000002, '110': 0.0, '111': 0.0}
 
     """
-    pass
+    ancillas = [] if ancillas is None else list(ancillas)
+    work = list(qubits) + ancillas
+    circuit = pq.QCircuit()
+    for name, index in _mark_gates(len(qubits), mark_data, len(ancillas)):
+        gate_qubits = [work[i] for i in index]
+        if name == 'X':
+            circuit << pq.X(gate_qubits[0])
+        elif name == 'Z':
+            circuit << pq.Z(gate_qubits[0])
+        elif name == 'CZ':
+            circuit << pq.CZ(gate_qubits[0], gate_qubits[1])
+        elif name == 'TOFFOLI':
+            circuit << pq.Toffoli(gate_qubits[0], gate_qubits[1], gate_qubits[2])
+        else:
+            circuit << pq.Z(gate_qubits[-1]).control(gate_qubits[:-1])
+    return circuit
+
+
+def mark_data_report(n_qubits, mark_data, n_ancilla=0):
+    """
+    Gate counts and depth of the phase flip operator of ``mark_data_reflection``, without building it.
+
+    Parameters
+        n_qubits : ``int``\n
+            The number of target qubits.
+        mark_data : ``str``, ``list[str]``\n
+            Marked target state(s).
+        n_ancilla : ``int``\n
+            The number of available ancillas. Default 0.
+
+    Returns
+        report : ``dict``\n
+            ``cubes``, the number of merged cubes, ``ancillas``, the number of ancillas used, ``gates``, the
+            number of gates by name (``X``, ``Z``, ``CZ``, ``TOFFOLI``, ``MCZ``), ``max_controls``, the largest
+            number of controls of a gate, and ``depth``, the circuit depth.
+
+    Examples
+        >>> from pyqpanda_alg.QFinance import grover
+        >>> marked = [format(i, '010b') for i in range(1000) if i % 8 != 3]
+        >>> print(grover.mark_data_report(10, marked, n_ancilla=8))
+
+    """
+    counts = dict.fromkeys(('X', 'Z', 'CZ', 'TOFFOLI', 'MCZ'), 0)
+    depth = [0] * (n_qubits + n_ancilla)
+    max_controls, used = 0, set()
+    for name, index in _mark_gates(n_qubits, mark_data, n_ancilla):
+        counts[name] += 1
+        max_controls = max(max_controls, len(index) - 1)
+        used.update(i for i in index if i >= n_qubits)
+        layer = max(depth[i] for i in index) + 1
+        for i in index:
+            depth[i] = layer
+    return {'cubes': len(_mark_cubes(n_qubits, mark_data)), 'ancillas': len(used), 'gates': counts,
+            'max_controls': max_controls, 'depth': max(depth, default=0)}
+
+
+def _mark_cubes(n, mark_data):
+    """Disjoint cubes ``(fixed mask, value)`` covering exactly the marked states."""
+    if isinstance(mark_data, str):
+        mark_data = [mark_data]
+    full = 2 ** n - 1
+    cubes = set()
+    for key in mark_data:
+        if len(key) != n:
+            raise ValueError('marked state {} should have {} bits'.format(key, n))
+        cubes.add((full, int(key, 2)))
+    merged = True
+    while merged:
+        merged = False
+        for bit in (1 << q for q in range(n)):
+            for fixed, value in sorted(cubes):
+                if fixed & bit and not value & bit and (fixed, value | bit) in cubes and (fixed, value) in cubes:
+                    cubes -= {(fixed, value), (fixed, value | bit)}
+                    cubes.add((fixed & ~bit, value))
+                    merged = True
+    return sorted(cubes)
+
+
+def _mark_gates(n, mark_data, n_ancilla):
+    """Gates ``(name, qubit indexes)`` of the phase flip, index :math:`n+j` being the ancilla :math:`j`."""
+    cubes = _mark_cubes(n, mark_data)
+    order = sorted(range(n), key=lambda q: (-sum(fixed >> q & 1 for fixed, _ in cubes), q))
+    # prefix tree over the fixed qubits, a literal being (qubit, value); the cubes are disjoint, so that
+    # no cube is a prefix of another one and only the leaves are marked
+    tree = {}
+    for fixed, value in cubes:
+        node = tree
+        for q in order:
+            if fixed >> q & 1:
+                node = node.setdefault((q, value >> q & 1), {})
+    gates = []
+
+    def flip(q, bit):
+        # consecutive X gates on the same qubit cancel
+        if bit:
+            return
+        if gates and gates[-1] == ('X', (q,)):
+            gates.pop()
+        else:
+            gates.append(('X', (q,)))
+
+    def literals(node):
+        if not node:
+            yield []
+        for literal, child in node.items():
+            for rest in literals(child):
+                yield [literal] + rest
+
+    def visit(node, control, depth):
+        for (q, bit), child in node.items():
+            flip(q, bit)
+            if not child:
+                gates.append(('Z', (q,)) if control is None else ('CZ', (control, q)))
+            elif control is None:
+                visit(child, q, depth + 1)
+            elif depth - 1 < n_ancilla:
+                ancilla = n + depth - 1
+                gates.append(('TOFFOLI', (control, q, ancilla)))
+                flip(q, bit)
+                visit(child, ancilla, depth + 1)
+                flip(q, bit)
+                gates.append(('TOFFOLI', (control, q, ancilla)))
+            else:
+                for rest in literals(child):
+                    for q_rest, bit_rest in rest:
+                        flip(q_rest, bit_rest)
+                    gates.append(('MCZ', (control, q) + tuple(q_rest for q_rest, _ in rest)))
+                    for q_rest, bit_rest in rest:
+                        flip(q_rest, bit_rest)
+            flip(q, bit)
+
+    visit(tree, None, 0)
+    return gates
+
+
+def _hadamard(qubits):
+    circuit = pq.QCircuit()
+    circuit << pq.H(qubits)
+    return circuit
+
+
+def _last_z(qubits):
+    circuit = pq.QCircuit()
+    circuit << pq.Z(qubits[-1])
+    return circuit
+
+
+def _zero_z(qubits):
+    circuit = pq.QCircuit()
+    circuit << pq.X(qubits)
+    circuit << (pq.Z(qubits[-1]).control(qubits[:-1]) if len(qubits) > 1 else pq.Z(qubits[-1]))
+    circuit << pq.X(qubits)
+    return circuit
+
+
+class ValueMemo:
+    """
+    Bounded memo of a value function over measured candidates, keyed by the packed integer of each key.
+
+    Every call scores the distinct candidates which are not memorized yet, at once if a batch function is
+    given, so that a candidate measured again, in the same round or in a later one, is never rescored.
+
+    Parameters
+        value_function : callable ``f(key)``\n
+            Function for computing the problem value of a candidate, given as a qpanda state key.
+        maxsize : ``int``, optional\n
+            Maximum number of memorized candidates, the least recently used ones being dropped.
+            Default ``MEMO_SIZE``.
+        batch_function : callable ``f(keys)``, optional\n
+            Function for computing the values of a list of candidates at once, e.g. ``key_values`` of a
+            ``QUBO.QuadraticBinary``. Used instead of value_function if given.
+
+    Attributes
+        evaluations : ``int``\n
+            Number of candidates scored so far.
+        hits : ``int``\n
+            Number of candidates answered from the memo.
+
+    Raises
+        ValueError\n
+            If neither value_function nor batch_function is given.
+
+    Examples
+        >>> from pyqpanda_alg.QFinance import grover
+        >>> memo = grover.ValueMemo(lambda key: key.count('1'))
+        >>> print(memo(['101', '001', '101']), memo(['001']), memo.evaluations, memo.hits)
+        [2, 1, 2] [1] 2 2
+
+    """
+    def __init__(self, value_function=None, maxsize=MEMO_SIZE, batch_function=None):
+        if value_function is None and batch_function is None:
+            raise ValueError('either value_function or batch_function should be given')
+        self.value_function = value_function
+        self.batch_function = batch_function
+        self.maxsize = maxsize
+        self.evaluations = 0
+        self.hits = 0
+        self._values = OrderedDict()
+
+    def __call__(self, keys):
+        """
+        Values of the given candidates.
+
+        Parameters
+            keys : ``list[str]``\n
+                Measured candidates as qpanda state keys, possibly repeated.
+
+        Returns
+            values : ``list``\n
+                The value of each candidate, in the order of keys.
+
+        """
+        packed = [int(key, 2) for key in keys]
+        found = {}
+        for index in packed:
+            if index in self._values:
+                self._values.move_to_end(index)
+                found[index] = self._values[index]
+        missing = {index: key for index, key in zip(packed, keys) if index not in found}
+        # repeated candidates of the same call are scored once and count as hits too
+        self.hits += len(packed) - len(missing)
+        if missing:
+            if self.batch_function is not None:
+                values = list(self.batch_function(list(missing.values())))
+            else:
+                values = [self.value_function(key) for key in missing.values()]
+            self.evaluations += len(missing)
+            for index, value in zip(missing, values):
+                found[index] = self._values[index] = value
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+        return [found[index] for index in packed]
 
 
 class GroverAdaptiveSearch:
@@ -293,8 +645,21 @@ class GroverAdaptiveSearch:
         init_circuit : callable ``f(qubits)``\n
             Operator/Circuit of the initial search state for the algorithm, default Hadamards.
         oracle_circuit : callable ``f(qubits, value)``\n
-            Operator/Circuit of marking the `better` states by phase-flip. Default doing a pauli-Z
-            gate at the last qubit.
+            Operator/Circuit computing the problem value minus the given value into the value qubits,
+            so that the last qubit, which is phase-flipped, is 1 for the `better` states. Required.
+
+    Raises
+        ValueError\n
+            If oracle_circuit is not given.
+
+    Note
+        The machine and qubits of the searches are allocated once per thread and register size. For each
+        threshold, the initial and oracle circuits are simulated once, and the states of the Grover iterations
+        are extended from the nearest cached one by ``simulation.GroverPowers``, with the pauli-Z flip and the
+        zero flip applied as NumPy reflections. The searches of a cycle, which keep the threshold, thus apply
+        only the Grover iterations beyond the ones already computed. The states of the ``ORACLE_CACHE_SIZE``
+        most recent thresholds are kept. An oracle_circuit may keep a ``comparator.ComparatorCache`` for each
+        qubit register it is given, so that a new threshold only patches the comparator.
 
     References
         [2] A. Gilliam, S. Woerner, C. Gonciulea, Grover Adaptive Search for Constrained
@@ -302,10 +667,16 @@ class GroverAdaptiveSearch:
 
     """
     def __init__(self, init_value, n_index, init_circuit=None, oracle_circuit=None):
-        pass
+        self.init_value = init_value
+        self.n_index = n_index
+        if oracle_circuit is None:
+            raise ValueError('oracle_circuit is required to mark the better states')
+        self.init_circuit = init_circuit or _hadamard
+        self.oracle_circuit = oracle_circuit
 
     def run(self, continue_times: int = 3, n_value_function=None, value_function=None,
-            rotation_change='random', process_show=False):
+            rotation_change='random', process_show=False, shots: int = 1, batch_value_function=None,
+            memo_size: int = MEMO_SIZE, executor=None):
         """
         Run the Grover Adaptive Search algorithm to find the minimum.
 
@@ -314,9 +685,9 @@ class GroverAdaptiveSearch:
                 The maximum number of repeated searches at the current optimal point.
             n_value_function : callable ``f(value)``\n
                 Function for computing the number of qubits for marking the `better` states at current
-                best value, variable qubits not included.
-            value_function : callable ``f(var_array)``\n
-                Function for computing the problem value of given varriables array(str given as qpanda state).
+                best value, variable qubits not included. Required.
+            value_function : callable ``f(key)``\n
+                Function for computing the problem value of a candidate, given as a qpanda state key.
             rotation_change : ``str{'random', 'increase'}``, optional\n
                 The method to get the number of Grover iterations for each search of a search cycle.
 
@@ -325,11 +696,31 @@ class GroverAdaptiveSearch:
                - ``increase`` : The number of Grover iterations for each search is increasing.
             process_show : ``bool``\n
                 Set to True to print the detail during search.
+            shots : ``int``, optional\n
+                The number of candidates measured by each search, the best one being kept. Default 1.
+            batch_value_function : callable ``f(keys)``, optional\n
+                Function for computing the problem values of a list of qpanda state keys at once, used
+                instead of value_function if given, e.g. ``key_values`` of a ``QUBO.QuadraticBinary``.
+            memo_size : ``int``, optional\n
+                The number of scored candidates memorized during the run, see ``ValueMemo``. Every distinct
+                candidate is scored only once while it is memorized. Default ``MEMO_SIZE``.
+            executor : ``concurrent.futures.Executor``, optional\n
+                Executor to run the searches of a search cycle concurrently, e.g. a ``ProcessPoolExecutor``.
+                The rotation counts of the cycle are drawn at once and the results are scored in completion
+                order. At the first improvement the searches which have not started are cancelled and the
+                results of the running ones are discarded. For a process pool, init_circuit and
+                oracle_circuit have to be picklable, e.g. module level functions. If not given, the searches
+                run serially. Default None.
 
         Returns
             minimum_indexes, minimum_res : ( ``list[list[int]]``, ``float``)\n
                 The optimization result including the solution array and the optimal value.
 
+        Raises
+            ValueError\n
+                If n_value_function or both value_function and batch_value_function are not given, or
+                rotation_change is unknown.
+
         Examples
             An example for minimization of quadratic binary function: x0 * x1 + x0 - x1.
 
@@ -384,8 +775,95 @@ class GroverAdaptiveSearch:
         ([[0, 1]], -1)
 
         """
-        pass
+        if rotation_change not in ('random', 'increase'):
+            raise ValueError('unknown rotation_change {}'.format(rotation_change))
+        if n_value_function is None:
+            raise ValueError('n_value_function is required to size the value qubits')
+        memo = ValueMemo(value_function, memo_size, batch_value_function)
+        # the interval of random rotations grows by 8/7 after each failed search, up to sqrt(N) [2]
+        max_rotation = np.sqrt(2 ** self.n_index)
+        current_min = self.init_value
+        minimum_keys = []
+        rotations = 0
+        improved = True
+        while improved:
+            improved = False
+            interval, cycle = 1, []
+            for search in range(1, continue_times + 1):
+                if rotation_change == 'random':
+                    cycle.append(np.random.randint(1, int(np.ceil(interval)) + 1))
+                else:
+                    cycle.append(search)
+                interval = min(interval * 8 / 7, max_rotation)
+            # every search of the cycle gets its own seed, so that the results do not depend on the executor
+            items = [(rotation, np.random.randint(2 ** 32)) for rotation in cycle]
+            search_function = partial(_search, self, current_min, n_value_function(current_min), shots)
+            results = parallel.map_unordered(search_function, items, executor)
+            try:
+                for index, keys in results:
+                    rotations += cycle[index]
+                    if process_show:
+                        print('======searching', index + 1, ',rotation =', cycle[index], '======')
+                    values = memo(keys)
+                    best = int(np.argmin(values))
+                    if values[best] < current_min:
+                        current_min, minimum_keys = values[best], [keys[best]]
+                        improved = True
+                        if process_show:
+                            print('Current minimum Key: ', keys[best])
+                            print('Current minimum Value: ', current_min)
+                        break
+                    if values[best] == current_min:
+                        if keys[best] not in minimum_keys:
+                            minimum_keys.append(keys[best])
+                        if process_show:
+                            print('minimum Key Again: ', keys[best])
+                            print('minimum Value No Change: ', current_min)
+            finally:
+                # the threshold moved, the searches which have not started yet are cancelled
+                results.close()
+        if process_show:
+            print('rotations: ', rotations)
+        return [self._bin_to_int(key) for key in minimum_keys], current_min
+
+    def _measure(self, rotation, current_min, n_value, shots, seed=None):
+        machine, q_index, qubits, powers = _search_register(self.n_index, n_value)
+        key = (self.init_circuit, self.oracle_circuit, current_min)
+        if key in powers:
+            powers.move_to_end(key)
+        else:
+            prog = pq.QProg()
+            prog << self.init_circuit(q_index) << self.oracle_circuit(qubits, current_min)
+            machine.directly_run(prog)
+            initial_state = np.array(machine.get_qstate())
+            # the flip operator of the search is the pauli-Z on the last qubit, i.e. a sign flip of the states
+            # whose last qubit is 1, and the zero flip is the reflection about the initial state
+            flip = simulation.PhaseOracle(1, [1], qubits=[len(qubits) - 1])
+            powers[key] = simulation.GroverPowers(initial_state, simulation.reflection_operator(initial_state, flip))
+            if len(powers) > ORACLE_CACHE_SIZE:
+                powers.popitem(last=False)
+        state = powers[key].state(rotation)
+        # the index qubits are the low bits of the state, the value qubits are traced out
+        prob = (np.abs(state) ** 2).reshape(-1, 2 ** self.n_index).sum(axis=0)
+        indices = np.random.default_rng(seed).choice(len(prob), size=shots, p=prob / prob.sum())
+        return [format(int(index), '0{}b'.format(self.n_index)) for index in indices]
 
     @staticmethod
     def _bin_to_int(bin_value):
-        pass
+        return list(map(int, bin_value))[::-1]
+
+
+def _search(search, current_min, n_value, shots, item):
+    rotation, seed = item
+    return search._measure(rotation, current_min, n_value, shots, seed)
+
+
+def _search_register(n_index, n_value):
+    """Machine, index qubits, all qubits and Grover power cache of the searches of the current thread."""
+    registers = _searches.__dict__.setdefault('registers', {})
+    if (n_index, n_value) not in registers:
+        machine = pq.CPUQVM()
+        machine.init_qvm()
+        q_index = machine.qAlloc_many(n_index)
+        registers[n_index, n_value] = machine, q_index, q_index + machine.qAlloc_many(n_value), OrderedDict()
+    return registers[n_index, n_value]
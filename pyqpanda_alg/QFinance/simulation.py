@@ -0,0 +1,442 @@
+"""
+NumPy simulation backends for Grover search and amplitude amplification.
+
+The index of an amplitude is the integer of the computational basis state, bit :math:`i` of the index
+being qubit :math:`i`, i.e. the first qubit sits at the right-most position of the binary key, as in the
+results of ``prob_run_dict``.
+
+"""
+from collections import OrderedDict
+
+import numpy as np
+import pyqpanda as pq
+
+from . import grover
+from .. config import *
+auth = Authorization()
+
+CHUNK_SIZE = 2 ** 20
+CACHE_SIZE = 16
+
+
+def marked_indices(q_num, marked):
+    """
+    Collect the basis states marked by a list of states, a boolean mask or a vectorized predicate.
+
+    Parameters
+        q_num : ``int``\n
+            The number of qubits in the search space. Search space size: :math:`N = 2 ^ {\\text {q_num}}`.
+        marked : ``str``, ``list[str]``, ``list[int]``, ``ndarray``, callable ``f(indices)``\n
+            The marked states. Binary keys are read as qpanda states, the first qubit being right-most.
+            A boolean array of length :math:`N` is used as a mask over the basis states. A callable
+            receives an integer array of basis indices and returns a boolean array of the same shape;
+            it is evaluated in chunks of ``CHUNK_SIZE`` indices.
+
+    Returns
+        indices : ``ndarray``\n
+            Sorted, distinct indices of the marked basis states.
+
+    Raises
+        ValueError\n
+            If a state does not fit into ``q_num`` qubits, or the mask has a wrong length.
+
+    """
+    size = 2 ** q_num
+    if callable(marked):
+        chunks = (np.arange(start, min(start + CHUNK_SIZE, size)) for start in range(0, size, CHUNK_SIZE))
+        return np.concatenate([chunk[np.asarray(marked(chunk), dtype=bool)] for chunk in chunks])
+    if isinstance(marked, str):
+        marked = [marked]
+    marked = np.asarray(marked)
+    if marked.dtype == bool:
+        if marked.shape != (size,):
+            raise ValueError('mask of shape {} does not match {} basis states'.format(marked.shape, size))
+        return np.flatnonzero(marked)
+    if marked.dtype.kind in 'US':
+        if any(len(key) != q_num for key in marked):
+            raise ValueError('marked states should be {}-bit binary keys'.format(q_num))
+        marked = np.array([int(key, 2) for key in marked], dtype=np.int64)
+    indices = np.unique(marked.astype(np.int64))
+    if len(indices) and (indices[0] < 0 or indices[-1] >= size):
+        raise ValueError('marked states should be in [0, {})'.format(size))
+    return indices
+
+
+class SubspaceSimulator:
+    """
+    Simulate Grover search in the two-dimensional subspace spanned by the marked and unmarked states.
+
+    Starting from the uniform superposition, every Grover iteration rotates the state by the same angle
+    :math:`\\theta = 2\\arcsin\\sqrt{M/N}` in this plane, so that after :math:`k` iterations every marked
+    state has the amplitude :math:`\\sin((2k+1)\\theta/2)/\\sqrt{M}` and every unmarked state the amplitude
+    :math:`\\cos((2k+1)\\theta/2)/\\sqrt{N-M}`, up to a global phase. The results of ``Grover.cir`` with
+    the default in_operator and zero_flip are thus obtained without simulating any gate, and a sweep over
+    iteration counts costs one vectorized call.
+
+    Parameters
+        q_num : ``int``\n
+            The number of qubits in the search space. Search space size: :math:`N = 2 ^ {\\text {q_num}}`.
+        marked : ``str``, ``list[str]``, ``list[int]``, ``ndarray``, callable ``f(indices)``\n
+            The marked states, see ``marked_indices``. A list of states is handled in closed form, a mask
+            or a predicate is evaluated once over the :math:`N` basis states.
+
+    Examples
+        Sweep the iteration count of the search for '101' and '001', then sample the best one.
+
+    >>> from pyqpanda_alg.QFinance import simulation
+    >>> sim = simulation.SubspaceSimulator(3, ['101', '001'])
+    >>> print(sim.success_probability([0, 1, 2]))
+    [0.25 1.   0.25]
+    >>> print(sim.sample(iternum=1, shots=1000, rng=7))
+    {'001': 485, '101': 515}
+
+    """
+    def __init__(self, q_num, marked):
+        self.q_num = q_num
+        self.indices = marked_indices(q_num, marked)
+        self.sol_num = len(self.indices)
+        self.theta = 2 * np.arcsin(np.sqrt(self.sol_num / 2 ** q_num))
+
+    def success_probability(self, iternum=1):
+        """
+        Probability of measuring one of the marked states.
+
+        Parameters
+            iternum : ``int``, ``array-like``\n
+                Number(s) of Grover iterations.
+
+        Returns
+            prob : ``float``, ``ndarray``\n
+                Success probability for each iteration count, with the shape of ``iternum``.
+
+        """
+        return np.sin((2 * np.asarray(iternum) + 1) * self.theta / 2) ** 2
+
+    def amplitudes(self, iternum=1):
+        """
+        Amplitude of each marked state and of each unmarked state.
+
+        Parameters
+            iternum : ``int``, ``array-like``\n
+                Number(s) of Grover iterations.
+
+        Returns
+            good, bad : (``ndarray``, ``ndarray``)\n
+                Amplitudes with the shape of ``iternum``. Zero if there is no state of the kind.
+
+        """
+        angle = (2 * np.asarray(iternum) + 1) * self.theta / 2
+        n_bad = 2 ** self.q_num - self.sol_num
+        good = np.sin(angle) / np.sqrt(self.sol_num) if self.sol_num else np.zeros_like(angle)
+        bad = np.cos(angle) / np.sqrt(n_bad) if n_bad else np.zeros_like(angle)
+        return good, bad
+
+    def state(self, iternum=1):
+        """
+        Full state vector after the given number of iterations, built in :math:`O(N)`.
+
+        Returns
+            state : ``ndarray``\n
+                Real amplitudes of the :math:`2^{\\text{q_num}}` basis states.
+
+        """
+        good, bad = self.amplitudes(iternum)
+        state = np.full(2 ** self.q_num, bad, dtype=float)
+        state[self.indices] = good
+        return state
+
+    def prob_dict(self, iternum=1):
+        """
+        Probabilities of all basis states, in the format of ``prob_run_dict``.
+
+        Returns
+            prob : ``dict``\n
+                Probability keyed by the binary key of each basis state.
+
+        """
+        prob = self.state(iternum) ** 2
+        return {format(index, '0{}b'.format(self.q_num)): value for index, value in enumerate(prob)}
+
+    def sample(self, iternum=1, shots=1000, rng=None):
+        """
+        Sample measurement outcomes without building the state vector.
+
+        The number of marked outcomes is drawn from a binomial distribution with the success probability,
+        then the outcomes are uniform within the marked and the unmarked states.
+
+        Parameters
+            iternum : ``int``\n
+                Number of Grover iterations.
+            shots : ``int``\n
+                Number of samples.
+            rng : ``numpy.random.Generator``, ``int``, optional\n
+                Random generator or seed.
+
+        Returns
+            counts : ``dict``\n
+                Number of occurrences keyed by the binary key of each measured state, in the format of
+                ``run_with_configuration``.
+
+        """
+        rng = np.random.default_rng(rng)
+        n_good = rng.binomial(shots, self.success_probability(iternum)) if self.sol_num else 0
+        good = self.indices[rng.integers(self.sol_num, size=n_good)] if n_good else np.empty(0, dtype=np.int64)
+        # the j-th unmarked index is j shifted by the number of marked indices up to it
+        rank = rng.integers(2 ** self.q_num - self.sol_num, size=shots - n_good)
+        bad = rank + np.searchsorted(self.indices - np.arange(self.sol_num), rank, side='right')
+        values, counts = np.unique(np.concatenate([good, bad]), return_counts=True)
+        return {format(int(value), '0{}b'.format(self.q_num)): int(count) for value, count in zip(values, counts)}
+
+
+class PhaseOracle:
+    """
+    Diagonal phase flip of the basis states selected by a classical predicate or a mask.
+
+    It can be passed as the flip_operator of ``grover.Grover`` or ``grover.amp_operator``, where it builds
+    the marking circuit of ``grover.mark_data_reflection``. A simulation backend such as
+    ``reflection_operator`` applies it instead as one elementwise sign flip of the state vector, which
+    replaces the multi-controlled gate network of every marked state.
+
+    Parameters
+        q_num : ``int``\n
+            The number of flip qubits.
+        marked : ``str``, ``list[str]``, ``list[int]``, ``ndarray``, callable ``f(indices)``\n
+            The marked states of the flip qubits, see ``marked_indices``.
+        qubits : ``list[int]``, optional\n
+            Position of each flip qubit in the simulated state vector, e.g. when the state also holds
+            auxiliary qubits. Default ``range(q_num)``.
+
+    Examples
+        Search for the multiples of 3 among 4-bit integers with a predicate instead of a circuit.
+
+    >>> import numpy as np
+    >>> from pyqpanda_alg.QFinance import simulation
+    >>> oracle = simulation.PhaseOracle(4, lambda x: x % 3 == 0)
+    >>> a = np.full(16, 0.25)
+    >>> powers = simulation.GroverPowers(a, simulation.reflection_operator(a, oracle))
+    >>> print(round(float(powers.probabilities(1)[oracle.indices].sum()), 4))
+    0.8438
+
+    """
+    def __init__(self, q_num, marked, qubits=None):
+        self.q_num = q_num
+        self.indices = marked_indices(q_num, marked)
+        self.qubits = list(range(q_num)) if qubits is None else list(qubits)
+        if len(self.qubits) != q_num:
+            raise ValueError('{} positions given for {} flip qubits'.format(len(self.qubits), q_num))
+        self._signs = {}
+
+    def __call__(self, qubits, ancillas=None):
+        """
+        Marking circuit of ``grover.mark_data_reflection`` on the flip qubits.
+
+        Parameters
+            qubits : ``QVec``\n
+                The ``q_num`` flip qubits.
+            ancillas : ``QVec``, optional\n
+                Auxiliary qubits in state 0, see ``grover.mark_data_reflection``.
+
+        Returns
+            flip_operator : ``QCircuit``\n
+                A phase flip operator for the marked states.
+
+        Raises
+            ValueError\n
+                If the number of qubits is not ``q_num``.
+
+        """
+        if len(qubits) != self.q_num:
+            raise ValueError('{} qubits given for {} flip qubits'.format(len(qubits), self.q_num))
+        return grover.mark_data_reflection(qubits=qubits, mark_data=self.keys(), ancillas=ancillas)
+
+    def keys(self):
+        """
+        Binary keys of the marked states, as the mark_data of ``grover.mark_data_reflection``.
+        """
+        return [format(int(index), '0{}b'.format(self.q_num)) for index in self.indices]
+
+    def signs(self, n_qubits):
+        """
+        Diagonal of the phase flip over a state vector of ``n_qubits`` qubits, computed once per size.
+
+        Returns
+            signs : ``ndarray``\n
+                -1 for the basis states whose flip qubits are marked, 1 otherwise.
+
+        """
+        if n_qubits not in self._signs:
+            if n_qubits <= max(self.qubits, default=-1):
+                raise ValueError('flip qubit {} is out of a {}-qubit state'.format(max(self.qubits), n_qubits))
+            mask = np.zeros(2 ** self.q_num, dtype=bool)
+            mask[self.indices] = True
+            index = np.arange(2 ** n_qubits)
+            sub_index = np.zeros_like(index)
+            for i, qubit in enumerate(self.qubits):
+                sub_index |= ((index >> qubit) & 1) << i
+            signs = np.where(mask[sub_index], -1., 1.)
+            signs.flags.writeable = False
+            self._signs[n_qubits] = signs
+        return self._signs[n_qubits]
+
+    def apply(self, state):
+        """
+        Flip the sign of the marked amplitudes.
+
+        Parameters
+            state : ``ndarray``\n
+                State vector of :math:`2^n` amplitudes.
+
+        Returns
+            state : ``ndarray``\n
+                A new state vector.
+
+        """
+        state = np.asarray(state)
+        return state * self.signs(len(state).bit_length() - 1)
+
+
+def reflection_operator(initial_state, flip_operator):
+    """
+    Grover operator :math:`Q = A S_0 A^\\dagger S_\\chi` acting directly on state vectors.
+
+    Since :math:`A S_0 A^\\dagger = I - 2|a\\rangle\\langle a|` for :math:`|a\\rangle = A|0\\rangle`, one
+    application costs the flip operator plus one inner product, without simulating :math:`A` or its inverse.
+
+    Parameters
+        initial_state : ``ndarray``\n
+            The state :math:`A|0\\rangle` prepared by the in_operator.
+        flip_operator : callable ``f(state)``, ``PhaseOracle``\n
+            Returns the state with the good states phase-flipped, e.g. ``circuit_operator`` of the
+            flip_operator circuit. A ``PhaseOracle`` is applied as an elementwise sign flip.
+
+    Returns
+        operator : callable ``f(state)``\n
+            Applies :math:`Q` once and returns the new state.
+
+    """
+    initial_state = np.asarray(initial_state, dtype=complex)
+    if isinstance(flip_operator, PhaseOracle):
+        flip_operator = flip_operator.apply
+
+    def operator(state):
+        state = np.asarray(flip_operator(state), dtype=complex)
+        return state - 2 * np.vdot(initial_state, state) * initial_state
+
+    return operator
+
+
+def circuit_operator(machine, qubits, circuit):
+    """
+    Wrap a circuit as a function of the state vector, simulated by a qpanda machine.
+
+    Parameters
+        machine : ``QuantumMachine``\n
+            An initialized machine, e.g. ``pq.CPUQVM()``.
+        qubits : ``QVec``\n
+            All qubits allocated by the machine, in the order of the state vector index.
+        circuit : ``QCircuit``\n
+            The circuit to apply, built once on ``qubits``.
+
+    Returns
+        operator : callable ``f(state)``\n
+            Loads the state into the machine, runs the circuit and returns the new state vector.
+
+    """
+    prog = pq.QProg()
+    prog << circuit
+
+    def operator(state):
+        machine.init_state(list(state), qubits)
+        machine.directly_run(prog)
+        return np.array(machine.get_qstate())
+
+    return operator
+
+
+class GroverPowers:
+    """
+    Incrementally build the states :math:`A Q^k|0\\rangle` for a sequence of iteration counts.
+
+    The states of recently used :math:`k` are kept in an LRU cache, and the state for a new :math:`k` is
+    extended from the largest cached :math:`k' \\le k` by applying :math:`Q` only :math:`k - k'` more
+    times. Sweeping :math:`k = 0, 1, \\dots, K` then takes :math:`K` applications of :math:`Q` instead of
+    :math:`K(K+1)/2` when every circuit ``Grover.cir(..., iternum=k)`` is simulated from scratch.
+
+    Parameters
+        initial_state : ``ndarray``\n
+            The state :math:`A|0\\rangle`, which is always kept. A read-only copy is taken.
+        grover_operator : callable ``f(state)``\n
+            Applies :math:`Q` once, e.g. ``reflection_operator`` or ``circuit_operator`` of an
+            ``amp_operator`` circuit.
+        cache_size : ``int``, optional\n
+            Number of states kept besides :math:`k = 0`. Default is ``CACHE_SIZE``.
+
+    Attributes
+        operator_calls : ``int``\n
+            Total number of applications of :math:`Q` so far.
+
+    Examples
+        Amplify the state '11' of two qubits prepared by Hadamards, simulating every circuit with qpanda.
+
+    >>> import numpy as np
+    >>> import pyqpanda as pq
+    >>> from pyqpanda_alg.QFinance import simulation
+    >>> m = pq.CPUQVM()
+    >>> m.init_qvm()
+    >>> q_state = m.qAlloc_many(2)
+    >>> flip = simulation.circuit_operator(m, q_state, pq.CZ(q_state[0], q_state[1]))
+    >>> powers = simulation.GroverPowers(np.full(4, 0.5), simulation.reflection_operator(np.full(4, 0.5), flip))
+    >>> print([round(float(powers.probabilities(k)[3]), 4) for k in range(4)], powers.operator_calls)
+    [0.25, 1.0, 0.25, 0.25] 3
+
+    """
+    def __init__(self, initial_state, grover_operator, cache_size=CACHE_SIZE):
+        self.initial_state = np.array(initial_state, dtype=complex)
+        self.initial_state.flags.writeable = False
+        self.grover_operator = grover_operator
+        self.cache_size = cache_size
+        self.operator_calls = 0
+        self._cache = OrderedDict()
+
+    def state(self, k):
+        """
+        State vector :math:`A Q^k|0\\rangle`.
+
+        Parameters
+            k : ``int``\n
+                Number of Grover iterations.
+
+        Returns
+            state : ``ndarray``\n
+                The state vector. It is shared with the cache and should not be modified.
+
+        """
+        if k < 0:
+            raise ValueError('the number of iterations should be non-negative, got {}'.format(k))
+        if k == 0:
+            return self.initial_state
+        if k in self._cache:
+            self._cache.move_to_end(k)
+            return self._cache[k]
+        start = max((i for i in self._cache if i < k), default=0)
+        state = self._cache[start] if start else self.initial_state
+        for _ in range(k - start):
+            state = self.grover_operator(state)
+        self.operator_calls += k - start
+        state.flags.writeable = False
+        self._cache[k] = state
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return state
+
+    def probabilities(self, k):
+        """
+        Probabilities of all basis states of :math:`A Q^k|0\\rangle`.
+        """
+        return np.abs(self.state(k)) ** 2
+
+    def clear(self):
+        """
+        Drop all cached states except :math:`A|0\\rangle`.
+        """
+        self._cache.clear()
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from pyqpanda_alg.QAOA.qaoa import QAOA
+
+
+class RecordingQAOA(QAOA):
+    """
+    QAOA of f(x) = x on one qubit, standing in for the circuit simulation and the optimization.
+
+    The distribution of one layer is written in closed form, and ``run`` records its arguments in ``runs``
+    and echoes them instead of optimizing.
+    """
+    runs = []
+
+    def run_qaoa_circuit(self, gammas, betas, shots=-1):
+        prob_one = float(np.sin(gammas[0] + betas[0]) ** 2)
+        return {'0': 1 - prob_one, '1': prob_one}
+
+    def calculate_energy(self, x):
+        return x[0]
+
+    def run(self, layer=1, initial_para=None, **run_option):
+        para = None if initial_para is None else list(initial_para)
+        self.runs.append(dict(run_option, layer=layer, initial_para=para))
+        return {}, para, float(layer)
+
+
+@pytest.fixture
+def recording_qaoa(monkeypatch):
+    """The ``RecordingQAOA`` class with an empty record of runs."""
+    monkeypatch.setattr(RecordingQAOA, 'runs', [])
+    return RecordingQAOA
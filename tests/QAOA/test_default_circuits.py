@@ -0,0 +1,191 @@
+import subprocess
+import sys
+from itertools import combinations
+
+import numpy as np
+import pyqpanda as pq
+import pytest
+
+from pyqpanda_alg.QAOA import default_circuits, statevector
+
+
+def _simulate(n, *builders):
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    qubits = machine.qAlloc_many(n)
+    prog = pq.QProg()
+    for build in builders:
+        prog << build(qubits)
+    machine.directly_run(prog)
+    return np.array(machine.get_qstate())
+
+
+@pytest.mark.parametrize('partition_func', [statevector.parity_partitions, statevector.complete_partitions])
+@pytest.mark.parametrize('n', [2, 3, 4, 5, 6])
+def test_partitions_are_disjoint_matchings(partition_func, n):
+    partitions = partition_func(range(n))
+    for pairs in partitions:
+        qubits = [q for pair in pairs for q in pair]
+        assert len(qubits) == len(set(qubits))
+    pairs = [tuple(sorted(pair)) for pairs in partitions for pair in pairs]
+    if partition_func is statevector.complete_partitions:
+        assert sorted(pairs) == list(combinations(range(n), 2))
+    else:
+        assert len(pairs) == (1 if n == 2 else n)
+
+
+@pytest.mark.parametrize('mixer_type', ['PXY', 'CXY'])
+@pytest.mark.parametrize('domains', [1, 2, [[0, 2, 4], [1, 3, 5]]])
+def test_xy_mixer_circuit_matches_kernel(mixer_type, domains):
+    init = default_circuits.init_d_state(domains, 1)
+    mixer = default_circuits.xy_mixer(domains, mixer_type)
+    state = _simulate(6, init, lambda qubits: mixer(qubits, 0.4))
+    kernel_state = mixer.kernel(np.array(init.statevector(6), dtype=complex), 0.4)
+    np.testing.assert_allclose(state, kernel_state, atol=1e-10)
+    # the mixer keeps the Hamming weight of every domain
+    np.testing.assert_allclose(np.abs(state[np.asarray(init.statevector(6)) == 0]), 0, atol=1e-10)
+
+
+def test_mixer_functions_build_circuits():
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    qubits = machine.qAlloc_many(4)
+    for mixer_func in (default_circuits.parity_partition_xy_mixer, default_circuits.complete_xy_mixer):
+        assert isinstance(mixer_func(qubits, np.pi / 2), pq.QCircuit)
+    circuit = pq.QCircuit()
+    circuit << default_circuits.xy_mixer(2, 'PXY')(qubits, np.pi / 2)
+    circuit << default_circuits.xy_mixer([[0, 1], [2, 3]], 'CXY')(qubits, np.pi / 2)
+
+
+def test_pair_rotation_kernel():
+    # one pair at beta = pi/2 maps |01> to -i|10>
+    state = np.zeros(8, dtype=complex)
+    state[0b001] = 1
+    statevector.apply_xy_partitions(state, [[(0, 2)]], np.pi / 2)
+    np.testing.assert_allclose(state, -1j * np.eye(8)[0b100], atol=1e-12)
+    with pytest.raises(ValueError):
+        statevector.apply_xy_partitions(np.zeros(8), [[(0, 1)]], 0.1)
+
+
+def test_qaoa_state_with_xy_mixer_stays_feasible():
+    rng = np.random.default_rng(2)
+    energies = rng.uniform(size=2 ** 6)
+    init = default_circuits.init_d_state(2, 1)
+    mixer = default_circuits.xy_mixer(2, 'PXY')
+    state = statevector.qaoa_state(energies, [0.3, 0.5], [0.7, 0.4], mixer.kernel, init.statevector(6))
+    assert np.linalg.norm(state) == pytest.approx(1)
+    np.testing.assert_allclose(state[np.asarray(init.statevector(6)) == 0], 0, atol=1e-12)
+
+
+def test_x_mixer_kernel_matches_circuit():
+    rng = np.random.default_rng(3)
+    energies = rng.uniform(size=2 ** 3)
+    state = statevector.qaoa_state(energies, [0.], [0.3])
+
+    def build(qubits):
+        circuit = pq.QCircuit()
+        for q in qubits:
+            circuit << pq.H(q) << pq.RX(q, 0.6)
+        return circuit
+
+    circuit_state = _simulate(3, build)
+    np.testing.assert_allclose(state, circuit_state, atol=1e-10)
+
+
+def test_xy_mixer_invalid_type():
+    with pytest.raises(ValueError):
+        default_circuits.xy_mixer(2, 'XY')
+
+
+def _xy_hamiltonian(size, mixer_type):
+    partition_func = {'PXY': statevector.parity_partitions, 'CXY': statevector.complete_partitions}[mixer_type]
+    x, y = np.array([[0, 1], [1, 0]]), np.array([[0, -1j], [1j, 0]])
+    hamiltonian = np.zeros((2 ** size, 2 ** size), dtype=complex)
+    for i, j in (pair for pairs in partition_func(range(size)) for pair in pairs):
+        for pauli in (x, y):
+            # bit k of the matrix index is qubit k
+            ops = [np.eye(2)] * size
+            ops[size - 1 - i], ops[size - 1 - j] = pauli, pauli
+            term = ops[0]
+            for op in ops[1:]:
+                term = np.kron(term, op)
+            hamiltonian += term / 2
+    return hamiltonian
+
+
+@pytest.mark.parametrize('mixer_type', ['PXY', 'CXY'])
+@pytest.mark.parametrize('size', [2, 3, 4, 5])
+def test_xy_unitary_is_exact_exponential(mixer_type, size):
+    from scipy.linalg import expm
+    expected = expm(-0.7j * _xy_hamiltonian(size, mixer_type))
+    np.testing.assert_allclose(statevector.xy_unitary(size, mixer_type, 0.7), expected, atol=1e-10)
+
+
+def _apply_on_domain(state, domain, matrix):
+    n = len(state).bit_length() - 1
+    # local bit k is qubit domain[k], i.e. tensor axis n - 1 - domain[k]
+    axes = [n - 1 - q for q in reversed(domain)]
+    moved = np.moveaxis(state.reshape((2,) * n), axes, range(len(domain))).reshape(2 ** len(domain), -1)
+    moved = matrix @ moved
+    return np.moveaxis(moved.reshape((2,) * n), range(len(domain)), axes).reshape(-1)
+
+
+@pytest.mark.parametrize('mixer_type', ['PXY', 'CXY'])
+def test_exact_kernel_matches_unitary_on_a_domain(mixer_type):
+    rng = np.random.default_rng(4)
+    state = rng.normal(size=2 ** 5) + 1j * rng.normal(size=2 ** 5)
+    domain = [4, 1, 2]
+    expected = _apply_on_domain(state, domain, statevector.xy_unitary(3, mixer_type, 0.3))
+    np.testing.assert_allclose(statevector.apply_xy_exact(state.copy(), domain, mixer_type, 0.3), expected,
+                               atol=1e-12)
+
+
+@pytest.mark.parametrize('mixer_type', ['PXY', 'CXY'])
+def test_exact_xy_mixer_circuit_applies_the_domain_unitaries(monkeypatch, mixer_type):
+    # the oracles of the circuit are recorded instead of built, and applied to a state vector with NumPy
+    oracles = []
+
+    def record_oracle(qubits, matrix):
+        oracles.append(([qubit.get_phy_addr() for qubit in qubits], np.asarray(matrix)))
+        return pq.QCircuit()
+
+    monkeypatch.setattr(pq, 'QOracle', record_oracle)
+    domains = [[4, 1, 2], [0, 3]]
+    mixer = default_circuits.xy_mixer(domains, mixer_type, exact=True)
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    mixer(machine.qAlloc_many(5), 0.3)
+    assert [domain for domain, _ in oracles] == domains
+    rng = np.random.default_rng(5)
+    state = rng.normal(size=2 ** 5) + 1j * rng.normal(size=2 ** 5)
+    expected = mixer.kernel(state.copy(), 0.3)
+    for domain, matrix in oracles:
+        np.testing.assert_allclose(matrix, statevector.xy_unitary(len(domain), mixer_type, 0.3), atol=1e-12)
+        state = _apply_on_domain(state, domain, matrix)
+    np.testing.assert_allclose(state, expected, atol=1e-12)
+
+
+def _qoracle_works():
+    # QOracle crashes the interpreter in some pyqpanda builds, so probe it in a child process
+    probe = ('import numpy as np, pyqpanda as pq; machine = pq.CPUQVM(); machine.init_qvm(); '
+             'pq.QOracle(machine.qAlloc_many(1), np.eye(2, dtype=complex))')
+    return subprocess.run([sys.executable, '-c', probe], capture_output=True).returncode == 0
+
+
+@pytest.mark.skipif(not _qoracle_works(), reason='pq.QOracle is broken in the installed pyqpanda')
+@pytest.mark.parametrize('mixer_type', ['PXY', 'CXY'])
+def test_exact_xy_mixer_circuit_matches_kernel(mixer_type):
+    init = default_circuits.init_d_state(2, 1)
+    mixer = default_circuits.xy_mixer(2, mixer_type, exact=True)
+    state = _simulate(6, init, lambda qubits: mixer(qubits, 0.4))
+    np.testing.assert_allclose(state, mixer.kernel(np.array(init.statevector(6), dtype=complex), 0.4), atol=1e-10)
+
+
+def test_exact_mode_limits():
+    mixer = default_circuits.xy_mixer([], exact=True)
+    state = np.full(4, 0.5, dtype=complex)
+    np.testing.assert_array_equal(mixer.kernel(state, 0.3), np.full(4, 0.5))
+    with pytest.raises(ValueError):
+        default_circuits.xy_mixer([list(range(statevector.EXACT_XY_MAX_QUBITS + 1))], exact=True)
+    with pytest.raises(ValueError):
+        statevector.xy_unitary(3, 'XY', 0.1)
@@ -0,0 +1,116 @@
+import numpy as np
+import pyqpanda as pq
+import pytest
+
+from pyqpanda_alg.QAOA import default_circuits, dstate, statevector
+
+
+def _simulate(n, build):
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    qubits = machine.qAlloc_many(n)
+    prog = pq.QProg()
+    prog << build(qubits)
+    machine.directly_run(prog)
+    return np.array(machine.get_qstate())
+
+
+@pytest.mark.parametrize('n, k', [(1, 1), (3, 1), (4, 2), (5, 2), (5, 5), (6, 3)])
+def test_cached_dicke_state_matches_statevector(n, k):
+    dstate.clear_cache()
+    state = _simulate(n, lambda qubits: dstate.cached_dicke_state(qubits, k))
+    np.testing.assert_allclose(state, statevector.dicke_state(n, k), atol=1e-10)
+
+
+def test_cached_dicke_state_reuses_circuits():
+    dstate.clear_cache()
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    qubits = machine.qAlloc_many(4)
+    circuit = dstate.cached_dicke_state(qubits, 2)
+    assert dstate.cached_dicke_state(qubits, 2) is circuit
+    assert dstate.cached_dicke_state(qubits[1:], 2) is not circuit
+    dstate.clear_cache()
+    assert dstate.cached_dicke_state(qubits, 2) is not circuit
+
+
+@pytest.mark.parametrize('n, k', [(0, 0), (3, 4), (3, -1)])
+def test_cached_dicke_state_invalid(n, k):
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    qubits = machine.qAlloc_many(max(n, 1))[:n]
+    with pytest.raises(ValueError):
+        dstate.cached_dicke_state(qubits, k)
+
+
+def test_init_d_state_circuit_matches_statevector():
+    domains = [[0, 1, 2], [3, 4, 5]]
+    init = default_circuits.init_d_state(domains, 2)
+    np.testing.assert_allclose(_simulate(6, init), init.statevector(6), atol=1e-10)
+    init = default_circuits.init_d_state(2, 1)
+    np.testing.assert_allclose(_simulate(6, init), statevector.dicke_state(6, 1, domains), atol=1e-10)
+
+
+def test_dicke_statevector():
+    state = statevector.dicke_state(4, 1, [[0, 1], [2, 3]])
+    np.testing.assert_allclose(np.flatnonzero(state), [0b0101, 0b0110, 0b1001, 0b1010])
+    np.testing.assert_allclose(state[state != 0], 0.5)
+    np.testing.assert_allclose(np.flatnonzero(statevector.dicke_state(4, 2, [[0, 1], [2, 3]])), [0b1111])
+    assert not state.flags.writeable
+    with pytest.raises(ValueError):
+        statevector.dicke_state(4, 3, [[0, 1], [2, 3]])
+
+
+def test_cached_dicke_state_is_not_shared_between_machines():
+    circuits = []
+    for _ in range(2):
+        # the second machine reuses the qubit addresses of the first one, which is freed
+        state = _simulate(4, lambda qubits: circuits.append(dstate.cached_dicke_state(qubits, 2)) or circuits[-1])
+        np.testing.assert_allclose(state, statevector.dicke_state(4, 2), atol=1e-10)
+    assert circuits[0] is not circuits[1]
+
+
+@pytest.mark.parametrize('n, k', [(1, 0), (2, 1), (4, 2), (5, 3), (6, 2), (6, 6), (7, 3)])
+def test_linear_dicke_state_matches_statevector(n, k):
+    state = _simulate(n, lambda qubits: dstate.linear_dicke_state(qubits, k))
+    np.testing.assert_allclose(state, statevector.dicke_state(n, k), atol=1e-10)
+
+
+@pytest.mark.parametrize('n, k', [(5, 1), (6, 3), (8, 4)])
+def test_linear_gates_act_on_neighbors(n, k):
+    gates = dstate._scs_gates(n, k, linear=True)
+    assert all(abs(qubits[0] - qubits[1]) == 1 for _, qubits, _ in gates if len(qubits) == 2)
+    assert not any(name == 'SWAP' for name, _, _ in dstate._scs_gates(n, k, linear=False))
+
+
+@pytest.mark.parametrize('linear', [True, False])
+@pytest.mark.parametrize('n, k', [(4, 2), (7, 3)])
+def test_dicke_circuit_report_counts_gates(n, k, linear):
+    gates = dstate._scs_gates(n, k, linear)
+    report = dstate.dicke_circuit_report(n, k, linear)
+    assert sum(report['gates'].values()) == len(gates)
+    assert report['gates']['X'] == k
+    assert report['cnot_count'] == report['gates']['CNOT'] + 3 * report['gates']['SWAP']
+    assert 0 < report['cnot_depth'] <= report['depth'] <= len(gates)
+    # every block SCS(m, k) uses at most 6k-2 CNOT, 4k-2 RY and 2k SWAP gates
+    blocks = n - 1
+    assert report['gates']['CNOT'] <= blocks * (6 * k - 2)
+    assert report['gates']['RY'] <= blocks * (4 * k - 2)
+    assert report['gates']['SWAP'] <= blocks * 2 * k
+
+
+def test_dicke_circuit_report_linear_costs_swaps():
+    report = dstate.dicke_circuit_report(8, 4)
+    assert report['gates']['SWAP'] > 0
+    assert report['cnot_count'] > dstate.dicke_circuit_report(8, 4, linear=False)['cnot_count']
+
+
+@pytest.mark.parametrize('n, k', [(0, 0), (3, 4), (3, -1)])
+def test_linear_dicke_state_invalid(n, k):
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    qubits = machine.qAlloc_many(max(n, 1))[:n]
+    with pytest.raises(ValueError):
+        dstate.linear_dicke_state(qubits, k)
+    with pytest.raises(ValueError):
+        dstate.dicke_circuit_report(n, k)
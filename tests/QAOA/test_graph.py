@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from pyqpanda_alg.QAOA import graph
+from pyqpanda_alg.QAOA.qaoa import QAOA
+
+TRIANGLE = [(0, 1, 1.0), (1, 2, 2.0), (0, 2, 0.5)]
+
+
+def _brute_force_energies(g):
+    return np.array([-g.cut_value([(index >> q) & 1 for q in range(g.n_nodes)]) for index in range(2 ** g.n_nodes)])
+
+
+def test_energy_table_is_negative_cut_value():
+    g = graph.MaxCutGraph(edges=TRIANGLE)
+    np.testing.assert_allclose(g.energy_table(), [0., -1.5, -3., -2.5, -2.5, -3., -1.5, 0.])
+    g = graph.MaxCutGraph(edges=[(0, 3, 1.0), (1, 3, 2.0), (2, 4, 1.0), (0, 4, 0.3)], n_nodes=6)
+    np.testing.assert_allclose(g.energy_table(), _brute_force_energies(g))
+
+
+def test_adjacency_and_edge_inputs_agree():
+    matrix = np.array([[0, 1, 0.5], [1, 0, 2], [0.5, 2, 0]])
+    for g in (graph.MaxCutGraph(adjacency=matrix), graph.MaxCutGraph(adjacency=sparse.csr_matrix(matrix)),
+              graph.MaxCutGraph(edges=[(1, 0, 0.5), (0, 1, 0.5), (2, 1, 2.0), (0, 2, 0.5), (2, 2, 9.0)])):
+        np.testing.assert_allclose(g.energy_table(), graph.MaxCutGraph(edges=TRIANGLE).energy_table())
+
+
+def test_pauli_operator_terms():
+    g = graph.MaxCutGraph(edges=TRIANGLE)
+    terms = dict((tuple(sorted(term.items())), coef) for term, coef in g.z_terms())
+    assert terms == {(): -1.75, ((0, 'Z'), (1, 'Z')): 0.5, ((0, 'Z'), (2, 'Z')): 0.25, ((1, 'Z'), (2, 'Z')): 1.0}
+
+
+def test_features_of_a_square():
+    features = graph.MaxCutGraph(edges=[(0, 1), (1, 2), (2, 3), (3, 0)]).features()
+    assert features['regular'] == 2
+    assert features['n_edges'] == 4
+    assert features['triangles'] == 0
+    assert not features['weighted']
+
+
+def test_empty_edge_list():
+    g = graph.MaxCutGraph(edges=[])
+    assert g.n_nodes == 0
+    np.testing.assert_allclose(g.energy_table(), [0.])
+    g = graph.MaxCutGraph(edges=np.zeros((0, 3)), n_nodes=3)
+    np.testing.assert_allclose(g.energy_table(), np.zeros(8))
+    assert g.features()['n_edges'] == 0
+
+
+@pytest.mark.parametrize('kwargs', [{}, {'edges': [(0, 1)], 'adjacency': np.zeros((2, 2))},
+                                    {'edges': [(0, 1, 1, 1)]}, {'edges': [(0, -1)]},
+                                    {'edges': [(0, 3)], 'n_nodes': 2}, {'adjacency': np.zeros((2, 3))}])
+def test_invalid_input(kwargs):
+    with pytest.raises(ValueError):
+        graph.MaxCutGraph(**kwargs)
+
+
+def test_from_graph_tells_edge_lists_from_adjacency_matrices():
+    edges = np.array(TRIANGLE)
+    assert QAOA.from_graph(edges, adjacency=False).graph.n_nodes == 3
+    np.testing.assert_allclose(QAOA.from_graph(edges, adjacency=False).graph.weights, [1.0, 0.5, 2.0])
+    with pytest.raises(ValueError):
+        QAOA.from_graph(edges)
+    # 3x3 adjacency matrix
+    matrix = np.array([[0, 1, 0], [1, 0, 1], [0, 1, 0]])
+    assert len(QAOA.from_graph(matrix, adjacency=True).graph.weights) == 2
+    # 4x4 adjacency and a 4x2 edge list are unambiguous
+    assert QAOA.from_graph(np.ones((4, 4))).graph.n_nodes == 4
+    assert QAOA.from_graph(np.array([[0, 1], [1, 2], [2, 3], [3, 4]])).graph.n_nodes == 5
+    assert QAOA.from_graph(sparse.eye(3, k=1)).graph.n_nodes == 3
@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyqpanda_alg.QAOA import parallel
+
+
+def test_chunked():
+    assert list(parallel.chunked('abcde', 2)) == [[(0, 'a'), (1, 'b')], [(2, 'c'), (3, 'd')], [(4, 'e')]]
+    with pytest.raises(ValueError):
+        list(parallel.chunked('abc', 0))
+
+
+@pytest.mark.parametrize('chunksize', [1, 3])
+def test_map_unordered_serial_and_executor_agree(chunksize):
+    items = list(range(-5, 6))
+    serial = list(parallel.map_unordered(abs, items))
+    assert serial == [(i, abs(item)) for i, item in enumerate(items)]
+    with ThreadPoolExecutor(3) as executor:
+        assert sorted(parallel.map_unordered(abs, items, executor, chunksize)) == serial
+
+
+def test_evaluate_batch_indexes_results(recording_qaoa):
+    qaoa_f = recording_qaoa(None)
+    batch = [([0.1 * i], [0.2 * i]) for i in range(6)]
+    with ThreadPoolExecutor(2) as executor:
+        results = dict(qaoa_f.evaluate_batch(batch, shots=100, executor=executor, chunksize=4))
+    assert sorted(results) == list(range(6))
+    assert results[3] == qaoa_f.run_qaoa_circuit(*batch[3])
+
+
+def test_run_multistart(recording_qaoa):
+    qaoa_f = recording_qaoa(None)
+    starts = dict(qaoa_f.run_multistart(n_starts=4, layer=2, seed=7, shots=50))
+    assert sorted(starts) == [0, 1, 2, 3]
+    assert all(len(para) == 4 for _, para, _ in starts.values())
+    assert all(run['layer'] == 2 and run['shots'] == 50 for run in qaoa_f.runs)
+    assert dict(qaoa_f.run_multistart(initial_paras=[[1, 2]], layer=1))[0][1] == [1, 2]
+    with pytest.raises(ValueError):
+        qaoa_f.run_multistart()
+    with pytest.raises(ValueError, match='initial_paras'):
+        qaoa_f.run_multistart(n_starts=2, initial_para=[1, 2])
+
+
+def test_layer_sweep(recording_qaoa):
+    qaoa_f = recording_qaoa(None)
+    with ThreadPoolExecutor(2) as executor:
+        sweep = dict(qaoa_f.layer_sweep([3, 1, 2], executor=executor, optimizer='COBYLA'))
+    assert sweep == {layer: ({}, None, float(layer)) for layer in (1, 2, 3)}
+    assert sorted(run['layer'] for run in qaoa_f.runs) == [1, 2, 3]
+    assert all(run['optimizer'] == 'COBYLA' for run in qaoa_f.runs)
+    for name in ('layer', 'initial_para'):
+        with pytest.raises(ValueError, match=name):
+            list(qaoa_f.layer_sweep([1, 2], **{name: 1}))
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from pyqpanda_alg.QAOA import portfolio
+
+
+def shifted_sphere(x):
+    return float(np.sum((x - 1) ** 2))
+
+
+def test_race_keeps_the_best_optimizer_within_budget():
+    result = portfolio.race(shifted_sphere, np.zeros(3), ['SPSA', 'COBYLA', 'Nelder-Mead', 'Powell'], budget=200)
+    assert result['nfev'] <= 200
+    assert sum(result['evaluations'].values()) == result['nfev']
+    assert result['winner'] in ('SPSA', 'COBYLA', 'Nelder-Mead', 'Powell')
+    assert result['fun'] == pytest.approx(shifted_sphere(result['x']))
+    assert result['fun'] < 0.1
+    # successive halving stops at least half of the optimizers after the first round
+    assert len(result['eliminated']) >= 2
+    assert all(result['evaluations'][name] <= 200 for name in result['eliminated'])
+
+
+def test_race_survives_a_failing_optimizer():
+    result = portfolio.race(shifted_sphere, np.zeros(2), ['COBYLA', 'no-such-method'], budget=60, rounds=1)
+    assert result['winner'] == 'COBYLA'
+    assert result['evaluations']['no-such-method'] == 0
+
+
+def test_race_invalid_input():
+    with pytest.raises(ValueError):
+        portfolio.race(shifted_sphere, np.zeros(2), [], budget=10)
+    with pytest.raises(ValueError):
+        portfolio.race(shifted_sphere, np.zeros(2), ['SPSA', 'COBYLA'], budget=1)
+    with pytest.raises(RuntimeError):
+        portfolio.race(shifted_sphere, np.zeros(2), ['no-such-method'], budget=10)
+
+
+def test_run_portfolio(recording_qaoa):
+    qaoa_f = recording_qaoa(None)
+    qaoa_result, para, loss, report = qaoa_f.run_portfolio(['COBYLA', 'Nelder-Mead'], budget=80,
+                                                           initial_para=[0.5, 0.5])
+    assert list(qaoa_result) == ['0', '1']
+    assert loss == pytest.approx(np.sin(para[0] + para[1]) ** 2)
+    assert loss < 1e-3
+    assert report['nfev'] <= 80 and report['winner'] in ('COBYLA', 'Nelder-Mead')
+
+    _, para, loss, _ = qaoa_f.run_portfolio(['COBYLA'], budget=40, initial_para=[0.5, 0.5], temperature=0.5)
+    prob_one = np.sin(para[0] + para[1]) ** 2
+    assert loss == pytest.approx(-np.log(1 - prob_one + prob_one * np.exp(-2)))
@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyqpanda as pq
+import pytest
+import sympy as sp
+
+from pyqpanda_alg.QAOA import default_circuits, graph, qaoa, statevector
+
+
+def test_gibbs_loss_matches_direct_formula():
+    rng = np.random.default_rng(0)
+    energies = rng.normal(size=16)
+    probs = rng.dirichlet(np.ones(16))
+    expected = -np.log(np.sum(probs * np.exp(-energies / 2)))
+    assert qaoa.gibbs_loss(energies, probs, temperature=2) == pytest.approx(expected)
+
+
+def test_gibbs_loss_stays_finite_at_low_temperature():
+    energies = np.array([-1000., 0., 1000.])
+    probs = np.array([0.2, 0.3, 0.5])
+    loss, grad = qaoa.gibbs_loss(energies, probs, temperature=0.5, jac=True)
+    assert loss == pytest.approx(-2000 - np.log(0.2))
+    np.testing.assert_allclose(grad, [-5., 0., 0.], atol=1e-12)
+
+
+def test_gibbs_loss_gradient_matches_finite_difference():
+    rng = np.random.default_rng(1)
+    energies = rng.normal(size=8)
+    probs = rng.dirichlet(np.ones(8))
+    jacobian = rng.normal(size=(8, 3))
+    _, grad = qaoa.gibbs_loss(energies, probs, 0.7, jac=True, prob_jacobian=jacobian)
+    step = 1e-6
+    numeric = [(qaoa.gibbs_loss(energies, probs + step * jacobian[:, j], 0.7)
+                - qaoa.gibbs_loss(energies, probs - step * jacobian[:, j], 0.7)) / (2 * step) for j in range(3)]
+    np.testing.assert_allclose(grad, numeric, rtol=1e-6)
+
+
+@pytest.mark.parametrize('temperature, probs', [(0, [0.5, 0.5]), (1, [1.])])
+def test_gibbs_loss_rejects_invalid_input(temperature, probs):
+    with pytest.raises(ValueError):
+        qaoa.gibbs_loss([0., 1.], probs, temperature)
+
+
+def _cycle(n, weight=1.):
+    return graph.MaxCutGraph(edges=[(i, (i + 1) % n, weight) for i in range(n)])
+
+
+def test_solve_many_streams_every_problem():
+    problems = [_cycle(4), _cycle(5), _cycle(4, 2.), _cycle(6), _cycle(5, 0.5)]
+    with ThreadPoolExecutor(2) as executor:
+        results = dict(qaoa.solve_many(problems, executor, chunksize=1, layer=2, initial_para=[0.3, 0.6, 0.4, 0.2]))
+    assert sorted(results) == list(range(5))
+    for index, (qaoa_result, para, loss) in results.items():
+        energies = problems[index].energy_table()
+        probs = np.array(list(qaoa_result.values()))
+        assert len(para) == 4 and probs.sum() == pytest.approx(1)
+        assert list(probs) == sorted(probs, reverse=True)
+        assert loss == pytest.approx(sum(prob * energies[int(key, 2)] for key, prob in qaoa_result.items()))
+        # better than the equal superposition state
+        assert loss < energies.mean()
+
+
+def test_solve_many_cost_tables_of_all_problem_types():
+    g = graph.MaxCutGraph(edges=[(0, 1, 1.), (1, 2, 2.), (0, 2, 0.5)])
+    np.testing.assert_allclose(qaoa._energy_table(g.pauli_operator(), 3), g.energy_table(), atol=1e-12)
+    x = sp.symbols('x0:11')
+    problem = 2 * x[0] * x[10] + 3 * x[2] - 1
+    # x_i is bit i, so the unused variables between x2 and x10 still count as qubits
+    assert qaoa._problem_size(problem) == 11
+    energies = qaoa._energy_table(problem, 11)
+    assert energies[1 << 10 | 1] == 1 and energies[1 << 2] == 2 and energies[0] == -1
+    assert energies[1 << 10] == energies[1 << 1] == -1
+    for invalid in (sp.Symbol('a') + x[0], sp.Symbol('y0') * x[0]):
+        with pytest.raises(ValueError):
+            qaoa._problem_size(invalid)
+    np.testing.assert_allclose(qaoa._energy_table(sp.Integer(2), 0), [2])
+    operator = pq.PauliOperator({'Z0 Z1': 0.5, '': 1.})
+    np.testing.assert_allclose(qaoa._energy_table(operator, 2), [1.5, 0.5, 0.5, 1.5])
+    assert qaoa._energy_table(pq.PauliOperator({'X0': 1.}), 1) is None
+
+
+def test_solve_many_builds_the_template_once_per_chunk():
+    init = default_circuits.init_d_state(2, 1)
+    calls = []
+
+    def init_circuit(qlist):
+        return init(qlist)
+
+    init_circuit.statevector = lambda n_qubits: calls.append(n_qubits) or init.statevector(n_qubits)
+    mixer = default_circuits.xy_mixer(2, 'PXY')
+    rng = np.random.default_rng(0)
+    problems = [graph.MaxCutGraph(adjacency=np.triu(rng.uniform(size=(4, 4)), 1)) for _ in range(5)]
+    results = dict(qaoa.solve_many(problems, chunksize=8, init_circuit=init_circuit, mixer_circuit=mixer,
+                                   warm_start=True, layer=1))
+    assert calls == [4]
+    assert sorted(results) == list(range(5))
+    feasible = np.asarray(init.statevector(4)) != 0
+    for qaoa_result, _, _ in results.values():
+        # the XY mixer keeps the one-hot constraint of every domain
+        assert sum(prob for key, prob in qaoa_result.items() if not feasible[int(key, 2)]) < 1e-12
+
+
+def test_solve_many_falls_back_to_run(monkeypatch, recording_qaoa):
+    monkeypatch.setattr(qaoa, 'QAOA', recording_qaoa)
+    x = sp.symbols('x0:3')
+    problems = [x[0] * x[1] + x[2], _cycle(3), x[0] - x[1] * x[2]]
+    results = dict(qaoa.solve_many(problems, shots=100, layer=1))
+    assert sorted(results) == [0, 1, 2] and len(recording_qaoa.runs) == 3
+    assert all(run['shots'] == 100 for run in recording_qaoa.runs)
+    # a circuit factory without a state vector also needs the circuits
+    recording_qaoa.runs.clear()
+    dict(qaoa.solve_many([_cycle(3)], init_circuit=lambda qlist: pq.QCircuit()))
+    assert len(recording_qaoa.runs) == 1
+
+
+def test_solve_many_gibbs_loss():
+    problem = _cycle(4)
+    (_, (qaoa_result, para, loss)), = qaoa.solve_many([problem], layer=1, loss_type='Gibbs', temperature=0.5,
+                                                      initial_para=[0.4, 0.3])
+    energies = problem.energy_table()
+    probs = np.abs(statevector.qaoa_state(energies, para[:1], para[1:])) ** 2
+    assert loss == pytest.approx(qaoa.gibbs_loss(energies, probs, 0.5))
+
+
+def test_solve_many_reads_the_optimizer_options_of_run(monkeypatch):
+    from scipy.optimize import minimize
+    calls = []
+
+    def record_minimize(fun, x0, method=None, bounds=None, options=None):
+        calls.append((method, bounds, options))
+        return minimize(fun, x0, method=method, bounds=bounds, options=options)
+
+    monkeypatch.setattr(qaoa, 'minimize', record_minimize)
+    problem = _cycle(4)
+    for optimizer, option in [('COBYLA', 5), ('TNC', 5), ('COBYLA', {'maxiter': 5, 'rhobeg': 0.1})]:
+        dict(qaoa.solve_many([problem], layer=1, initial_para=[0.4, 0.3], optimizer=optimizer,
+                             optimizer_option={'bounds': [(0, 1)] * 2, 'options': option}))
+    assert calls == [('COBYLA', [(0, 1)] * 2, {'maxiter': 5}), ('TNC', [(0, 1)] * 2, {'maxfun': 5}),
+                       ('COBYLA', [(0, 1)] * 2, {'maxiter': 5, 'rhobeg': 0.1})]
+    # the maximum number of iterations of SPSA is a keyword argument of spsa_minimize
+    (_, (_, para, _)), = qaoa.solve_many([problem], layer=1, initial_para=[0.4, 0.3], optimizer='SPSA',
+                                         optimizer_option={'options': 3})
+    assert len(para) == 2
+
+
+def test_solve_many_sizes_sparse_sympy_problems():
+    x = sp.symbols('x0:3')
+    # x0 * x2 has three qubits, and is grouped with the other three-qubit problem
+    problems = [x[0] * x[2] - x[0], x[0] - x[1] * x[2]]
+    results = dict(qaoa.solve_many(problems, layer=1, initial_para=[0.4, 0.3]))
+    assert all(len(next(iter(qaoa_result))) == 3 for qaoa_result, _, _ in results.values())
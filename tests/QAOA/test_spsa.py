@@ -0,0 +1,152 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from pyqpanda_alg.QAOA import spsa
+
+X0 = np.array([1., 2., 3., 4.])
+
+
+def sphere(x, center=0.):
+    return float(np.sum((x - center) ** 2))
+
+
+def test_spsa_minimize_converges():
+    x = spsa.spsa_minimize(sphere, X0, maxiter=300, seed=1)
+    assert np.linalg.norm(x) < 0.1 * np.linalg.norm(X0)
+
+
+def test_spsa_minimize_passes_args_bounds_and_callback():
+    history = []
+    x = spsa.spsa_minimize(sphere, X0, args=(1.,), bounds=[(None, None), (None, None), (1.5, None), (None, 10)],
+                           callback=history.append, maxiter=50, seed=2)
+    assert len(history) == 50
+    assert x[2] >= 1.5
+
+
+@pytest.mark.parametrize('options', [{'workers': 3}, {'workers': 2, 'executor': 'process'},
+                                     {'executor': ThreadPoolExecutor(2)}])
+def test_concurrent_evaluation_matches_serial(options):
+    options = dict(options, resamplings=3, maxiter=20, seed=3)
+    serial = spsa.spsa_minimize(sphere, X0, maxiter=20, seed=3, resamplings=3)
+    np.testing.assert_allclose(spsa.spsa_minimize(sphere, X0, **options), serial)
+
+
+def test_resamplings_evaluate_every_perturbation():
+    calls = []
+    spsa.spsa_minimize(lambda x: calls.append(x) or sphere(x), X0, maxiter=10, resamplings=4, seed=4)
+    assert len(calls) == 10 * 2 * 4
+
+
+@pytest.mark.parametrize('options', [{'workers': 0}, {'resamplings': 0}, {'a': 0}, {'c': -1}])
+def test_invalid_options(options):
+    with pytest.raises(ValueError):
+        spsa.spsa_minimize(sphere, X0, **options)
+
+
+def test_non_scalar_objective():
+    with pytest.raises(TypeError):
+        spsa.spsa_minimize(lambda x: x, X0)
+
+
+def test_second_order_defaults_to_unit_gain():
+    assert spsa.SPSA(X0, second_order=True).gains['a'] == 1.
+    assert spsa.SPSA(X0, second_order=True, a=0.3).gains['a'] == 0.3
+    assert spsa.SPSA(X0).gains['a'] == 0.2
+
+
+def test_second_order_converges_on_scaled_quadratic():
+    scales = np.array([10., 3., 1., 1.])
+
+    def quadratic(x):
+        return float(np.sum(scales * x ** 2))
+
+    x = spsa.spsa_minimize(quadratic, X0, maxiter=200, second_order=True, seed=5)
+    assert quadratic(x) < 1e-2 * quadratic(X0)
+
+
+def test_blocking_rejects_increasing_steps():
+    values = []
+    optimizer = spsa.SPSA(X0, second_order=True, maxiter=30, allowed_increase=0., seed=6)
+    while not optimizer.done:
+        optimizer.tell([sphere(x) for x in optimizer.ask()])
+        values.append(optimizer.fx)
+    assert all(later <= earlier for earlier, later in zip(values, values[1:]))
+    # one evaluation at x0, then four perturbed points and one blocking evaluation per iteration
+    assert optimizer.nfev == 1 + 30 * 5
+
+
+def test_calibration_sets_gains_from_noise_and_gradient(caplog):
+    rng = np.random.default_rng(7)
+
+    def noisy(x):
+        return sphere(x) + rng.normal(0, 0.5)
+
+    optimizer = spsa.SPSA(X0, calibrate=True, calibration_samples=20, target_step=0.2, seed=7)
+    with caplog.at_level('INFO', logger='pyqpanda_alg.QAOA.spsa'):
+        optimizer.tell([noisy(x) for x in optimizer.ask()])
+        assert 0.25 < optimizer.gains['c'] < 1.
+        optimizer.tell([noisy(x) for x in optimizer.ask()])
+    assert 'SPSA calibration' in caplog.text
+    # the first step a_0 * |g| is about the target step, where the SPSA estimate |g| = 2|x.b| averages to 9
+    a_0 = optimizer.gains['a'] / (optimizer.gains['A'] + 1) ** optimizer.gains['alpha']
+    assert 0.5 * 0.2 < a_0 * 9 < 2 * 0.2
+    assert optimizer.nfev == 20 + 2 * 20
+
+
+def test_calibration_keeps_second_order_gain():
+    optimizer = spsa.SPSA(X0, calibrate=True, second_order=True, seed=8)
+    while optimizer.nfev < 5 + 10:
+        optimizer.tell([sphere(x) for x in optimizer.ask()])
+    assert optimizer.gains['a'] == 1.
+
+
+def test_calibrated_minimize_converges():
+    x = spsa.spsa_minimize(sphere, X0, maxiter=200, calibrate=True, target_step=0.5, seed=9)
+    assert np.linalg.norm(x) < 0.1 * np.linalg.norm(X0)
+
+
+def test_ask_tell_protocol():
+    optimizer = spsa.SPSA(X0, maxiter=3, resamplings=2, seed=10)
+    with pytest.raises(RuntimeError):
+        optimizer.tell([0.])
+    points = optimizer.ask()
+    assert points.shape == (4, 4)
+    assert optimizer.ask() is points
+    with pytest.raises(ValueError):
+        optimizer.tell([0.] * 3)
+    while not optimizer.done:
+        optimizer.tell([sphere(x) for x in optimizer.ask()])
+    assert optimizer.nit == 3 and optimizer.nfev == 3 * 4
+    with pytest.raises(RuntimeError):
+        optimizer.ask()
+
+
+def test_ask_tell_matches_spsa_minimize():
+    optimizer = spsa.SPSA(X0, maxiter=40, seed=11)
+    while not optimizer.done:
+        optimizer.tell([sphere(x) for x in optimizer.ask()])
+    np.testing.assert_allclose(optimizer.x, spsa.spsa_minimize(sphere, X0, maxiter=40, seed=11))
+
+
+def test_tolerance_stops_early():
+    optimizer = spsa.SPSA(np.zeros(4), maxiter=100, tol=1e-3, seed=12)
+    optimizer.tell([sphere(x) for x in optimizer.ask()])
+    assert optimizer.done and optimizer.nit == 1
+
+
+def test_spsa_minimize_async_runs_concurrently():
+    import asyncio
+
+    async def objective(x, center):
+        await asyncio.sleep(0)
+        return sphere(x, center)
+
+    async def main():
+        return await asyncio.gather(*(spsa.spsa_minimize_async(objective, X0, args=(center,), maxiter=200, seed=13)
+                                      for center in (0., 2.)))
+
+    first, second = asyncio.run(main())
+    np.testing.assert_allclose(first, spsa.spsa_minimize(sphere, X0, maxiter=200, seed=13))
+    assert np.linalg.norm(second - 2.) < 0.2
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from pyqpanda_alg.QAOA import graph, statevector
+
+
+def _random_state(n, seed=0):
+    rng = np.random.default_rng(seed)
+    state = rng.normal(size=2 ** n) + 1j * rng.normal(size=2 ** n)
+    return state / np.linalg.norm(state)
+
+
+@pytest.mark.parametrize('chunk_size', [3, 16, 2 ** 16])
+def test_top_k_by_probability(chunk_size):
+    state = _random_state(6)
+    probs = np.abs(state) ** 2
+    result = list(statevector.top_k_states(state, 5, chunk_size=chunk_size))
+    expected = np.argsort(-probs)[:5]
+    assert [int(bits, 2) for bits, _, _ in result] == list(expected)
+    np.testing.assert_allclose([prob for _, prob, _ in result], probs[expected])
+    assert all(len(bits) == 6 and energy is None for bits, _, energy in result)
+
+
+def test_top_k_by_energy():
+    g = graph.MaxCutGraph(edges=[(0, 1), (1, 2), (2, 3), (3, 0)])
+    state = _random_state(4, seed=1)
+    result = list(statevector.top_k_states(state, 3, 'energy', g.energy_table(), chunk_size=5))
+    assert [energy for _, _, energy in result] == [-4., -4., -2.]
+    assert {bits for bits, _, _ in result[:2]} == {'0101', '1010'}
+    # a callable of the index array gives the same ranking
+    by_callable = list(statevector.top_k_states(state, 3, 'energy', lambda index: g.energy_table()[index]))
+    assert by_callable == result
+
+
+def test_top_k_skips_small_probabilities():
+    state = np.zeros(8, dtype=complex)
+    state[[1, 6]] = [0.6, 0.8]
+    assert [bits for bits, _, _ in statevector.top_k_states(state, 4, min_prob=1e-12)] == ['110', '001']
+
+
+@pytest.mark.parametrize('args', [(0,), (-1,), (2, 'size'), (2, 'energy')])
+def test_top_k_invalid_arguments(args):
+    with pytest.raises(ValueError):
+        statevector.top_k_states(_random_state(3), *args)
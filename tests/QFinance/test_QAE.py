@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyqpanda as pq
+import pytest
+
+from pyqpanda_alg.QFinance import QAE
+
+# a = P(q_0 q_1 = 11) = sin^2(pi / 6) = 1/4
+AMPLITUDE = 0.25
+THETA = np.arcsin(np.sqrt(AMPLITUDE))
+
+
+def create_cir(qlist):
+    cir = pq.QCircuit()
+    cir << pq.RY(qlist[0], np.pi / 3) << pq.X(qlist[1]).control(qlist[0])
+    return cir
+
+
+def test_mlae_schedules():
+    assert QAE._mlae_schedule('exponential', 1e-9, 100, max_length=5) == [0, 1, 2, 4, 8]
+    assert QAE._mlae_schedule('linear', 1e-9, 100, max_length=4) == [0, 1, 2, 3]
+    # a single circuit of 100 shots already bounds the standard deviation by 0.05
+    assert QAE._mlae_schedule('linear', 0.05, 100) == [0]
+    with pytest.raises(ValueError):
+        QAE._mlae_schedule('quadratic', 0.01, 100)
+
+
+def test_good_probabilities_follow_the_grover_powers():
+    mlae = QAE.MLAE(create_cir, qnumber=2, res_index=[0, 1], target_state='11', evaluation_schedule=[0, 1, 2, 5])
+    expected = np.sin((2 * np.array([0, 1, 2, 5]) + 1) * THETA) ** 2
+    np.testing.assert_allclose(mlae._good_probabilities(), expected, atol=1e-10)
+    with ThreadPoolExecutor(2) as executor:
+        mlae.executor = executor
+        np.testing.assert_allclose(mlae._good_probabilities(), expected, atol=1e-10)
+
+
+def test_max_likelihood_angle_of_exact_counts():
+    powers = np.array([0, 1, 2, 4, 8])
+    for theta in (0.1, 0.4, 1.2):
+        good = 1000 * np.sin((2 * powers + 1) * theta) ** 2
+        assert QAE._max_likelihood_angle(powers, good, 1000) == pytest.approx(theta, abs=1e-5)
+
+
+@pytest.mark.parametrize('schedule', ['exponential', 'linear'])
+def test_mlae_run(schedule):
+    np.random.seed(7)
+    mlae = QAE.MLAE(create_cir, qnumber=2, epsilon=0.005, res_index=[0, 1], target_state='11', schedule=schedule)
+    estimate = mlae.run()
+    assert estimate == pytest.approx(AMPLITUDE, abs=0.02)
+    low, high = mlae.confidence_interval
+    assert low <= estimate <= high and high - low < 0.05
+    assert mlae.oracle_calls == mlae.shots * sum(mlae.evaluation_schedule)
+
+
+def test_mlae_single_qubit_target():
+    np.random.seed(8)
+    estimate = QAE.MLAE(create_cir, qnumber=2, epsilon=0.01, res_index=-1).run()
+    assert estimate == pytest.approx(AMPLITUDE, abs=0.03)
+
+
+def test_mlae_invalid_target_state():
+    with pytest.raises(ValueError):
+        QAE.MLAE(create_cir, qnumber=2, res_index=[0, 1], target_state='1')
+
+
+def test_iqae_run_reports_interval_and_oracle_calls():
+    np.random.seed(1)
+    iqae = QAE.IQAE(create_cir, qnumber=2, epsilon=0.01, res_index=-1)
+    estimate = iqae.run()
+    low, high = iqae.confidence_interval
+    assert low <= AMPLITUDE <= high and low <= estimate <= high
+    assert high - low <= 2 * 0.01 * 1.01
+    assert iqae.oracle_calls == sum(shots * k for k, shots, _ in iqae.rounds)
+    assert all(0 <= good <= shots for _, shots, good in iqae.rounds)
+    # the powers grow from round to round, at least doubling 4k + 2 when they change
+    powers = [k for k, _, _ in iqae.rounds]
+    assert powers == sorted(powers) and powers[0] == 0
+
+
+def test_iqae_rounds_follow_the_global_seed():
+    np.random.seed(2)
+    first = QAE.IQAE(create_cir, qnumber=2, epsilon=0.01, shots=90)
+    estimate = first.run()
+    np.random.seed(2)
+    second = QAE.IQAE(create_cir, qnumber=2, epsilon=0.01, shots=90)
+    assert second.run() == estimate
+    assert second.rounds == first.rounds and all(shots == 90 for _, shots, _ in first.rounds)
+
+
+def test_iqae_reuses_cached_power_states():
+    np.random.seed(3)
+    QAE.IQAE(create_cir, qnumber=2, epsilon=0.01).run()
+    powers = QAE._grover_powers(create_cir, 2, [1], '1')
+    calls = powers.operator_calls
+    np.random.seed(3)
+    QAE.IQAE(create_cir, qnumber=2, epsilon=0.01).run()
+    # the same estimate repeats the same powers, which are all cached
+    assert powers.operator_calls == calls
+    assert len(QAE._powers_cache()) <= QAE.POWERS_CACHE_SIZE
+
+
+def test_power_states_are_not_shared_between_threads():
+    import threading
+    powers = [QAE._grover_powers(create_cir, 2, [1], '1')]
+    thread = threading.Thread(target=lambda: powers.append(QAE._grover_powers(create_cir, 2, [1], '1')))
+    thread.start()
+    thread.join()
+    assert powers[1] is not powers[0]
+    assert QAE._grover_powers(create_cir, 2, [1], '1') is powers[0]
+
+
+@pytest.mark.parametrize('use_executor', [False, True])
+def test_run_many_streams_every_estimate(use_executor):
+    np.random.seed(4)
+    estimators = [QAE.IQAE(create_cir, qnumber=2, epsilon=0.02) for _ in range(3)]
+    estimators.append(QAE.MLAE(create_cir, qnumber=2, epsilon=0.01, res_index=[0, 1], target_state='11'))
+    if use_executor:
+        with ThreadPoolExecutor(2) as executor:
+            results = dict(QAE.run_many(estimators, executor, chunksize=2))
+    else:
+        results = dict(QAE.run_many(estimators))
+    assert sorted(results) == [0, 1, 2, 3]
+    for prob, (low, high), calls in results.values():
+        assert low <= prob <= high
+        assert prob == pytest.approx(AMPLITUDE, abs=0.05)
+        assert calls > 0
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+import sympy as sp
+
+from pyqpanda_alg.QFinance import QUBO
+
+x = sp.symbols('x0:11')
+FUNCTION = -0.5 * x[0] * x[1] - 0.7 * x[0] * x[1] + 0.9 * x[1] * x[2] + 1.3 * x[0] - x[1] - 0.5 * x[2]
+
+
+def test_coefficients_of_a_sympy_problem():
+    test0 = QUBO.QuadraticBinary(FUNCTION + 2)
+    np.testing.assert_allclose(test0.quadratic, [[0, -1.2, 0], [0, 0, 0.9], [0, 0, 0]])
+    np.testing.assert_allclose(test0.linear, [1.3, -1, -0.5])
+    assert test0.constant == 2
+
+
+def test_variables_in_natural_order_and_squares():
+    test0 = QUBO.QuadraticBinary(x[10] * x[2] + 3 * x[10] ** 2)
+    # x2 is the first variable and x10 ** 2 = x10
+    np.testing.assert_allclose(test0.quadratic, [[0, 1], [0, 0]])
+    np.testing.assert_allclose(test0.linear, [0, 3])
+
+
+def test_constant_problem():
+    test0 = QUBO.QuadraticBinary(sp.Integer(3))
+    assert test0.quadratic.shape == (0, 0) and len(test0.linear) == 0 and test0.constant == 3
+    assert test0.qubobytraversal() == ([[]], 3.0)
+    np.testing.assert_allclose(test0.key_values(['', '']), [3, 3])
+
+
+def test_dict_problem():
+    test0 = QUBO.QuadraticBinary({'quadratic': [[0, 1], [0, 0]], 'linear': [1, -2], 'constant': 0.5})
+    assert test0.function_value([1, 1]) == pytest.approx(0.5)
+    test1 = QUBO.QuadraticBinary({'quadratic': [[0, 2], [0, 0]]})
+    np.testing.assert_allclose(test1.linear, [0, 0])
+    assert test1.constant == 0
+
+
+def test_cubic_problem_is_rejected():
+    with pytest.raises(ValueError):
+        QUBO.QuadraticBinary(x[0] * x[1] * x[2])
+
+
+def test_vectorized_values_match_the_expression():
+    test0 = QUBO.QuadraticBinary(FUNCTION)
+    var_arrays = (np.arange(8)[:, None] >> np.arange(3)) & 1
+    expected = [float(FUNCTION.subs(dict(zip(x[:3], row)))) for row in var_arrays]
+    np.testing.assert_allclose(test0.function_values(var_arrays), expected)
+    keys = [format(i, '03b') for i in range(8)]
+    np.testing.assert_allclose(test0.key_values(keys), expected)
+    assert test0.function_value([0, 1, 0]) == pytest.approx(-1)
+    assert test0.qubobytraversal() == ([[0, 1, 0]], -1.0)
@@ -0,0 +1,90 @@
+import operator
+
+import numpy as np
+import pyqpanda as pq
+import pytest
+
+from pyqpanda_alg.QFinance import comparator
+
+FUNCTIONS = {'geq': operator.ge, 'g': operator.gt, 'seq': operator.le, 's': operator.lt}
+
+
+@pytest.fixture(scope='module')
+def register():
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    return machine, machine.qAlloc_many(3), machine.qAlloc_many(3)
+
+
+def _result_probability(register, x, circuit, result):
+    machine, q_state, q_anc = register
+    prog = pq.QProg()
+    for i in range(3):
+        if x >> i & 1:
+            prog << pq.X(q_state[i])
+    prog << circuit
+    return machine.prob_run_list(prog, [result])[1]
+
+
+@pytest.mark.parametrize('function', FUNCTIONS)
+@pytest.mark.parametrize('method', ['int', 'qft'])
+def test_comparators_on_basis_states(register, function, method):
+    _, q_state, q_anc = register
+    for value in (-1, 0, 2, 2.5, 5, 7, 9):
+        if method == 'int':
+            circuit, result = comparator.int_comparator(value, q_state, q_anc, function, reuse=True), q_anc[-1]
+        else:
+            circuit, result = comparator.qft_comparator(value, q_state, q_anc[0], function), q_anc[0]
+        for x in range(8):
+            expected = float(FUNCTIONS[function](x, value))
+            assert _result_probability(register, x, circuit, result) == pytest.approx(expected, abs=1e-8)
+
+
+def test_reuse_returns_the_ancillas(register):
+    machine, q_state, q_anc = register
+    prog = pq.QProg()
+    prog << pq.H(q_state) << comparator.int_comparator(3, q_state, q_anc, 'geq', reuse=True)
+    prob = machine.prob_run_dict(prog, q_anc[:-1])
+    assert prob['00'] == pytest.approx(1)
+
+
+def test_comparator_cache_hits_and_eviction(register):
+    _, q_state, q_anc = register
+    cache = comparator.ComparatorCache(q_state, q_anc, 'geq', cache_size=2)
+    circuit = cache(3)
+    # x >= 2.5 is x >= 3
+    assert cache(2.5) is circuit
+    cache(4)
+    cache(5)
+    assert cache(3) is not circuit
+    cache.clear()
+    assert not cache._cache
+
+
+def test_comparator_builds_only_the_needed_skeleton(register):
+    _, q_state, q_anc = register
+    cache = comparator.ComparatorCache(q_state, q_anc)
+    assert not cache._carry
+    cache(0)
+    assert not cache._carry
+    cache(3)
+    # one carry variant per bit of the complement 8 - 3 = 0b101
+    assert sorted(cache._carry) == [(0, 1), (1, 0), (2, 1)]
+    # the complement 0b011 adds the variants (1, 1) and (2, 0)
+    cache(5)
+    assert len(cache._carry) == 5
+    qft = comparator.ComparatorCache(q_state, q_anc[0], method='qft')
+    assert qft._qft is None
+    qft(9)
+    assert qft._qft is None
+    qft(3)
+    assert qft._qft is not None
+
+
+@pytest.mark.parametrize('options', [{'function': 'eq'}, {'method': 'add'}, {'method': 'qft'}])
+def test_comparator_cache_invalid(register, options):
+    _, q_state, q_anc = register
+    with pytest.raises(ValueError):
+        comparator.ComparatorCache(q_state, q_anc, **options)
+    with pytest.raises(ValueError):
+        comparator.ComparatorCache(q_state, q_anc[:2])
@@ -0,0 +1,255 @@
+import numpy as np
+import pyqpanda as pq
+import pytest
+
+from pyqpanda_alg.QFinance import grover
+
+
+def _phase_of_marking(n, mark_data, n_ancilla):
+    # every gate of the marking is a permutation of basis states or a phase, so each state is followed classically
+    gates = grover._mark_gates(n, mark_data, n_ancilla)
+    signs = []
+    for x in range(2 ** n):
+        bits = [x >> q & 1 for q in range(n)] + [0] * n_ancilla
+        sign = 1
+        for name, index in gates:
+            if name == 'X':
+                bits[index[0]] ^= 1
+            elif name == 'TOFFOLI':
+                bits[index[2]] ^= bits[index[0]] & bits[index[1]]
+            elif all(bits[i] for i in index):
+                sign = -sign
+        assert bits == [x >> q & 1 for q in range(n)] + [0] * n_ancilla
+        signs.append(sign)
+    return np.array(signs)
+
+
+@pytest.mark.parametrize('n_ancilla', [0, 1, 3, 8])
+@pytest.mark.parametrize('n, n_marked, seed', [(1, 1, 0), (3, 2, 1), (5, 9, 2), (6, 40, 3), (7, 64, 4)])
+def test_marking_flips_exactly_the_marked_states(n, n_marked, seed, n_ancilla):
+    rng = np.random.default_rng(seed)
+    marked = rng.choice(2 ** n, size=n_marked, replace=False)
+    keys = [format(int(i), '0{}b'.format(n)) for i in marked]
+    expected = np.ones(2 ** n, dtype=int)
+    expected[marked] = -1
+    np.testing.assert_array_equal(_phase_of_marking(n, keys, n_ancilla), expected)
+
+
+def test_marking_merges_states_into_cubes():
+    # all states with q_0 = 1 and q_3 = 0 form one cube of two fixed qubits
+    marked = [format(i, '04b') for i in range(16) if i & 1 and not i & 8]
+    assert grover._mark_cubes(4, marked) == [(0b1001, 0b0001)]
+    report = grover.mark_data_report(4, marked)
+    assert report['cubes'] == 1 and report['max_controls'] == 1
+    assert report['gates'] == {'X': 2, 'Z': 0, 'CZ': 1, 'TOFFOLI': 0, 'MCZ': 0}
+
+
+def test_mark_data_report_uses_ancillas():
+    marked = [format(i, '08b') for i in range(256) if i % 7 == 3]
+    without = grover.mark_data_report(8, marked)
+    report = grover.mark_data_report(8, marked, n_ancilla=6)
+    assert without['ancillas'] == 0 and without['gates']['TOFFOLI'] == 0
+    assert 0 < report['ancillas'] <= 6
+    assert report['gates']['MCZ'] == 0 and report['max_controls'] == 2
+    gates = grover._mark_gates(8, marked, 6)
+    assert sum(report['gates'].values()) == len(gates)
+    assert grover.mark_data_report(8, marked, n_ancilla=1)['ancillas'] == 1
+
+
+def test_mark_data_reflection_circuit():
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    qubits = machine.qAlloc_many(6)
+    marked = ['1010', '0110', '1110', '0001']
+    expected = np.full(16, 0.25)
+    expected[[int(key, 2) for key in marked]] *= -1
+    for ancillas in (None, qubits[4:]):
+        prog = pq.QProg()
+        prog << pq.H(qubits[:4]) << grover.mark_data_reflection(qubits[:4], marked, ancillas)
+        machine.directly_run(prog)
+        state = np.array(machine.get_qstate())
+        np.testing.assert_allclose(state[:16], expected, atol=1e-10)
+    prog = pq.QProg()
+    prog << grover.Grover(mark_data=['101', '001']).cir(q_input=qubits[:3])
+    prob = machine.prob_run_dict(prog, qubits[:3])
+    assert prob['101'] == pytest.approx(0.5) and prob['001'] == pytest.approx(0.5)
+
+
+def test_mark_data_invalid_key():
+    with pytest.raises(ValueError):
+        grover.mark_data_report(3, ['01'])
+
+
+def _flip_oracle(q_index_value, current_min, calls=None):
+    # flip if x0 * x1 + x0 - x1 - current_min < 0, with the value register in two's complement
+    if calls is not None:
+        calls.append(current_min)
+    q_index, q_value = q_index_value[:2], q_index_value[2:]
+    factor = np.pi * 2 ** (1 - len(q_value))
+    circuit = pq.QCircuit()
+    circuit << pq.H(q_value)
+    for i, q_i in enumerate(q_value):
+        circuit << pq.U1(q_i, factor * 2 ** i).control(q_index)
+        circuit << pq.U1(q_i, factor * 2 ** i).control(q_index[0])
+        circuit << pq.U1(q_i, -factor * 2 ** i).control(q_index[1])
+        circuit << pq.U1(q_i, factor * 2 ** i * (-current_min))
+    circuit << pq.QFT(q_value).dagger()
+    return circuit
+
+
+def _value(key):
+    x = list(map(int, key))[::-1]
+    return x[0] * x[1] + x[0] - x[1]
+
+
+def test_gas_builds_each_oracle_once():
+    calls = []
+    np.random.seed(0)
+    search = grover.GroverAdaptiveSearch(0, 2, oracle_circuit=lambda q, v: _flip_oracle(q, v, calls))
+    result = search.run(continue_times=6, n_value_function=lambda v: 3, value_function=_value)
+    assert result == ([[0, 1]], -1)
+    # one circuit per threshold, shared by all searches and Grover iterations
+    assert sorted(calls) == sorted(set(calls))
+    machine, q_index, qubits, oracles = grover._search_register(2, 3)
+    assert grover._search_register(2, 3)[0] is machine and len(qubits) == 5
+    assert len(oracles) <= grover.ORACLE_CACHE_SIZE
+
+
+def test_gas_extends_the_grover_powers_of_a_threshold():
+    oracle = lambda qubits, value: _flip_oracle(qubits, value)
+    search = grover.GroverAdaptiveSearch(0, 2, oracle_circuit=oracle)
+    for rotation in (1, 3, 2, 3):
+        assert len(search._measure(rotation, -1, 3, shots=2, seed=0)) == 2
+    machine, q_index, qubits, powers = grover._search_register(2, 3)
+    power = powers[grover._hadamard, oracle, -1]
+    # 3 is extended from 1, 2 from 1, and the repeated 3 is cached: 1 + 2 + 1 Grover iterations
+    assert power.operator_calls == 4
+    in_circuit = pq.QCircuit()
+    in_circuit << grover._hadamard(q_index) << oracle(qubits, -1)
+    for k in range(4):
+        prog = pq.QProg()
+        prog << grover.Grover(in_operator=lambda _: in_circuit).cir(q_input=qubits, iternum=k)
+        probs = (np.abs(power.state(k)) ** 2).reshape(-1, 4).sum(axis=0)
+        np.testing.assert_allclose(probs, machine.prob_run_list(prog, q_index), atol=1e-9)
+
+
+def test_gas_requires_the_oracle_and_value_qubits():
+    with pytest.raises(ValueError, match='oracle_circuit'):
+        grover.GroverAdaptiveSearch(0, 2)
+    search = grover.GroverAdaptiveSearch(0, 2, oracle_circuit=_flip_oracle)
+    with pytest.raises(ValueError, match='n_value_function'):
+        search.run(value_function=_value)
+
+
+def test_value_memo_scores_each_candidate_once():
+    calls = []
+    memo = grover.ValueMemo(lambda key: calls.append(key) or key.count('1'))
+    assert memo(['101', '001', '101']) == [2, 1, 2]
+    assert memo(['001']) == [1]
+    assert memo.evaluations == 2 and memo.hits == 2
+    assert calls == ['101', '001']
+
+
+def test_value_memo_batch_and_eviction():
+    batches = []
+
+    def batch(keys):
+        batches.append(keys)
+        return [key.count('1') for key in keys]
+
+    memo = grover.ValueMemo(batch_function=batch, maxsize=2)
+    assert memo(['11', '01', '11', '10']) == [2, 1, 2, 1]
+    assert batches == [['11', '01', '10']]
+    # only the two most recent candidates are kept
+    memo(['11'])
+    assert batches[-1] == ['11'] and memo.evaluations == 4
+    with pytest.raises(ValueError):
+        grover.ValueMemo()
+
+
+def test_gas_with_a_vectorized_qubo_scorer():
+    import sympy as sp
+    from pyqpanda_alg.QFinance import QUBO
+    x0, x1 = sp.symbols('x0 x1')
+    problem = QUBO.QuadraticBinary(x0 * x1 + x0 - x1)
+    np.random.seed(1)
+    search = grover.GroverAdaptiveSearch(0, 2, oracle_circuit=_flip_oracle)
+    result = search.run(continue_times=6, n_value_function=lambda v: 3, shots=4,
+                        batch_value_function=problem.key_values)
+    assert result == ([[0, 1]], -1)
+
+
+@pytest.mark.parametrize('executor_type', ['thread', 'process'])
+def test_gas_probes_rotations_concurrently(executor_type):
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    executor_class = ThreadPoolExecutor if executor_type == 'thread' else ProcessPoolExecutor
+    np.random.seed(2)
+    search = grover.GroverAdaptiveSearch(0, 2, oracle_circuit=_flip_oracle)
+    with executor_class(3) as executor:
+        result = search.run(continue_times=6, n_value_function=_three_value_qubits, value_function=_value,
+                            executor=executor)
+    assert result == ([[0, 1]], -1)
+
+
+def _three_value_qubits(current_min):
+    return 3
+
+
+def test_gas_increasing_rotations(capsys):
+    np.random.seed(3)
+    search = grover.GroverAdaptiveSearch(0, 2, oracle_circuit=_flip_oracle)
+    result = search.run(continue_times=3, n_value_function=_three_value_qubits, value_function=_value,
+                        rotation_change='increase', process_show=True)
+    assert result == ([[0, 1]], -1)
+    lines = [line for line in capsys.readouterr().out.splitlines() if line.startswith('======')]
+    # every cycle tries the rotations 1, 2, 3 in order until an improvement
+    assert lines[0] == '======searching 1 ,rotation = 1 ======'
+    assert all(line.endswith('rotation = {} ======'.format(line.split()[1])) for line in lines)
+    with pytest.raises(ValueError):
+        search.run(n_value_function=_three_value_qubits, value_function=_value, rotation_change='double')
+
+
+def test_iter_num_and_analysis_scalars():
+    assert grover.iter_num(3, 2) == 1 and isinstance(grover.iter_num(3, 2), int)
+    assert grover.iter_num(4, 0) == 0
+    prob, theta = grover.iter_analysis(3, 2, 1)
+    assert prob == pytest.approx(1) and theta == pytest.approx(np.pi / 3)
+    assert grover.iter_analysis(3, 2, 2)[0] == pytest.approx(0.25)
+
+
+def test_iter_num_and_analysis_broadcast():
+    q_num, sol_num = np.arange(2, 12)[:, None], np.array([1, 2, 3])
+    num = grover.iter_num(q_num, sol_num)
+    assert num.shape == (10, 3)
+    assert all(num[i, j] == grover.iter_num(int(q), int(s)) for i, q in enumerate(q_num[:, 0])
+               for j, s in enumerate(sol_num))
+    prob, theta = grover.iter_analysis(q_num, sol_num, num)
+    assert prob.shape == theta.shape == (10, 3)
+    np.testing.assert_allclose(prob[3, 1], grover.iter_analysis(5, 2, int(num[3, 1]))[0])
+    # the optimal count is within one step of the maximum
+    assert np.all(prob >= grover.iter_analysis(q_num, sol_num, num + 1)[0] - 1e-12)
+
+
+def test_min_iter_num_matches_a_scan():
+    q_num, sol_num, target = np.arange(2, 9)[:, None, None], np.array([1, 2, 5])[:, None], np.array([0.5, 0.9, 0.99])
+    num = grover.min_iter_num(q_num, sol_num, target)
+    for index in np.ndindex(num.shape):
+        q, s, p = int(q_num[index[0], 0, 0]), int(sol_num[index[1], 0]), float(target[index[2]])
+        if s > 2 ** q:
+            continue
+        limit = 2 * grover.iter_num(q, s) + 1
+        reached = [k for k in range(limit + 1) if grover.iter_analysis(q, s, k)[0] >= p - 1e-12]
+        assert num[index] == (reached[0] if reached else -1)
+
+
+def test_min_iter_num_edge_cases():
+    assert grover.min_iter_num(4, 1, 0) == 0
+    assert grover.min_iter_num(4, 1, 1.01) == -1
+    assert grover.min_iter_num(10, 1, 0.9, max_iternum=5) == -1
+    assert grover.min_iter_num(10, 0, 0.5) == -1
+    assert grover.min_iter_num(2, 1, 1) == 1
+
+
+def test_min_iter_num_with_invalid_cells():
+    num = grover.min_iter_num([2, 4], 5, 0.5)
+    assert num[0] == -1 and num[1] == grover.min_iter_num(4, 5, 0.5)
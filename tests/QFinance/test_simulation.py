@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+
+from pyqpanda_alg.QFinance import simulation
+
+
+def _grover_state(q_num, indices, iternum):
+    # dense reference: oracle sign flip and inversion about the mean
+    state = np.full(2 ** q_num, 2 ** (-q_num / 2))
+    for _ in range(iternum):
+        state[indices] *= -1
+        state = 2 * state.mean() - state
+    return state
+
+
+@pytest.mark.parametrize('marked', [['101', '001'], [5, 1], np.isin(np.arange(8), [1, 5]),
+                                    lambda x: (x & 3) == 1])
+def test_marked_indices_formats(marked):
+    np.testing.assert_array_equal(simulation.marked_indices(3, marked), [1, 5])
+
+
+@pytest.mark.parametrize('marked', [['10'], [8], [-1], np.zeros(4, dtype=bool)])
+def test_marked_indices_invalid(marked):
+    with pytest.raises(ValueError):
+        simulation.marked_indices(3, marked)
+
+
+def test_marked_indices_predicate_in_chunks(monkeypatch):
+    monkeypatch.setattr(simulation, 'CHUNK_SIZE', 5)
+    np.testing.assert_array_equal(simulation.marked_indices(4, lambda x: x % 3 == 0), [0, 3, 6, 9, 12, 15])
+
+
+@pytest.mark.parametrize('q_num, indices', [(3, [1, 5]), (5, [0, 7, 19]), (4, [3])])
+def test_subspace_state_matches_dense_simulation(q_num, indices):
+    sim = simulation.SubspaceSimulator(q_num, indices)
+    for k in range(5):
+        expected = _grover_state(q_num, indices, k)
+        # equal up to a global sign
+        state = sim.state(k)
+        np.testing.assert_allclose(state * np.sign(state @ expected), expected, atol=1e-12)
+        assert sim.success_probability(k) == pytest.approx(np.sum(expected[indices] ** 2))
+    np.testing.assert_allclose(sim.success_probability(np.arange(5)),
+                               [sim.success_probability(k) for k in range(5)])
+
+
+def test_subspace_prob_dict_and_sample():
+    sim = simulation.SubspaceSimulator(3, ['101', '001'])
+    prob = sim.prob_dict(1)
+    assert prob['101'] == pytest.approx(0.5) and prob['001'] == pytest.approx(0.5)
+    assert sum(prob.values()) == pytest.approx(1)
+    counts = sim.sample(iternum=1, shots=1000, rng=7)
+    assert set(counts) == {'001', '101'} and sum(counts.values()) == 1000
+    counts = sim.sample(iternum=0, shots=20000, rng=8)
+    assert sum(counts.values()) == 20000 and len(counts) == 8
+    assert (counts['001'] + counts['101']) / 20000 == pytest.approx(0.25, abs=0.02)
+
+
+def test_subspace_without_marked_states():
+    sim = simulation.SubspaceSimulator(2, [])
+    np.testing.assert_allclose(sim.state(3), np.full(4, 0.5) * np.sign(sim.state(3)[0]))
+    assert sim.success_probability(2) == 0
+    assert sum(sim.sample(2, shots=10, rng=0).values()) == 10
+
+
+def _uniform_powers(q_num, indices, cache_size=simulation.CACHE_SIZE):
+    a = np.full(2 ** q_num, 2 ** (-q_num / 2))
+
+    def flip(state):
+        state = state.copy()
+        state[indices] *= -1
+        return state
+
+    return simulation.GroverPowers(a, simulation.reflection_operator(a, flip), cache_size)
+
+
+def test_grover_powers_match_dense_simulation():
+    powers = _uniform_powers(4, [3, 12])
+    for k in range(6):
+        # Q = A S_0 A^dagger S_chi differs from the inversion about the mean by a global sign
+        expected = _grover_state(4, [3, 12], k) * (-1) ** k
+        np.testing.assert_allclose(powers.state(k), expected, atol=1e-12)
+
+
+def test_grover_powers_sweep_is_linear():
+    powers = _uniform_powers(3, [6])
+    for k in range(10):
+        powers.state(k)
+    assert powers.operator_calls == 9
+    powers.state(4)
+    assert powers.operator_calls == 9
+    powers.state(12)
+    assert powers.operator_calls == 12
+    assert not powers.state(12).flags.writeable
+
+
+def test_grover_powers_cache_eviction():
+    powers = _uniform_powers(3, [6], cache_size=2)
+    for k in (1, 2, 3):
+        powers.state(k)
+    assert powers.operator_calls == 3
+    # k = 1 was evicted, so it is rebuilt from A|0>
+    powers.state(1)
+    assert powers.operator_calls == 4
+    powers.clear()
+    powers.state(2)
+    assert powers.operator_calls == 6
+    with pytest.raises(ValueError):
+        powers.state(-1)
+
+
+def test_grover_powers_keep_every_state_read_only():
+    a = np.full(4, 0.5, dtype=complex)
+    powers = simulation.GroverPowers(a, simulation.reflection_operator(a, lambda state: state * [1, 1, 1, -1]))
+    assert not powers.state(0).flags.writeable and not powers.state(1).flags.writeable
+    # the caller's array is copied, and stays writable
+    a[0] = 1
+    assert powers.state(0)[0] == 0.5 and a.flags.writeable
+
+
+def test_circuit_operator_matches_reflection():
+    import pyqpanda as pq
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    qubits = machine.qAlloc_many(2)
+    flip = simulation.circuit_operator(machine, qubits, pq.CZ(qubits[0], qubits[1]))
+    np.testing.assert_allclose(flip(np.full(4, 0.5)), [0.5, 0.5, 0.5, -0.5], atol=1e-12)
+    a = np.full(4, 0.5)
+    powers = simulation.GroverPowers(a, simulation.reflection_operator(a, flip))
+    assert powers.probabilities(1)[3] == pytest.approx(1)
+
+
+def test_phase_oracle_signs_on_embedded_qubits():
+    oracle = simulation.PhaseOracle(2, lambda x: x == 2, qubits=[3, 1])
+    np.testing.assert_array_equal(oracle.indices, [2])
+    assert oracle.keys() == ['10']
+    signs = oracle.signs(4)
+    # flip qubit 1 is state qubit 1 set and flip qubit 0 is state qubit 3 clear
+    expected = np.where(((np.arange(16) >> 1) & 1 == 1) & ((np.arange(16) >> 3) & 1 == 0), -1., 1.)
+    np.testing.assert_array_equal(signs, expected)
+    assert oracle.signs(4) is signs and not signs.flags.writeable
+    np.testing.assert_allclose(oracle.apply(np.ones(16)), expected)
+    with pytest.raises(ValueError):
+        oracle.signs(3)
+    with pytest.raises(ValueError):
+        simulation.PhaseOracle(2, [1], qubits=[0])
+
+
+def test_phase_oracle_circuit_matches_signs():
+    import pyqpanda as pq
+    from pyqpanda_alg.QFinance import grover
+    oracle = simulation.PhaseOracle(4, lambda x: x % 3 == 0)
+    machine = pq.CPUQVM()
+    machine.init_qvm()
+    qubits = machine.qAlloc_many(6)
+    a = np.full(16, 0.25)
+    expected = simulation.GroverPowers(a, simulation.reflection_operator(a, oracle)).probabilities(1)
+    for flip_operator in (oracle, lambda q: oracle(q, qubits[4:])):
+        prog = pq.QProg()
+        prog << grover.Grover(flip_operator=flip_operator).cir(q_input=qubits[:4], iternum=1)
+        prob = np.array(machine.prob_run_list(prog, qubits[:4]))
+        np.testing.assert_allclose(prob, expected, atol=1e-10)
+    with pytest.raises(ValueError):
+        oracle(qubits[:3])
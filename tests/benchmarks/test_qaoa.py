@@ -0,0 +1,83 @@
+import json
+
+import numpy as np
+import pytest
+
+from benchmarks.qaoa import compare, instances, run
+
+
+def _record(**metrics):
+    record = run._case('maxcut', 4, 1, 0, 'SLSQP', -1)
+    record.update(metrics)
+    return record
+
+
+def _write(path, records):
+    with open(path, 'w') as f:
+        json.dump({'environment': {}, 'results': records}, f)
+    return str(path)
+
+
+@pytest.mark.parametrize('kind', instances.KINDS)
+def test_instance_energies_match_sympy(kind):
+    instance = instances.generate(kind, 5, seed=3)
+    expression = instances.to_sympy(instance)
+    symbols = sorted(expression.free_symbols, key=lambda s: int(s.name[1:]))
+    index = np.arange(2 ** 5)
+    expected = [float(expression.subs({s: (i >> int(s.name[1:])) & 1 for s in symbols})) for i in index]
+    np.testing.assert_allclose(instances.energies(instance, index), expected, atol=1e-12)
+    assert instances.energy_range(instance) == pytest.approx((min(expected), max(expected)))
+
+
+def test_case_keys_match_compare():
+    assert tuple(run._case('qubo', 8, 2, 1, 'SPSA', 100)) == compare.CASE_KEYS
+
+
+def test_failed_case_is_reported_as_error(tmp_path):
+    baseline = _write(tmp_path / 'baseline.json', [_record(time_solve=1.0)])
+    current = _write(tmp_path / 'current.json', [_record(error="RuntimeError('failed')")])
+    regressions = compare.compare(compare._load(baseline), compare._load(current))
+    assert [metric for _, metric, _, _ in regressions] == ['error']
+
+
+@pytest.mark.parametrize('kind', instances.KINDS)
+def test_run_case_completes(kind):
+    record = run.run_case(kind, 4, 2, 0)
+    assert tuple(record)[:len(compare.CASE_KEYS)] == compare.CASE_KEYS
+    assert all(record[metric] >= 0 for metric in compare.TIME_METRICS)
+    assert record['evaluations'] > 2 and record['peak_rss_mb'] > 0
+    assert 0 <= record['approximation_ratio'] <= 1 + 1e-9
+    # the optimization beats the uniform distribution, whose ratio is the mean energy's
+    e_min, e_max = instances.energy_range(instances.generate(kind, 4, 0))
+    uniform = instances.energies(instances.generate(kind, 4, 0), np.arange(16)).mean()
+    assert record['approximation_ratio'] > (e_max - uniform) / (e_max - e_min)
+
+
+def test_main_writes_the_records(tmp_path):
+    output = str(tmp_path / 'current.json')
+    run.main(['--kinds', 'maxcut', '--n', '4', '--layers', '1', '--repeat', '1', '--output', output])
+    with open(output) as f:
+        results = json.load(f)['results']
+    assert len(results) == 1 and 'error' not in results[0]
+    assert compare.compare(compare._load(output), compare._load(output)) == []
+
+
+def test_sampled_case_needs_the_full_library():
+    with pytest.raises(RuntimeError, match='shots=100'):
+        run.run_case('maxcut', 4, 1, 0, shots=100)
+
+
+def test_compare_flags_regressions(tmp_path):
+    baseline = _write(tmp_path / 'baseline.json', [_record(time_solve=1.0, approximation_ratio=0.9, evaluations=10)])
+    current = _write(tmp_path / 'current.json', [_record(time_solve=1.1, approximation_ratio=0.8, evaluations=20)])
+    regressions = compare.compare(compare._load(baseline), compare._load(current))
+    assert sorted(metric for _, metric, _, _ in regressions) == ['approximation_ratio', 'evaluations']
+    assert compare.main([baseline, baseline]) == 0
+    assert compare.main([baseline, current]) == 1
+
+
+def test_missing_case(tmp_path):
+    baseline = _write(tmp_path / 'baseline.json', [_record(time_solve=1.0)])
+    current = _write(tmp_path / 'current.json', [])
+    regressions = compare.compare(compare._load(baseline), compare._load(current))
+    assert [metric for _, metric, _, _ in regressions] == ['missing']